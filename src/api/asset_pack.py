@@ -0,0 +1,193 @@
+import os
+import json
+import mmap
+import shutil
+import tarfile
+import logging
+from pathlib import Path
+from typing import Optional, Dict, List, Iterable, Tuple
+from .version_dirs import version_key
+
+class AssetPack:
+    """Read-only store of Data Dragon files imported from an archive.
+
+    A pack is a directory holding:
+        assets.bin  - all file contents concatenated
+        index.json  - {"format": 1, "files": {path: [offset, length]}}
+
+    Paths follow the dragontail layout: '{version}/data/{language}/{file}.json',
+    '{version}/img/{kind}/{file}.png' and versionless 'img/...'. The blob is
+    memory-mapped, so any file is one slice away and nothing is extracted.
+    Reads are safe from multiple threads.
+    """
+
+    FORMAT_VERSION = 1
+    BLOB_FILE = "assets.bin"
+    INDEX_FILE = "index.json"
+
+    # Large art that the application never shows; skipped on import by default
+    DEFAULT_EXCLUDES = (
+        'img/champion/splash/',
+        'img/champion/loading/',
+        'img/champion/tiles/',
+        'img/champion/centered/',
+    )
+
+    def __init__(self, path: str):
+        """
+        Open an imported pack
+
+        Args:
+            path: Pack directory written by import_archive()
+
+        Raises:
+            FileNotFoundError: If the pack does not exist
+            ValueError: If the pack index has an unknown format
+        """
+        self.path = Path(path)
+        with open(self.path / self.INDEX_FILE, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('format') != self.FORMAT_VERSION:
+            raise ValueError(f"Unsupported asset pack format: {index.get('format')}")
+        self.files: Dict[str, Tuple[int, int]] = {name: tuple(entry) for name, entry in index['files'].items()}
+
+        self._blob_file = open(self.path / self.BLOB_FILE, 'rb')
+        size = os.fstat(self._blob_file.fileno()).st_size
+        self._blob = mmap.mmap(self._blob_file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def read(self, name: str) -> Optional[bytes]:
+        """
+        Read a file from the pack
+
+        Args:
+            name: Pack path (e.g., '15.9.1/data/en_US/champion.json')
+
+        Returns:
+            File contents or None if the pack does not contain it
+        """
+        entry = self.files.get(name)
+        if entry is None:
+            return None
+        offset, length = entry
+        return self._blob[offset:offset + length]
+
+    def read_json(self, name: str) -> Optional[object]:
+        data = self.read(name)
+        return json.loads(data) if data is not None else None
+
+    def read_url(self, url_path: str) -> Optional[bytes]:
+        """
+        Read the file behind a Data Dragon CDN path
+
+        Args:
+            url_path: URL path such as 'cdn/15.9.1/img/item/1001.png' or 'cdn/img/perk-images/...'
+
+        Returns:
+            File contents or None if the pack does not contain it
+        """
+        path = url_path.lstrip('/')
+        if path.startswith('cdn/'):
+            path = path[len('cdn/'):]
+        return self.read(path)
+
+    def get_versions(self) -> List[str]:
+        """Versions contained in the pack, newest first"""
+        versions = {name.split('/', 1)[0] for name in self.files if '/data/' in name}
+        return sorted(versions, key=version_key, reverse=True)
+
+    def get_languages(self, version: str) -> List[str]:
+        """Languages with data files for a version"""
+        prefix = f"{version}/data/"
+        return sorted({name[len(prefix):].split('/', 1)[0] for name in self.files if name.startswith(prefix)})
+
+    def close(self):
+        if isinstance(self._blob, mmap.mmap):
+            self._blob.close()
+        self._blob_file.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.files
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    @classmethod
+    def normalize_member_name(cls, name: str) -> Optional[str]:
+        """
+        Map an archive member name to a pack path
+
+        Strips './' and a wrapping top-level directory (e.g. 'dragontail-15.9.1/').
+        Returns None for files outside the dragontail layout.
+        """
+        parts = [part for part in name.replace('\\', '/').split('/') if part not in ('', '.')]
+        if '..' in parts:
+            return None
+        for start in range(min(2, len(parts))):
+            head = parts[start]
+            if head == 'img' or head[:1].isdigit():
+                return '/'.join(parts[start:])
+        return None
+
+    @classmethod
+    def import_archive(
+        cls,
+        archive_path: str,
+        output_path: str,
+        versions: Optional[Iterable[str]] = None,
+        languages: Optional[Iterable[str]] = None,
+        excludes: Iterable[str] = DEFAULT_EXCLUDES
+    ) -> 'AssetPack':
+        """
+        Index a Data Dragon archive into a pack, reading it once sequentially
+
+        Args:
+            archive_path: dragontail .tgz (or any tar archive in the same layout)
+            output_path: Pack directory to create (replaced if it exists)
+            versions: Only import these versions (defaults to all)
+            languages: Only import data for these languages (defaults to all)
+            excludes: Path fragments of files to skip
+
+        Returns:
+            The opened pack
+        """
+        logger = logging.getLogger(__name__)
+        versions = set(versions) if versions else None
+        languages = set(languages) if languages else None
+        excludes = tuple(excludes)
+
+        output = Path(output_path)
+        tmp_output = output.with_name(output.name + '.tmp')
+        shutil.rmtree(tmp_output, ignore_errors=True)
+        tmp_output.mkdir(parents=True)
+
+        files = {}
+        offset = 0
+        with tarfile.open(archive_path, 'r:*') as archive, \
+                open(tmp_output / cls.BLOB_FILE, 'wb') as blob:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                name = cls.normalize_member_name(member.name)
+                if name is None or any(fragment in name for fragment in excludes):
+                    continue
+                parts = name.split('/')
+                if versions is not None and parts[0] != 'img' and parts[0] not in versions:
+                    continue
+                if languages is not None and len(parts) > 2 and parts[1] == 'data' and parts[2] not in languages:
+                    continue
+
+                source = archive.extractfile(member)
+                if source is None:
+                    continue
+                with source:
+                    shutil.copyfileobj(source, blob)
+                files[name] = [offset, member.size]
+                offset += member.size
+
+        with open(tmp_output / cls.INDEX_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'format': cls.FORMAT_VERSION, 'files': files}, f, separators=(',', ':'))
+
+        shutil.rmtree(output, ignore_errors=True)
+        os.replace(tmp_output, output)
+        logger.info(f"Imported {len(files)} files ({offset} bytes) from {archive_path} into {output}")
+        return cls(str(output))
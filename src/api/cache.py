@@ -0,0 +1,75 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Any, Hashable, Callable
+
+class TTLCache:
+    """Thread-safe LRU cache with an optional per-entry time to live.
+
+    Besides the entry count, the total weight of the entries can be bounded:
+    with weigh and max_weight set, least recently used entries are evicted
+    until the weights of the remaining ones add up to at most max_weight.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 max_weight: Optional[int] = None, weigh: Optional[Callable[[Any], int]] = None):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Maximum number of entries before the least recently used is evicted
+            ttl: Seconds an entry stays valid (None for no expiry)
+            max_weight: Maximum total weight of the entries (None for no bound)
+            weigh: Weight of a value, e.g. its approximate size in bytes (required with max_weight)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self.weigh = weigh
+        self.weight = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key, self._MISSING)
+            if entry is self._MISSING:
+                return default
+            value, expires_at, weight = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self.weight -= weight
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value, overriding the default TTL if ttl is given"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        weight = self.weigh(value) if self.max_weight is not None else 0
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.weight -= old[2]
+            self._data[key] = (value, expires_at, weight)
+            self.weight += weight
+            while len(self._data) > self.maxsize or (
+                self.max_weight is not None and self.weight > self.max_weight and len(self._data) > 1
+            ):
+                self.weight -= self._data.popitem(last=False)[1][2]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, self._MISSING) is not self._MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+            self.weight = 0
@@ -0,0 +1,236 @@
+import time
+import threading
+import logging
+from typing import Optional, Callable, Any, Dict
+from concurrent.futures import ThreadPoolExecutor, Future
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD (additive increase, multiplicative decrease) concurrency limit.
+
+    The limit grows by roughly one slot per "round" of successful requests while
+    latency stays close to its baseline and the local rate limiter reports
+    headroom. It is cut multiplicatively on 429 responses or latency spikes.
+
+    Baselines are kept per endpoint, so slow match-v5 calls are not compared
+    with fast account-v1 ones. Spike samples still pull the baseline up
+    slowly, so a lasting latency shift becomes the new baseline instead of
+    pinning the limit at min_limit.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        decrease_factor: float = 0.5,
+        latency_spike_factor: float = 2.0,
+        min_headroom: float = 0.1,
+        decrease_cooldown: float = 1.0,
+        spike_adapt_rate: float = 0.05
+    ):
+        """
+        Initialize the limiter
+
+        Args:
+            initial_limit: Starting number of concurrent requests
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            decrease_factor: Multiplier applied to the limit on congestion
+            latency_spike_factor: Latency above baseline * factor counts as a spike
+            min_headroom: Minimum free fraction of the rate limit window required to grow
+            decrease_cooldown: Seconds to ignore further congestion signals after a cut
+            spike_adapt_rate: EWMA weight of spike samples in the baseline (healthy ones use 0.1)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.decrease_factor = decrease_factor
+        self.latency_spike_factor = latency_spike_factor
+        self.min_headroom = min_headroom
+        self.decrease_cooldown = decrease_cooldown
+        self.spike_adapt_rate = spike_adapt_rate
+
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._baselines: Dict[str, float] = {}  # endpoint -> smoothed latency
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit (whole slots)"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of slots currently held"""
+        return self._in_flight
+
+    def baseline_latency(self, endpoint: str = 'default') -> Optional[float]:
+        """Smoothed latency of an endpoint in seconds, or None before its first request"""
+        return self._baselines.get(endpoint)
+
+    def acquire(self):
+        """Block until a concurrency slot is available"""
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self):
+        """Return a concurrency slot"""
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._condition.notify()
+
+    def record_success(self, latency: float, headroom: float = 1.0, endpoint: str = 'default'):
+        """
+        Feed back the outcome of a completed request
+
+        Args:
+            latency: Request round-trip time in seconds
+            headroom: Free fraction (0-1) of the current rate limit window
+            endpoint: Endpoint the latency is compared against (e.g., 'match-v5')
+        """
+        with self._condition:
+            baseline = self._baselines.get(endpoint)
+            if baseline is None:
+                self._baselines[endpoint] = latency
+            elif latency > baseline * self.latency_spike_factor:
+                # Slowly adopt lasting shifts so every later sample is not a spike
+                self._baselines[endpoint] = baseline + (latency - baseline) * self.spike_adapt_rate
+                self._decrease(
+                    f"{endpoint} latency spike ({latency * 1000:.0f}ms vs {baseline * 1000:.0f}ms baseline)"
+                )
+                return
+            else:
+                # Exponentially weighted moving average of healthy latencies
+                self._baselines[endpoint] = baseline * 0.9 + latency * 0.1
+
+            if headroom >= self.min_headroom and self._limit < self.max_limit:
+                # One extra slot per full window of successful requests
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+                self._condition.notify_all()
+
+    def record_rate_limited(self):
+        """Feed back a 429 response"""
+        with self._condition:
+            self._decrease("rate limited")
+
+    def _decrease(self, reason: str):
+        """Multiplicatively cut the limit (caller holds the condition lock)"""
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        old_limit = self.limit
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        self.logger.debug(f"Concurrency limit {old_limit} -> {self.limit}: {reason}")
+
+class AdaptiveExecutor:
+    """Long-lived thread pool whose effective parallelism follows an AdaptiveConcurrencyLimiter.
+
+    The pool is sized for the limiter's maximum; tasks wait for a limiter slot
+    before they run, so only `limiter.limit` tasks execute at any time.
+    Tasks should not block on other tasks of the same executor.
+    """
+
+    def __init__(self, limiter: AdaptiveConcurrencyLimiter, thread_name_prefix: str = "riot-api"):
+        """
+        Initialize the executor
+
+        Args:
+            limiter: Limiter controlling how many tasks run concurrently
+            thread_name_prefix: Name prefix for worker threads
+        """
+        self.limiter = limiter
+        self._executor = ThreadPoolExecutor(
+            max_workers=limiter.max_limit,
+            thread_name_prefix=thread_name_prefix
+        )
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Schedule fn(*args, **kwargs) and return its Future"""
+        return self._executor.submit(self._run, fn, args, kwargs)
+
+    def _run(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        self.limiter.acquire()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.limiter.release()
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        """Stop accepting tasks and release the worker threads"""
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+class AdaptivePageSize:
+    """Page size for paginated fetches that follows measured latency and rate-limit headroom.
+
+    Pages are sized so one fetch takes about target_latency seconds at the
+    smoothed per-item latency seen so far, and shrink as the rate limit
+    window fills up so prefetching never starves interactive requests.
+    """
+
+    def __init__(
+        self,
+        initial_size: int = 10,
+        min_size: int = 5,
+        max_size: int = 40,
+        target_latency: float = 2.5,
+        low_headroom: float = 0.5
+    ):
+        """
+        Initialize the page sizer
+
+        Args:
+            initial_size: Page size used before any fetch was measured
+            min_size: Lower bound for the page size
+            max_size: Upper bound for the page size
+            target_latency: Desired duration of one page fetch in seconds
+            low_headroom: Free fraction of the rate limit window below which pages shrink
+        """
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.initial_size = min(max(initial_size, self.min_size), self.max_size)
+        self.target_latency = target_latency
+        self.low_headroom = low_headroom
+        self._item_latency = None
+        self._lock = threading.Lock()
+
+    @property
+    def item_latency(self) -> Optional[float]:
+        """Smoothed fetch time per item in seconds"""
+        return self._item_latency
+
+    def record(self, items: int, latency: float):
+        """
+        Feed back a completed page fetch
+
+        Args:
+            items: Number of items the page returned
+            latency: Time the whole fetch took in seconds
+        """
+        if items <= 0:
+            return
+        with self._lock:
+            per_item = latency / items
+            previous = self._item_latency
+            self._item_latency = per_item if previous is None else previous * 0.7 + per_item * 0.3
+
+    def next_size(self, headroom: float = 1.0) -> int:
+        """
+        Size of the next page
+
+        Args:
+            headroom: Free fraction (0-1) of the rate limit window used by the fetch
+        """
+        with self._lock:
+            item_latency = self._item_latency
+        if item_latency is None or item_latency <= 0:
+            size = float(self.initial_size)
+        else:
+            size = self.target_latency / item_latency
+        if headroom < self.low_headroom:
+            size *= max(headroom, 0.0) / self.low_headroom
+        return int(min(max(size, self.min_size), self.max_size))
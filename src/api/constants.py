@@ -278,6 +278,25 @@ class Constants:
             
         return limits[limit_type]
 
+    @classmethod
+    def get_region_for_platform(cls, platform: str) -> str:
+        """Get the regional routing value for a platform.
+        
+        Args:
+            platform: Platform code (e.g., 'euw1', 'na1')
+            
+        Returns:
+            Region code (e.g., 'EUROPE', 'AMERICAS')
+            
+        Raises:
+            ValueError: If platform is invalid
+        """
+        platform = platform.lower()
+        for region, mapped_platform in cls.REGION_MAPPINGS.values():
+            if mapped_platform == platform:
+                return region
+        raise ValueError(f"Invalid platform: {platform}. Valid platforms: {list(cls.PLATFORMS.keys())}")
+
     @classmethod
     def format_api_url(cls, platform_or_region: str, endpoint_group: str, endpoint_name: str, **params) -> str:
         """Format a complete API URL with parameters.
@@ -0,0 +1,467 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import wait, FIRST_COMPLETED
+from typing import Optional, Dict, Any, Iterable
+from .constants import Constants
+from .seen_index import MatchIdIndex, HashedIdIndex
+
+class _PlayerQueue:
+    """FIFO of (puuid, region) pairs kept in an append-only file.
+
+    Lines are appended at the end and read from a saved offset, so memory use
+    does not depend on the queue length. checkpoint() returns the offsets
+    that restore() rewinds to after a crash. Consumed lines are dropped by
+    compact(), which copies the unread lines into the file of the next
+    generation; the previous file stays until discard_stale(), so a saved
+    state always names a file that still exists.
+    """
+
+    COMPACT_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, path: str):
+        """Files are named after path with the generation, e.g. frontier.3.tsv (opened by restore())"""
+        self._base, self._ext = os.path.splitext(path)
+        self.generation = 0
+        self._writer = None
+        self._reader = None
+        self._read_offset = 0
+        self._size = 0
+        self._stale = []
+
+    def append(self, item):
+        puuid, region = item
+        self._writer.write(f"{region}\t{puuid}\n".encode('utf-8'))
+        self._size += 1
+
+    def popleft(self):
+        if self._size == 0:
+            raise IndexError("pop from an empty queue")
+        self._reader.seek(self._read_offset)
+        line = self._reader.readline()
+        if not line.endswith(b'\n'):
+            self._writer.flush()
+            self._reader.seek(self._read_offset)
+            line = self._reader.readline()
+        self._read_offset += len(line)
+        self._size -= 1
+        region, puuid = line.decode('utf-8').rstrip('\n').split('\t', 1)
+        return puuid, region
+
+    def __len__(self) -> int:
+        return self._size
+
+    def checkpoint(self) -> Dict[str, int]:
+        """Flush to disk and return the state to save"""
+        self._writer.flush()
+        os.fsync(self._writer.fileno())
+        return {
+            'generation': self.generation,
+            'read_offset': self._read_offset,
+            'write_offset': self._writer.tell(),
+            'size': self._size
+        }
+
+    def restore(self, state: Dict[str, int]):
+        """Open the file a checkpoint names and rewind to it, dropping lines appended after it"""
+        self.close()
+        self.generation = state.get('generation', 0)
+        path = self._path(self.generation)
+        self._writer = open(path, 'ab')
+        write_offset = state.get('write_offset', 0)
+        if os.path.getsize(path) > write_offset:
+            self._writer.truncate(write_offset)
+        self._reader = open(path, 'rb')
+        self._read_offset = state.get('read_offset', 0)
+        self._size = state.get('size', 0)
+        # Files of other generations are left over from a compaction cut short
+        directory = os.path.dirname(self._base) or '.'
+        prefix = os.path.basename(self._base) + '.'
+        for name in os.listdir(directory):
+            if name.startswith(prefix) and name.endswith(self._ext) and \
+                    os.path.join(directory, name) != path:
+                os.remove(os.path.join(directory, name))
+
+    def compact(self) -> bool:
+        """
+        Move the unread lines to the next generation's file once consumed
+        lines make up most of the current one
+
+        Returns:
+            True if compacted; the new offsets must be checkpointed before
+            discard_stale() removes the previous file
+        """
+        write_offset = self._writer.tell()
+        if self._read_offset < self.COMPACT_BYTES or self._read_offset * 2 < write_offset:
+            return False
+        self._writer.flush()
+        path = self._path(self.generation + 1)
+        with open(path, 'wb') as out:
+            self._reader.seek(self._read_offset)
+            while True:
+                chunk = self._reader.read(1024 * 1024)
+                if not chunk:
+                    break
+                out.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+        self._stale.append(self._path(self.generation))
+        self.close()
+        self.generation += 1
+        self._writer = open(path, 'ab')
+        self._reader = open(path, 'rb')
+        self._read_offset = 0
+        return True
+
+    def discard_stale(self):
+        """Remove the files of generations before the last checkpointed one"""
+        for path in self._stale:
+            if os.path.exists(path):
+                os.remove(path)
+        self._stale = []
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._reader.close()
+            self._writer = None
+            self._reader = None
+
+    def _path(self, generation: int) -> str:
+        return f"{self._base}.{generation}{self._ext}"
+
+class MatchCrawler:
+    """Breadth-first crawler over the match graph for building match datasets.
+
+    Starting from seed players, the crawler fetches each player's match IDs,
+    downloads every unseen match and adds the match participants to the
+    frontier. Matches and players are deduplicated, failed match downloads
+    are retried, per-region match budgets are respected and progress is checkpointed to disk so a crawl can be
+    stopped and resumed.
+
+    Output layout in output_dir:
+        matches.jsonl  - one match-v5 match per line
+        state.json     - pending matches, frontier offsets and counters
+        frontier.N.tsv - queue of players waiting for expansion, read from an offset;
+                         N is the generation named in state.json
+        seen_matches/  - MatchIdIndex of every match ID already queued or stored
+        seen_players/  - HashedIdIndex of every player already queued
+
+    Seen sets and the frontier live on disk, so memory stays flat however
+    long the crawl runs. Matches are downloaded without RiotAPI's match
+    caches, which are meant for interactive lookups.
+
+    The seen indexes are only written at checkpoints, right before
+    state.json, so they are never behind the saved state: matches the state
+    has pending are re-added on load and nothing is stored twice. Work
+    discovered since the last checkpoint is discovered again after a crash.
+    """
+
+    STATE_FILE = "state.json"
+    MATCHES_FILE = "matches.jsonl"
+    FRONTIER_FILE = "frontier.tsv"
+    MAX_MATCH_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        riot_api,
+        output_dir: str,
+        region_budgets: Optional[Dict[str, int]] = None,
+        matches_per_player: int = 20,
+        queue_type: Optional[int] = None,
+        max_in_flight: int = 64,
+        checkpoint_interval: float = 60.0,
+        expected_matches: int = 10000000
+    ):
+        """
+        Initialize the crawler, resuming from output_dir if it holds a checkpoint
+
+        Args:
+            riot_api: RiotAPI instance used for requests
+            output_dir: Directory for matches and checkpoint state
+            region_budgets: Maximum number of matches to store per region (e.g., {'EUROPE': 100000});
+                regions not listed are unbounded
+            matches_per_player: Number of recent match IDs to request per player
+            queue_type: Queue ID to restrict the crawl to (e.g., 420 for ranked solo)
+            max_in_flight: Maximum number of requests submitted to the executor at once
+            checkpoint_interval: Seconds between checkpoints
+            expected_matches: Expected crawl size, used to size the seen index Bloom filter
+        """
+        self.riot_api = riot_api
+        self.output_dir = output_dir
+        self.region_budgets = {k.upper(): v for k, v in (region_budgets or {}).items()}
+        self.matches_per_player = matches_per_player
+        self.queue_type = queue_type
+        self.max_in_flight = max_in_flight
+        self.checkpoint_interval = checkpoint_interval
+        self.logger = logging.getLogger(__name__)
+
+        self.pending_matches = deque() # (match_id, region) pairs waiting for download
+        self.stats = {
+            'matches_stored': {},
+            'players_expanded': 0,
+            'failed_requests': 0
+        }
+        self._output_offset = 0
+        self._reserved = {}  # region -> matches stored or pending, checked against budgets
+        self._match_failures = {}  # match_id -> failed downloads of a pending match
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.state_path = os.path.join(self.output_dir, self.STATE_FILE)
+        self.matches_path = os.path.join(self.output_dir, self.MATCHES_FILE)
+        self.seen_matches = MatchIdIndex(
+            os.path.join(self.output_dir, 'seen_matches'),
+            bloom_capacity=expected_matches
+        )
+        self.seen_players = HashedIdIndex(
+            os.path.join(self.output_dir, 'seen_players'),
+            bloom_capacity=expected_matches
+        )
+        # (puuid, region) pairs waiting for match ID expansion
+        self.frontier = _PlayerQueue(os.path.join(self.output_dir, self.FRONTIER_FILE))
+        self._load_checkpoint()
+
+    def seed_puuids(self, puuids: Iterable[str], platform: str):
+        """
+        Add players to the frontier
+
+        Args:
+            puuids: Player PUUIDs
+            platform: Platform the players are on (e.g., 'euw1')
+        """
+        region = Constants.get_region_for_platform(platform)
+        for puuid in puuids:
+            self._add_player(puuid, region)
+
+    def seed_from_ladder(
+        self,
+        platform: str,
+        queue: str = 'RANKED_SOLO_5x5',
+        tiers: Iterable[str] = ('challenger', 'grandmaster', 'master')
+    ) -> int:
+        """
+        Add apex-tier ladder players to the frontier
+
+        Args:
+            platform: Platform to read the ladder from (e.g., 'euw1')
+            queue: Queue type (e.g., 'RANKED_SOLO_5x5')
+            tiers: Any of 'challenger', 'grandmaster' and 'master'
+
+        Returns:
+            Number of new players added
+        """
+        fetchers = {
+            'challenger': self.riot_api.get_challenger_league,
+            'grandmaster': self.riot_api.get_grandmaster_league,
+            'master': self.riot_api.get_master_league
+        }
+        before = len(self.frontier)
+        for tier in tiers:
+            league = fetchers[tier](queue, platform)
+            if league:
+                self.seed_puuids(
+                    (entry['puuid'] for entry in league.get('entries', []) if entry.get('puuid')),
+                    platform
+                )
+        return len(self.frontier) - before
+
+    def run(self, max_matches: Optional[int] = None, stop_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Crawl until the frontier is exhausted, budgets are spent, max_matches
+        new matches were stored or stop_event is set
+
+        Args:
+            max_matches: Stop after storing this many matches in this run
+            stop_event: Event that stops the crawl when set
+
+        Returns:
+            Crawl statistics
+        """
+        in_flight = {}  # future -> (kind, key, region)
+        stored_this_run = 0
+        last_checkpoint = time.monotonic()
+
+        with open(self.matches_path, 'ab') as output:
+            try:
+                while True:
+                    stopping = (stop_event is not None and stop_event.is_set()) or \
+                        (max_matches is not None and stored_this_run >= max_matches)
+
+                    if not stopping:
+                        self._fill(in_flight)
+
+                    if not in_flight:
+                        break
+
+                    done, _ = wait(list(in_flight), timeout=1.0, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        kind, key, region = in_flight.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            self.logger.error(f"Crawler {kind} request failed for {key}: {str(e)}")
+                            result = None
+
+                        if result is None:
+                            self.stats['failed_requests'] += 1
+                            if kind == 'match':
+                                self._retry_match(key, region)
+                        elif kind == 'match_ids':
+                            self.stats['players_expanded'] += 1
+                            for match_id in result:
+                                self._add_match(match_id, region)
+                        else:
+                            self._match_failures.pop(key, None)
+                            output.write(json.dumps(result, separators=(',', ':')).encode('utf-8') + b'\n')
+                            self._count_stored(region)
+                            stored_this_run += 1
+                            for puuid in result.get('metadata', {}).get('participants', []):
+                                self._add_player(puuid, region)
+
+                    if time.monotonic() - last_checkpoint >= self.checkpoint_interval:
+                        output.flush()
+                        self._save_checkpoint(output.tell(), in_flight)
+                        last_checkpoint = time.monotonic()
+            finally:
+                # Also reached on KeyboardInterrupt; in-flight work is saved as pending
+                output.flush()
+                self._save_checkpoint(output.tell(), in_flight)
+
+        return self.stats
+
+    def close(self):
+        """Release the frontier and the seen indexes without saving (run() checkpoints before returning)"""
+        self.frontier.close()
+        self.seen_matches.close()
+        self.seen_players.close()
+
+    def _fill(self, in_flight: Dict):
+        """Keep the executor busy, preferring downloads over frontier expansion"""
+        while len(in_flight) < self.max_in_flight and self.pending_matches:
+            match_id, region = self.pending_matches.popleft()
+            future = self.riot_api.executor.submit(
+                self.riot_api.get_match_details, match_id, region, use_cache=False
+            )
+            in_flight[future] = ('match', match_id, region)
+
+        # Only expand players when downloads can't fill the pipeline, keeping the queues bounded
+        while len(in_flight) < self.max_in_flight and self.frontier:
+            puuid, region = self.frontier.popleft()
+            if self._budget_exhausted(region):
+                continue
+            future = self.riot_api.executor.submit(
+                self.riot_api.get_match_history,
+                puuid,
+                count=self.matches_per_player,
+                queue_type=self.queue_type,
+                region=region
+            )
+            in_flight[future] = ('match_ids', puuid, region)
+
+    def _add_player(self, puuid: str, region: str):
+        if self.seen_players.add(puuid):
+            self.frontier.append((puuid, region))
+
+    def _add_match(self, match_id: str, region: str):
+        if match_id in self.seen_matches or self._budget_exhausted(region):
+            return
+        self.seen_matches.add(match_id)
+        self.pending_matches.append((match_id, region))
+        self._reserved[region] = self._reserved.get(region, 0) + 1
+
+    def _retry_match(self, match_id: str, region: str):
+        """Queue a failed download again, or give it up after MAX_MATCH_ATTEMPTS"""
+        failures = self._match_failures.get(match_id, 0) + 1
+        if failures < self.MAX_MATCH_ATTEMPTS:
+            self._match_failures[match_id] = failures
+            self.pending_matches.append((match_id, region))
+        else:
+            self._match_failures.pop(match_id, None)
+            self._reserved[region] -= 1
+            self.logger.warning(f"Giving up on match {match_id} after {failures} failed downloads")
+
+    def _budget_exhausted(self, region: str) -> bool:
+        budget = self.region_budgets.get(region)
+        return budget is not None and self._reserved.get(region, 0) >= budget
+
+    def _count_stored(self, region: str):
+        stored = self.stats['matches_stored']
+        stored[region] = stored.get(region, 0) + 1
+
+    def _save_checkpoint(self, output_offset: int, in_flight: Dict):
+        """Atomically write crawl state; in-flight work is saved as still pending"""
+        pending_matches = list(self.pending_matches)
+        expanding_players = []
+        for kind, key, region in in_flight.values():
+            if kind == 'match':
+                pending_matches.append((key, region))
+            else:
+                expanding_players.append((key, region))
+
+        # Index first: after a crash it may be ahead of the state, never behind
+        self.seen_matches.flush()
+        self.seen_players.flush()
+        state = {
+            'output_offset': output_offset,
+            'frontier': self.frontier.checkpoint(),
+            'expanding_players': expanding_players,
+            'pending_matches': pending_matches,
+            'match_failures': self._match_failures,
+            'stats': self.stats
+        }
+        self._write_state(state)
+        if self.frontier.compact():
+            state['frontier'] = self.frontier.checkpoint()
+            self._write_state(state)
+            self.frontier.discard_stale()
+        self._output_offset = output_offset
+        self.logger.info(
+            f"Crawler checkpoint: {sum(self.stats['matches_stored'].values())} matches, "
+            f"{len(self.frontier) + len(expanding_players)} players and {len(pending_matches)} matches pending"
+        )
+
+    def _write_state(self, state: Dict[str, Any]):
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _load_checkpoint(self):
+        """Restore crawl state and drop matches written after the last checkpoint"""
+        state = None
+        if os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except Exception as e:
+                self.logger.error(f"Error loading crawler checkpoint: {str(e)}")
+        if state is None:
+            # Players queued before a crash without any checkpoint are discarded
+            self.frontier.restore({})
+            return
+
+        self.frontier.restore(state.get('frontier', {}))
+        for puuid, region in state.get('expanding_players', []):
+            self.frontier.append((puuid, region))
+        self.pending_matches = deque(tuple(item) for item in state.get('pending_matches', []))
+        self._match_failures = dict(state.get('match_failures', {}))
+        # Already in the index unless its flush was cut short
+        for match_id, _ in self.pending_matches:
+            self.seen_matches.add(match_id)
+        self.stats.update(state.get('stats', {}))
+        self._output_offset = state.get('output_offset', 0)
+        self._reserved = dict(self.stats['matches_stored'])
+        for _, region in self.pending_matches:
+            self._reserved[region] = self._reserved.get(region, 0) + 1
+
+        # Matches written after the checkpoint are still pending in the restored state
+        if os.path.exists(self.matches_path) and os.path.getsize(self.matches_path) > self._output_offset:
+            with open(self.matches_path, 'r+b') as f:
+                f.truncate(self._output_offset)
+
+        self.logger.info(
+            f"Resumed crawl with {len(self.frontier)} players and {len(self.pending_matches)} matches pending"
+        )
@@ -1,184 +1,363 @@
-import requests
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterable
+from collections import OrderedDict
 import logging
+import threading
+from .ddragon_cache import DataDragonCache
+from .static_data import StaticDataStore
+from .static_index import StaticDataIndex
+from .version_dirs import version_key
 
 class DataDragonAPI:
     BASE_URL = "https://ddragon.leagueoflegends.com"
     
-    def __init__(self, language: str = "en_US"):
+    def __init__(self, language: str = "en_US", load: bool = True, cache: Optional[DataDragonCache] = None,
+                 max_versions: int = 4):
         """
         Initialize the Data Dragon API wrapper
         
         Args:
-            language: Language code for responses (e.g., 'en_US', 'ko_KR')
+            language: Default language code for lookups (e.g., 'en_US', 'ko_KR')
+            load: Whether to load the static data immediately (otherwise call load())
+            cache: On-disk cache for versions and datasets (defaults to ~/.veigar_bot/ddragon)
+            max_versions: Number of versions kept loaded for historical matches
         """
-        self.language = language
-        self.version = self._get_latest_version()
-        self.champions = self._load_champion_data()
-        self.items = self._load_item_data()
-        self.runes = self._load_runes_data()
-        self.summoner_spells = self._load_summoner_spell_data()
         self.logger = logging.getLogger(__name__)
+        self.cache = cache or DataDragonCache()
+        self.language = language
+        self.version = None
+        self.versions: List[str] = []  # Known Data Dragon versions, newest first
+        self.store: Optional[StaticDataStore] = None
+        self.loaded = False
+        # Shared with wrappers from with_language() / for_game_version()
+        self.max_versions = max_versions
+        self._stores: "OrderedDict[str, StaticDataStore]" = OrderedDict()  # LRU of older versions
+        self._game_versions: Dict[str, str] = {}  # gameVersion -> Data Dragon version
+        self._stores_lock = threading.Lock()
+        if load:
+            self.load()
         
-    def _get_latest_version(self) -> str:
+    def load(self):
         """
-        Get the latest game version from Data Dragon
+        Fetch the latest version and preload all datasets for the default language
         
-        Returns:
-            Latest version string (e.g., '15.9.1')
+        Other languages are loaded lazily, one dataset at a time, on first use.
         """
-        try:
-            response = requests.get(f"{self.BASE_URL}/api/versions.json")
-            response.raise_for_status()
-            versions = response.json()
-            return versions[0]  # First version is the latest
-        except Exception as e:
-            self.logger.error(f"Error fetching game version: {e}")
-            return "15.9.1"  # Fallback to latest known version
+        self.versions = self.cache.get_versions()
+        self.version = self._get_latest_version()
+        self.store = StaticDataStore(self.cache, self.version)
+        self.store.preload(self.language)
+        with self._stores_lock:
+            self._stores[self.version] = self.store
+        self.loaded = True
+        self.cache.prune()
+
+    def with_language(self, language: str) -> 'DataDragonAPI':
+        """
+        Get a wrapper for another language sharing this one's loaded data
+        
+        Language-independent data is shared; the other language's datasets
+        are loaded on first use.
+        
+        Args:
+            language: Language code (e.g., 'ko_KR')
             
-    def _load_champion_data(self) -> Dict[str, Any]:
+        Returns:
+            DataDragonAPI with the same version and store
+        """
+        return self._wrapper(self.version, self.store, language)
+
+    def _wrapper(self, version: str, store: StaticDataStore, language: str) -> 'DataDragonAPI':
+        other = DataDragonAPI(language=language, load=False, cache=self.cache, max_versions=self.max_versions)
+        other.version = version
+        other.versions = self.versions
+        other.store = store
+        other.loaded = self.loaded
+        other._stores = self._stores
+        other._game_versions = self._game_versions
+        other._stores_lock = self._stores_lock
+        return other
+
+    def resolve_version(self, game_version: Optional[str]) -> str:
         """
-        Load champion data from Data Dragon
+        Map a match's gameVersion to the nearest Data Dragon version
         
+        Picks the latest Data Dragon release of the same patch, else the
+        newest release before it, else the oldest known release. Uses the
+        version list read by load(), so it never makes a request and is safe
+        to call while painting.
+        
+        Args:
+            game_version: gameVersion from match info (e.g., '14.23.636.3125')
+            
         Returns:
-            Dictionary containing champion data
-        """
-        try:
-            url = f"{self.BASE_URL}/cdn/{self.version}/data/{self.language}/champion.json"
-            response = requests.get(url)
-            response.raise_for_status()
-            return response.json()['data']
-        except Exception as e:
-            self.logger.error(f"Error loading champion data: {e}")
-            return {}
+            Data Dragon version (this wrapper's version if unknown)
+        """
+        patch = version_key(game_version or '')[:2]
+        if len(patch) < 2:
+            return self.version
+        cached = self._game_versions.get(game_version)
+        if cached:
+            return cached
 
-    def _load_item_data(self) -> Dict[str, Any]:
+        candidates = sorted(
+            (version_key(v), v) for v in self.versions
+            if v[:1].isdigit() and len(version_key(v)) >= 2
+        )
+        resolved = self.version
+        if candidates:
+            same_patch = [v for key, v in candidates if key[:2] == patch]
+            older = [v for key, v in candidates if key[:2] < patch]
+            resolved = same_patch[-1] if same_patch else older[-1] if older else candidates[0][1]
+        self._game_versions[game_version] = resolved
+        return resolved
+
+    def for_game_version(self, game_version: Optional[str]) -> 'DataDragonAPI':
         """
-        Load item data from Data Dragon
+        Get a wrapper for the static data of the patch a match was played on
+        
+        The version's datasets are loaded lazily on first lookup and kept in an
+        LRU of max_versions versions, so removed items and reworked champions
+        resolve as they were.
         
+        Args:
+            game_version: gameVersion from match info (e.g., '14.23.636.3125')
+            
         Returns:
-            Dictionary containing item data
-        """
-        try:
-            url = f"{self.BASE_URL}/cdn/{self.version}/data/{self.language}/item.json"
-            response = requests.get(url)
-            response.raise_for_status()
-            return response.json()['data']
-        except Exception as e:
-            self.logger.error(f"Error loading item data: {e}")
-            return {}
+            DataDragonAPI for the nearest Data Dragon version (self if current)
+        """
+        if not self.loaded:
+            return self
+        version = self.resolve_version(game_version)
+        if version == self.version:
+            return self
+        # The current version's store is registered by load(), so older-version
+        # wrappers resolving back to it share the preloaded data
+        with self._stores_lock:
+            store = self._stores.get(version)
+            if store is None:
+                store = StaticDataStore(self.cache, version)
+                self._stores[version] = store
+                while len(self._stores) > self.max_versions:
+                    self._stores.popitem(last=False)
+            else:
+                self._stores.move_to_end(version)
+        return self._wrapper(version, store, self.language)
 
-    def _load_runes_data(self) -> List[Dict[str, Any]]:
+    def loaded_for_game_version(self, game_version: Optional[str],
+                                kinds: Iterable[str] = ('champion', 'item')) -> Optional['DataDragonAPI']:
         """
-        Load runes reforged data from Data Dragon
+        Like for_game_version, but only if the version's datasets are already loaded
+        
+        Never loads or creates anything, so it is safe to call while painting;
+        load the version with for_game_version() in the background otherwise.
         
+        Args:
+            game_version: gameVersion from match info (e.g., '14.23.636.3125')
+            kinds: Datasets that must be loaded
+            
         Returns:
-            List containing rune data
-        """
-        try:
-            url = f"{self.BASE_URL}/cdn/{self.version}/data/{self.language}/runesReforged.json"
-            response = requests.get(url)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            self.logger.error(f"Error loading runes data: {e}")
-            return []
+            DataDragonAPI for the nearest Data Dragon version, or None if not loaded
+        """
+        if not self.loaded:
+            return self
+        version = self.resolve_version(game_version)
+        if version == self.version:
+            return self
+        with self._stores_lock:
+            store = self._stores.get(version)
+            if store is not None:
+                self._stores.move_to_end(version)
+        if store is None or not store.is_loaded(self.language, kinds):
+            return None
+        return self._wrapper(version, store, self.language)
 
-    def _load_summoner_spell_data(self) -> Dict[str, Any]:
+    def _get_latest_version(self) -> str:
         """
-        Load summoner spell data from Data Dragon
+        Get the latest game version from the loaded version list
         
         Returns:
-            Dictionary containing summoner spell data
-        """
-        try:
-            url = f"{self.BASE_URL}/cdn/{self.version}/data/{self.language}/summoner.json"
-            response = requests.get(url)
-            response.raise_for_status()
-            return response.json()['data']
-        except Exception as e:
-            self.logger.error(f"Error loading summoner spell data: {e}")
-            return {}
+            Latest version string (e.g., '15.9.1')
+        """
+        if self.versions:
+            return self.versions[0]
+        self.logger.error("Error fetching game version, using fallback")
+        return "15.9.1"  # Fallback to latest known version
+
+    def _dataset(self, kind: str, language: Optional[str] = None) -> Any:
+        if self.store is None:
+            return [] if kind == 'rune' else {}
+        return self.store.get_dataset(kind, language or self.language)
+
+    def _record(self, kind: str, record_id: Any, language: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        if self.store is None:
+            return None
+        return self.store.get_record(kind, record_id, language or self.language)
+
+    @property
+    def champions(self) -> Dict[str, Any]:
+        return self._dataset('champion')
+
+    @property
+    def items(self) -> Dict[str, Any]:
+        return self._dataset('item')
+
+    @property
+    def runes(self) -> List[Dict[str, Any]]:
+        return self._dataset('rune')
+
+    @property
+    def summoner_spells(self) -> Dict[str, Any]:
+        return self._dataset('spell')
+
+    @property
+    def index(self) -> StaticDataIndex:
+        """Search index for the default language"""
+        if self.store is None:
+            return StaticDataIndex({})
+        return self.store.get_index(self.language)
             
-    def get_champion_by_id(self, champion_id: int) -> Optional[Dict[str, Any]]:
+    def get_champion_by_id(self, champion_id: int, language: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Get champion information by champion ID
         
         Args:
             champion_id: Numeric champion ID
+            language: Language code (defaults to this wrapper's language)
             
         Returns:
             Dictionary containing champion information or None if not found
         """
-        try:
-            # Find champion by key (which is the champion ID)
-            for champion in self.champions.values():
-                if int(champion['key']) == champion_id:
-                    return champion
-            return None
-        except Exception as e:
-            self.logger.error(f"Error getting champion by ID {champion_id}: {e}")
-            return None
+        return self._record('champion', champion_id, language)
             
-    def get_champion_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+    def get_champion_by_name(self, name: str, language: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Get champion information by name
         
         Args:
             name: Champion name (case-sensitive)
+            language: Language code (defaults to this wrapper's language)
             
         Returns:
             Dictionary containing champion information or None if not found
         """
-        return self.champions.get(name)
+        return self._dataset('champion', language).get(name)
 
-    def get_item_by_id(self, item_id: int) -> Optional[Dict[str, Any]]:
+    def get_item_by_id(self, item_id: int, language: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Get item information by item ID
         
         Args:
             item_id: Numeric item ID
+            language: Language code (defaults to this wrapper's language)
             
         Returns:
             Dictionary containing item information or None if not found
         """
-        return self.items.get(str(item_id))
+        return self._record('item', item_id, language)
 
-    def get_rune_by_id(self, rune_id: int) -> Optional[Dict[str, Any]]:
+    def get_rune_by_id(self, rune_id: int, language: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Get rune information by rune ID
         
         Args:
             rune_id: Numeric rune ID
+            language: Language code (defaults to this wrapper's language)
             
         Returns:
             Dictionary containing rune information or None if not found
         """
-        for rune_tree in self.runes:
-            # Check main runes
-            if int(rune_tree['id']) == rune_id:
-                return rune_tree
-            # Check sub-runes
-            for slot in rune_tree.get('slots', []):
-                for rune in slot.get('runes', []):
-                    if int(rune['id']) == rune_id:
-                        return rune
-        return None
+        return self._record('rune', rune_id, language)
 
-    def get_summoner_spell_by_id(self, spell_id: int) -> Optional[Dict[str, Any]]:
+    def get_summoner_spell_by_id(self, spell_id: int, language: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Get summoner spell information by spell ID
         
         Args:
             spell_id: Numeric summoner spell ID
+            language: Language code (defaults to this wrapper's language)
             
         Returns:
             Dictionary containing summoner spell information or None if not found
         """
-        for spell in self.summoner_spells.values():
-            if int(spell['key']) == spell_id:
-                return spell
-        return None
+        return self._record('spell', spell_id, language)
+
+    def search(self, query: str, kinds: Optional[List[str]] = None, limit: int = 10,
+               language: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Search champions, items, runes and summoner spells by name or alias
+        
+        Args:
+            query: Free-form name, case and accent insensitive (e.g., 'mf', 'wukong', 'flash')
+            kinds: Restrict to 'champion', 'item', 'rune' and/or 'spell'
+            limit: Maximum number of results
+            language: Language of the names searched (defaults to this wrapper's language)
+            
+        Returns:
+            List of {'kind', 'id', 'record'} dictionaries, best matches first
+        """
+        if self.store is None:
+            return []
+        return self.store.get_index(language or self.language).search(query, kinds=kinds, limit=limit)
+        
+    def get_sprite_url(self, sprite: str) -> str:
+        """
+        Get the URL for a sprite atlas image
+        
+        Args:
+            sprite: Sprite file name from an 'image' record (e.g., 'champion0.png')
+            
+        Returns:
+            URL to the sprite atlas
+        """
+        return f"{self.BASE_URL}/cdn/{self.version}/img/sprite/{sprite}"
+
+    def _get_sprite(self, record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        image = (record or {}).get('image')
+        if not image or 'sprite' not in image:
+            return None
+        return {
+            'url': self.get_sprite_url(image['sprite']),
+            'x': image['x'],
+            'y': image['y'],
+            'w': image['w'],
+            'h': image['h']
+        }
+
+    def get_champion_sprite(self, champion_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the sprite atlas location of a champion's square icon
+        
+        Args:
+            champion_id: Numeric champion ID
+            
+        Returns:
+            Dictionary with the atlas 'url' and the 'x', 'y', 'w', 'h' of the icon, or None if unknown
+        """
+        return self._get_sprite(self.get_champion_by_id(champion_id))
+
+    def get_item_sprite(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the sprite atlas location of an item's icon
+        
+        Args:
+            item_id: Numeric item ID
+            
+        Returns:
+            Dictionary with the atlas 'url' and the 'x', 'y', 'w', 'h' of the icon, or None if unknown
+        """
+        return self._get_sprite(self.get_item_by_id(item_id))
+
+    def get_summoner_spell_sprite(self, spell_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the sprite atlas location of a summoner spell's icon
+        
+        Args:
+            spell_id: Numeric summoner spell ID
+            
+        Returns:
+            Dictionary with the atlas 'url' and the 'x', 'y', 'w', 'h' of the icon, or None if unknown
+        """
+        return self._get_sprite(self.get_summoner_spell_by_id(spell_id))
         
     def get_champion_square_asset(self, champion_name: str) -> str:
         """
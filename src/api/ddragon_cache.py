@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Optional, Any, List
+import requests
+from .asset_pack import AssetPack
+from .version_dirs import VersionDirs, version_key
+
+class DataDragonCache:
+    """Versioned on-disk cache for Data Dragon JSON files.
+
+    Layout under root (default ~/.veigar_bot/ddragon):
+        versions.json                     - last downloaded version list
+        versions.meta.json                - check time, ETag and Last-Modified of versions.json
+        {version}/{language}/{file}.json  - dataset files, immutable per version
+        {version}/{language}/{kind}.pickle - split StaticDataStore snapshot of a dataset
+        {version}/.last_used              - touched when the version's data is used
+
+    versions.json is revalidated at most once per check_interval with
+    If-None-Match / If-Modified-Since. Dataset URLs contain the version and
+    never change, so cached datasets are used without any request. Pruning
+    keeps the newest versions and any version used recently, so patches of
+    older matches in a history stay cached across sessions.
+
+    With an imported AssetPack, versions and datasets come from the pack and
+    the network is never used for them.
+    """
+
+    BASE_URL = "https://ddragon.leagueoflegends.com"
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        check_interval: float = 24 * 3600,
+        keep_versions: int = 2,
+        keep_unused_days: float = 30,
+        session: Optional[requests.Session] = None,
+        asset_pack: Optional[AssetPack] = None
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            root: Cache directory (defaults to ~/.veigar_bot/ddragon)
+            check_interval: Minimum seconds between versions.json checks
+            keep_versions: Number of most recent versions kept when pruning
+            keep_unused_days: Older versions are kept until unused for this many days
+            session: HTTP session to use for downloads
+            asset_pack: Offline pack to read versions and datasets from
+        """
+        self.logger = logging.getLogger(__name__)
+        self.root = Path(root) if root else Path.home() / ".veigar_bot" / "ddragon"
+        self.check_interval = check_interval
+        self.keep_versions = keep_versions
+        self.keep_unused_days = keep_unused_days
+        self.session = session or requests.Session()
+        self.asset_pack = asset_pack
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.downloads = 0  # Number of network downloads made by this instance
+        self._version_dirs = VersionDirs(self.root, "Data Dragon version")
+
+    def get_versions(self) -> List[str]:
+        """
+        Get the Data Dragon version list, newest first
+
+        Returns:
+            List of versions (empty if never downloaded and offline)
+        """
+        if self.asset_pack is not None:
+            versions = self.asset_pack.get_versions()
+            if versions:
+                return versions
+
+        versions_path = self.root / "versions.json"
+        meta_path = self.root / "versions.meta.json"
+        meta = self._read_json(meta_path) or {}
+        cached = self._read_json(versions_path)
+
+        if cached and time.time() - meta.get('checked_at', 0) < self.check_interval:
+            return cached
+
+        headers = {}
+        if cached:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        try:
+            response = self.session.get(f"{self.BASE_URL}/api/versions.json", headers=headers, timeout=10)
+            if response.status_code == 304 and cached:
+                meta['checked_at'] = time.time()
+                self._write_json(meta_path, meta)
+                return cached
+            response.raise_for_status()
+            self.downloads += 1
+            versions = response.json()
+            self._write_json(versions_path, versions)
+            self._write_json(meta_path, {
+                'checked_at': time.time(),
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            })
+            self.prune(versions)
+            return versions
+        except Exception as e:
+            self.logger.error(f"Error checking Data Dragon versions: {e}")
+            return cached or []
+
+    def get_latest_version(self) -> Optional[str]:
+        """Get the newest known version, or None if unknown"""
+        versions = self.get_versions()
+        return versions[0] if versions else None
+
+    def get_dataset(self, version: str, language: str, filename: str) -> Optional[Any]:
+        """
+        Get a dataset file from disk, downloading it on a cache miss
+
+        Args:
+            version: Data Dragon version (e.g., '15.9.1')
+            language: Language code (e.g., 'en_US')
+            filename: Dataset file name (e.g., 'champion.json')
+
+        Returns:
+            Parsed JSON content or None if unavailable
+        """
+        if self.asset_pack is not None:
+            data = self.asset_pack.read_json(f"{version}/data/{language}/{filename}")
+            if data is not None:
+                return data
+
+        path = self.root / version / language / filename
+        cached = self._read_json(path)
+        if cached is not None:
+            return cached
+
+        url = f"{self.BASE_URL}/cdn/{version}/data/{language}/{filename}"
+        try:
+            response = self.session.get(url, timeout=30)
+            response.raise_for_status()
+            self.downloads += 1
+            data = response.json()
+            self._write_json(path, data)
+            return data
+        except Exception as e:
+            self.logger.error(f"Error downloading {url}: {e}")
+            return None
+
+    def snapshot_path(self, version: str, language: str, name: str) -> Path:
+        """Path of a prebuilt snapshot (e.g., name='champion') for a version and language"""
+        return self.root / version / language / f"{name}.pickle"
+
+    def mark_used(self, version: str):
+        """Record that a version's data is in use, protecting it from pruning"""
+        self._version_dirs.mark_used(version)
+
+    def last_used(self, version: str) -> float:
+        """Epoch time a cached version was last used (directory time if never marked)"""
+        return self._version_dirs.last_used(version)
+
+    def prune(self, versions: Optional[List[str]] = None):
+        """
+        Remove cached versions that are neither among the keep_versions most
+        recent ones nor used within keep_unused_days
+
+        Args:
+            versions: Known version list, newest first (defaults to sorting cached directories)
+        """
+        cached_versions = self._version_dirs.versions()
+        if versions:
+            ordered = [v for v in versions if v in cached_versions]
+            ordered += sorted((v for v in cached_versions if v not in versions), key=version_key, reverse=True)
+        else:
+            ordered = sorted(cached_versions, key=version_key, reverse=True)
+        self._version_dirs.prune(ordered, self.keep_versions, self.keep_unused_days)
+
+    @staticmethod
+    def _read_json(path: Path) -> Optional[Any]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Missing or corrupt entry: treat as a miss so it gets downloaded again
+            return None
+
+    @staticmethod
+    def _write_json(path: Path, data: Any):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+        os.replace(tmp_path, path)
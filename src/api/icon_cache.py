@@ -0,0 +1,128 @@
+import os
+import logging
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit
+from typing import Optional
+import requests
+from .asset_pack import AssetPack
+from .version_dirs import VersionDirs, version_key
+
+class IconDiskCache:
+    """On-disk cache of raw icon files downloaded from Data Dragon.
+
+    Files are stored under root (default ~/.veigar_bot/icons) by URL path, so
+    versioned assets land in cdn/{version}/img/... and versionless ones (rune
+    icons, splash art) in cdn/img/... Versioned URLs never change content, so a
+    cached file is used without any request. Files contained in an imported
+    AssetPack are read from it directly. Each version directory has a
+    .last_used marker touched on first use per session, so pruning keeps the
+    icons of patches still shown in match histories. Safe to use from worker
+    threads.
+    """
+
+    def __init__(self, root: Optional[Path] = None, session: Optional[requests.Session] = None,
+                 asset_pack: Optional[AssetPack] = None):
+        """
+        Initialize the cache
+
+        Args:
+            root: Cache directory (defaults to ~/.veigar_bot/icons)
+            session: HTTP session to use for downloads
+            asset_pack: Offline pack checked before the disk cache and the network
+        """
+        self.logger = logging.getLogger(__name__)
+        self.root = Path(root) if root else Path.home() / ".veigar_bot" / "icons"
+        self.session = session or requests.Session()
+        self.asset_pack = asset_pack
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.downloads = 0  # Number of network downloads made by this instance
+        self._lock = threading.Lock()
+        self._url_locks = {}
+        self._version_dirs = VersionDirs(self.root / "cdn", "icons for version")
+
+    def path_for(self, url: str) -> Path:
+        """Local path of the cached file for a URL"""
+        path = urlsplit(url).path.lstrip('/')
+        return self.root.joinpath(*[part for part in path.split('/') if part not in ('', '.', '..')])
+
+    def get_bytes(self, url: str) -> bytes:
+        """
+        Get the raw file for a URL, downloading it on a cache miss
+
+        Args:
+            url: Icon URL
+
+        Returns:
+            File contents
+
+        Raises:
+            requests.RequestException: If the download fails
+        """
+        if self.asset_pack is not None:
+            data = self.asset_pack.read_url(urlsplit(url).path)
+            if data is not None:
+                return data
+
+        path = self.path_for(url)
+        self._mark_used(path)
+        data = self._read(path)
+        if data is not None:
+            return data
+
+        # One download per URL; concurrent callers for the same file (e.g. a
+        # sprite atlas shared by many icons) wait and then read it from disk
+        with self._lock:
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+        try:
+            with url_lock:
+                data = self._read(path)
+                if data is not None:
+                    return data
+
+                response = self.session.get(url, timeout=10)
+                response.raise_for_status()
+                data = response.content
+                with self._lock:
+                    self.downloads += 1
+
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+                    with open(tmp_path, 'wb') as f:
+                        f.write(data)
+                    os.replace(tmp_path, path)
+                except OSError as e:
+                    self.logger.warning(f"Could not cache icon {url}: {e}")
+        finally:
+            with self._lock:
+                self._url_locks.pop(url, None)
+        return data
+
+    def _mark_used(self, path: Path):
+        parts = path.relative_to(self.root).parts
+        if len(parts) < 3 or parts[0] != 'cdn' or not parts[1][:1].isdigit():
+            return  # Versionless file
+        self._version_dirs.mark_used(parts[1])
+
+    @staticmethod
+    def _read(path: Path) -> Optional[bytes]:
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def prune(self, current_version: str, keep_versions: int = 2, keep_unused_days: float = 30):
+        """
+        Remove cached icon versions that are neither among the keep_versions
+        most recent ones nor used within keep_unused_days
+
+        Args:
+            current_version: Version in use, which is always kept
+            keep_versions: Number of most recent versions kept
+            keep_unused_days: Older versions are kept until unused for this many days
+        """
+        versions = [v for v in self._version_dirs.versions() if v[:1].isdigit()]
+        ordered = sorted(versions, key=version_key, reverse=True)
+        self._version_dirs.prune(ordered, keep_versions, keep_unused_days, keep=(current_version,))
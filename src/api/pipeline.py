@@ -0,0 +1,187 @@
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Optional, Dict, Any, Tuple, Iterable, Iterator, Callable
+
+class _InputEnd:
+    """Marks the end of the player input in the results queue"""
+
+    def __init__(self, count: int, error: Optional[Exception] = None):
+        self.count = count
+        self.error = error
+
+class ProfilePipeline:
+    """Resolve many Riot IDs through the account -> summoner/league stages.
+
+    Each stage has its own concurrency bound and items move to the next stage
+    as soon as their previous stage completes, so requests for different
+    players overlap instead of running one player at a time. Summoner and
+    league lookups for a player only depend on the PUUID and run side by side.
+    Results are yielded in completion order.
+
+    Players are read lazily on a feeder thread, at most max_players_in_flight
+    ahead of the results handed out, so an unbounded input (e.g. stdin)
+    streams results as they complete with constant memory.
+    """
+
+    DEFAULT_STAGE_LIMITS = {
+        'account': 16,
+        'summoner': 16,
+        'league': 16
+    }
+
+    def __init__(
+        self,
+        riot_api,
+        players: Iterable[Tuple[str, str, str]],
+        stage_limits: Optional[Dict[str, int]] = None,
+        max_players_in_flight: int = 64
+    ):
+        """
+        Initialize the pipeline
+
+        Args:
+            riot_api: RiotAPI instance whose shared executor runs the requests
+            players: Iterable of (game_name, tag_line, platform) tuples, consumed lazily
+            stage_limits: Maximum in-flight requests per stage ('account', 'summoner', 'league')
+            max_players_in_flight: Maximum players read from players but not yet yielded
+        """
+        self.riot_api = riot_api
+        self.players = players
+        self.max_players_in_flight = max(1, max_players_in_flight)
+        self.stage_limits = dict(self.DEFAULT_STAGE_LIMITS)
+        if stage_limits:
+            self.stage_limits.update(stage_limits)
+
+        self._lock = threading.Lock()
+        self._pending = {stage: deque() for stage in self.stage_limits}
+        self._in_flight = {stage: 0 for stage in self.stage_limits}
+        self._results = queue.Queue()
+        self._stage_calls = {
+            'account': lambda item: self.riot_api.get_account_by_riot_id(item['game_name'], item['tag_line']),
+            'summoner': lambda item: self.riot_api.get_summoner_by_puuid(item['account_info']['puuid'], platform=item['platform']),
+            'league': lambda item: self.riot_api.get_league_entries(item['account_info']['puuid'], platform=item['platform'])
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """
+        Run the pipeline and yield one result per player as it completes
+
+        Yields:
+            Dictionary with 'index', 'game_name', 'tag_line', 'platform',
+            'account_info', 'summoner_info', 'league_entries' (empty if
+            unranked, None if the lookup failed) and 'error' (None on
+            success, otherwise a message)
+        """
+        slots = threading.Semaphore(self.max_players_in_flight)
+        feeder = threading.Thread(target=self._feed, args=(slots,), name="profile-pipeline-input", daemon=True)
+        feeder.start()
+
+        total = None
+        yielded = 0
+        while total is None or yielded < total:
+            item = self._results.get()
+            if isinstance(item, _InputEnd):
+                if item.error is not None:
+                    raise item.error
+                total = item.count
+                continue
+            slots.release()
+            yielded += 1
+            yield item
+
+    def _feed(self, slots: threading.Semaphore):
+        """Read players into the account stage while fewer than max_players_in_flight are unfinished"""
+        count = 0
+        try:
+            for index, (game_name, tag_line, platform) in enumerate(self.players):
+                slots.acquire()
+                self._enqueue('account', {
+                    'index': index,
+                    'game_name': game_name,
+                    'tag_line': tag_line,
+                    'platform': platform,
+                    'account_info': None,
+                    'summoner_info': None,
+                    'league_entries': None,
+                    'error': None,
+                    'remaining': 0
+                })
+                count += 1
+                self._pump()
+        except Exception as e:
+            # Reading the input failed (e.g. a malformed Riot ID); re-raised by the iterator
+            self._results.put(_InputEnd(count, e))
+            return
+        self._results.put(_InputEnd(count))
+
+    def _enqueue(self, stage: str, item: Dict[str, Any]):
+        with self._lock:
+            self._pending[stage].append(item)
+
+    def _pump(self):
+        """Submit pending work for every stage that has free capacity"""
+        to_submit = []
+        with self._lock:
+            for stage, pending in self._pending.items():
+                while pending and self._in_flight[stage] < self.stage_limits[stage]:
+                    self._in_flight[stage] += 1
+                    to_submit.append((stage, pending.popleft()))
+
+        for stage, item in to_submit:
+            try:
+                future = self.riot_api.executor.submit(self._stage_calls[stage], item)
+            except RuntimeError as e:
+                # Executor already shut down; fail the item instead of stalling the iterator
+                future = Future()
+                future.set_exception(e)
+            future.add_done_callback(self._make_callback(stage, item))
+
+    def _make_callback(self, stage: str, item: Dict[str, Any]) -> Callable:
+        def callback(future):
+            try:
+                result = future.result()
+                error = None
+            except Exception as e:
+                result = None
+                error = str(e)
+
+            with self._lock:
+                self._in_flight[stage] -= 1
+
+            self._on_stage_done(stage, item, result, error)
+            self._pump()
+        return callback
+
+    def _on_stage_done(self, stage: str, item: Dict[str, Any], result: Any, error: Optional[str]):
+        if stage == 'account':
+            if not result or not result.get('puuid'):
+                item['error'] = error or "Player not found"
+                self._finish(item)
+                return
+            item['account_info'] = result
+            item['remaining'] = 2
+            self._enqueue('summoner', item)
+            self._enqueue('league', item)
+            return
+
+        if stage == 'summoner':
+            item['summoner_info'] = result
+            if not result and not item['error']:
+                item['error'] = error or "Could not fetch summoner information"
+        else:
+            # [] means unranked; None means the lookup failed
+            item['league_entries'] = result
+            if result is None and not item['error']:
+                item['error'] = error or "Could not fetch league entries"
+
+        with self._lock:
+            item['remaining'] -= 1
+            done = item['remaining'] == 0
+        if done:
+            self._finish(item)
+
+    def _finish(self, item: Dict[str, Any]):
+        item.pop('remaining', None)
+        self._results.put(item)
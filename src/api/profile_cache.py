@@ -0,0 +1,194 @@
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+class ProfileCache:
+    """Persistent cache of recently viewed players, for stale-while-revalidate display.
+
+    Stored in SQLite at path (default ~/.veigar_bot/profiles.sqlite3):
+        profiles     - account, summoner and league entries per Riot ID and platform
+        match_pages  - match IDs of the first match history page per PUUID
+        matches      - zlib-compressed match details, which never change once finished
+
+    Entries are returned regardless of age: callers show them at once and
+    revalidate in the background. The max_profiles most recently viewed
+    players and max_matches most recently used matches are kept. Safe to use
+    from multiple threads; database errors are logged and treated as misses.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS profiles (
+            platform TEXT NOT NULL,
+            riot_id TEXT NOT NULL,
+            puuid TEXT NOT NULL,
+            data TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (platform, riot_id)
+        );
+        CREATE TABLE IF NOT EXISTS match_pages (
+            puuid TEXT PRIMARY KEY,
+            match_ids TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS matches (
+            match_id TEXT PRIMARY KEY,
+            data BLOB NOT NULL,
+            used_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS profiles_updated_at ON profiles (updated_at);
+        CREATE INDEX IF NOT EXISTS matches_used_at ON matches (used_at);
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_profiles: int = 200, max_matches: int = 5000):
+        """
+        Open (or create) the cache
+
+        Args:
+            path: Database file (defaults to ~/.veigar_bot/profiles.sqlite3)
+            max_profiles: Number of most recently viewed players kept
+            max_matches: Number of most recently used match details kept
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path) if path else Path.home() / ".veigar_bot" / "profiles.sqlite3"
+        self.max_profiles = max_profiles
+        self.max_matches = max_matches
+        self._lock = threading.Lock()
+        self._conn = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            self.logger.error(f"Profile cache disabled, could not open {self.path}: {e}")
+            self._conn = None
+
+    @staticmethod
+    def riot_id_key(game_name: str, tag_line: str) -> str:
+        """Case-insensitive key of a Riot ID"""
+        return f"{game_name}#{tag_line}".casefold()
+
+    def get_profile(self, platform: str, game_name: str, tag_line: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the last known profile of a player
+
+        Returns:
+            Dict with 'account_info', 'summoner_info', 'league_entries' and
+            'updated_at' (epoch seconds), or None if never cached
+        """
+        row = self._fetchone(
+            "SELECT data, updated_at FROM profiles WHERE platform = ? AND riot_id = ?",
+            (platform, self.riot_id_key(game_name, tag_line))
+        )
+        if row is None:
+            return None
+        profile = json.loads(row[0])
+        profile['updated_at'] = row[1]
+        return profile
+
+    def put_profile(self, platform: str, game_name: str, tag_line: str, results: Dict[str, Any]):
+        """Store a freshly fetched profile (SearchWorker results) and prune old players"""
+        data = {key: results.get(key) for key in ('account_info', 'summoner_info', 'league_entries')}
+        puuid = (data['account_info'] or {}).get('puuid')
+        if not puuid:
+            return
+        self._execute(
+            "INSERT OR REPLACE INTO profiles (platform, riot_id, puuid, data, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (platform, self.riot_id_key(game_name, tag_line), puuid, json.dumps(data), time.time())
+        )
+        self.prune()
+
+    def get_match_ids(self, puuid: str) -> Optional[List[str]]:
+        """Match IDs of the last fetched first match history page of a player"""
+        row = self._fetchone("SELECT match_ids FROM match_pages WHERE puuid = ?", (puuid,))
+        return json.loads(row[0]) if row else None
+
+    def put_match_ids(self, puuid: str, match_ids: List[str]):
+        """Store the first match history page of a player"""
+        self._execute(
+            "INSERT OR REPLACE INTO match_pages (puuid, match_ids, updated_at) VALUES (?, ?, ?)",
+            (puuid, json.dumps(match_ids), time.time())
+        )
+
+    def get_match(self, match_id: str) -> Optional[Dict[str, Any]]:
+        """Get cached match details"""
+        return self.get_matches([match_id]).get(match_id)
+
+    def get_matches(self, match_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get cached match details by match ID; missing matches are left out"""
+        if not match_ids:
+            return {}
+        placeholders = ','.join('?' * len(match_ids))
+        try:
+            with self._lock:
+                if self._conn is None:
+                    return {}
+                rows = self._conn.execute(
+                    f"SELECT match_id, data FROM matches WHERE match_id IN ({placeholders})", list(match_ids)
+                ).fetchall()
+                with self._conn:
+                    self._conn.execute(
+                        f"UPDATE matches SET used_at = ? WHERE match_id IN ({placeholders})",
+                        [time.time(), *match_ids]
+                    )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Profile cache read failed: {e}")
+            return {}
+        return {match_id: json.loads(zlib.decompress(data)) for match_id, data in rows}
+
+    def put_match(self, details: Dict[str, Any]):
+        """Store match details"""
+        match_id = details.get('metadata', {}).get('matchId')
+        if not match_id:
+            return
+        data = zlib.compress(json.dumps(details, separators=(',', ':')).encode('utf-8'))
+        self._execute(
+            "INSERT OR REPLACE INTO matches (match_id, data, used_at) VALUES (?, ?, ?)",
+            (match_id, data, time.time())
+        )
+
+    def prune(self):
+        """Drop players and matches beyond max_profiles and max_matches, least recent first"""
+        self._execute(
+            "DELETE FROM profiles WHERE rowid IN "
+            "(SELECT rowid FROM profiles ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_profiles,)
+        )
+        self._execute("DELETE FROM match_pages WHERE puuid NOT IN (SELECT puuid FROM profiles)")
+        self._execute(
+            "DELETE FROM matches WHERE rowid IN "
+            "(SELECT rowid FROM matches ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_matches,)
+        )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _fetchone(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        try:
+            with self._lock:
+                if self._conn is None:
+                    return None
+                return self._conn.execute(sql, params).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Profile cache read failed: {e}")
+            return None
+
+    def _execute(self, sql: str, params: tuple = ()):
+        try:
+            with self._lock:
+                if self._conn is None:
+                    return
+                with self._conn:
+                    self._conn.execute(sql, params)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Profile cache write failed: {e}")
@@ -0,0 +1,178 @@
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable
+
+class RankHistory:
+    """Append-only rank time series per player and queue, for LP graphs.
+
+    Stored in SQLite at path (default ~/.veigar_bot/rank_history.sqlite3).
+    Every league-v4 observation is recorded, but consecutive observations
+    with the same tier, division, LP, wins and losses share one row: a row
+    is a run from ts_first to ts_last, so a player polled every few minutes
+    still costs one row per LP change. Rows are clustered by (puuid, queue,
+    ts_first), so a player's whole history is one short range scan.
+
+    Observations older than the newest recorded one for a player and queue
+    are ignored. Safe to use from multiple threads; database errors are
+    logged and recording is skipped.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rank_history (
+            puuid TEXT NOT NULL,
+            queue TEXT NOT NULL,
+            ts_first INTEGER NOT NULL,
+            ts_last INTEGER NOT NULL,
+            tier TEXT NOT NULL,
+            division TEXT NOT NULL,
+            lp INTEGER NOT NULL,
+            wins INTEGER NOT NULL,
+            losses INTEGER NOT NULL,
+            PRIMARY KEY (puuid, queue, ts_first)
+        ) WITHOUT ROWID;
+    """
+
+    TIERS = ('IRON', 'BRONZE', 'SILVER', 'GOLD', 'PLATINUM', 'EMERALD', 'DIAMOND')
+    APEX_TIERS = ('MASTER', 'GRANDMASTER', 'CHALLENGER')
+    DIVISIONS = ('IV', 'III', 'II', 'I')
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Open (or create) the rank history
+
+        Args:
+            path: Database file (defaults to ~/.veigar_bot/rank_history.sqlite3)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path) if path else Path.home() / ".veigar_bot" / "rank_history.sqlite3"
+        self._lock = threading.Lock()
+        self._conn = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            self.logger.error(f"Rank history disabled, could not open {self.path}: {e}")
+            self._conn = None
+
+    @classmethod
+    def ladder_score(cls, tier: str, division: str, lp: int) -> int:
+        """
+        Position on the ladder in LP, continuous across divisions and tiers
+
+        Each division below Master spans 100 LP; Master and above share one
+        LP scale starting where Diamond I ends.
+        """
+        tier = tier.upper()
+        if tier in cls.APEX_TIERS:
+            return len(cls.TIERS) * 400 + lp
+        tier_index = cls.TIERS.index(tier) if tier in cls.TIERS else 0
+        division_index = cls.DIVISIONS.index(division) if division in cls.DIVISIONS else 0
+        return tier_index * 400 + division_index * 100 + lp
+
+    def record_entries(self, entries: Iterable[Dict[str, Any]], observed_at: Optional[float] = None,
+                       puuid: Optional[str] = None, tier: Optional[str] = None, queue: Optional[str] = None):
+        """
+        Record league-v4 entries observed at one time
+
+        Args:
+            entries: League entries (leaguePoints, rank, wins, losses, ...)
+            observed_at: Epoch seconds of the observation (defaults to now)
+            puuid: Player of entries that lack 'puuid'
+            tier: Tier of entries that lack 'tier' (apex league lists)
+            queue: Queue of entries that lack 'queueType' (apex league lists)
+        """
+        ts = int(observed_at if observed_at is not None else time.time())
+        rows = []
+        for entry in entries:
+            row = (
+                entry.get('puuid') or puuid,
+                entry.get('queueType') or queue,
+                entry.get('tier') or tier,
+                entry.get('rank') or 'I',
+                entry.get('leaguePoints', 0),
+                entry.get('wins', 0),
+                entry.get('losses', 0)
+            )
+            if all(value is not None for value in row[:3]):
+                rows.append(row)
+        if not rows:
+            return
+        try:
+            with self._lock:
+                if self._conn is None:
+                    return
+                with self._conn:
+                    for row in rows:
+                        self._append(ts, *row)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Rank history write failed: {e}")
+
+    def record_league(self, league: Dict[str, Any], observed_at: Optional[float] = None):
+        """Record an apex league list (challenger, grandmaster or master)"""
+        self.record_entries(
+            league.get('entries', []), observed_at,
+            tier=league.get('tier'), queue=league.get('queue')
+        )
+
+    def _append(self, ts: int, puuid: str, queue: str, tier: str, division: str,
+                lp: int, wins: int, losses: int):
+        last = self._conn.execute(
+            "SELECT ts_first, ts_last, tier, division, lp, wins, losses FROM rank_history "
+            "WHERE puuid = ? AND queue = ? ORDER BY ts_first DESC LIMIT 1",
+            (puuid, queue)
+        ).fetchone()
+        if last is not None:
+            if ts <= last[1]:
+                return  # Not newer than what is recorded
+            if last[2:] == (tier, division, lp, wins, losses):
+                self._conn.execute(
+                    "UPDATE rank_history SET ts_last = ? WHERE puuid = ? AND queue = ? AND ts_first = ?",
+                    (ts, puuid, queue, last[0])
+                )
+                return
+        self._conn.execute(
+            "INSERT INTO rank_history (puuid, queue, ts_first, ts_last, tier, division, lp, wins, losses) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (puuid, queue, ts, ts, tier, division, lp, wins, losses)
+        )
+
+    def get_series(self, puuid: str, queue: str = 'RANKED_SOLO_5x5',
+                   since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Get the recorded runs of a player in a queue, oldest first
+
+        Args:
+            puuid: Player Universally Unique IDentifier
+            queue: Queue type (e.g., 'RANKED_SOLO_5x5')
+            since: Only runs last observed at or after this epoch time
+
+        Returns:
+            Dicts with 'ts_first', 'ts_last', 'tier', 'division', 'lp',
+            'wins' and 'losses'
+        """
+        try:
+            with self._lock:
+                if self._conn is None:
+                    return []
+                rows = self._conn.execute(
+                    "SELECT ts_first, ts_last, tier, division, lp, wins, losses FROM rank_history "
+                    "WHERE puuid = ? AND queue = ? AND ts_last >= ? ORDER BY ts_first",
+                    (puuid, queue, int(since or 0))
+                ).fetchall()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Rank history read failed: {e}")
+            return []
+        keys = ('ts_first', 'ts_last', 'tier', 'division', 'lp', 'wins', 'losses')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
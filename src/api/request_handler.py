@@ -1,6 +1,7 @@
 import os
 import time
 import json
+import threading
 import logging
 from typing import Optional, Dict, Any, Union, List
 import requests
@@ -17,6 +18,7 @@ class RateLimit:
         self.limit = limit
         self.interval = interval
         self.requests = []
+        self.lock = threading.Lock()
         
     def can_make_request(self) -> bool:
         now = time.time()
@@ -34,6 +36,12 @@ class RateLimit:
         oldest_request = self.requests[0]
         return max(0, self.interval - (now - oldest_request))
 
+    def get_headroom(self) -> float:
+        """Fraction of the current window that is still unused (0.0 - 1.0)"""
+        now = time.time()
+        used = sum(1 for req_time in self.requests if now - req_time < self.interval)
+        return max(0.0, 1.0 - used / self.limit)
+
 class RequestHandler:
     def __init__(
         self,
@@ -69,33 +77,32 @@ class RequestHandler:
         # Try to load API key with better error handling
         try:
             # First try the provided API key
-            if api_key:
-                self.api_key = api_key
-                self.logger.info("Using provided API key")
-                return
-
-            # Try to load from environment variable first
-            self.api_key = os.getenv('RIOT_API_KEY')
+            self.api_key = api_key
             if self.api_key:
-                self.logger.info("Using API key from environment variable")
-                return
+                self.logger.info("Using provided API key")
+            else:
+                # Try to load from environment variable first
+                self.api_key = os.getenv('RIOT_API_KEY')
+                if self.api_key:
+                    self.logger.info("Using API key from environment variable")
 
-            # Try to load from .env file in various locations
-            env_locations = [
-                '.env',  # Current directory
-                '../.env',  # Parent directory
-                '../../.env',  # Two levels up
-                os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'),  # Same directory as this file
-                os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'),  # Parent of this file
-            ]
+            if not self.api_key:
+                # Try to load from .env file in various locations
+                env_locations = [
+                    '.env',  # Current directory
+                    '../.env',  # Parent directory
+                    '../../.env',  # Two levels up
+                    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'),  # Same directory as this file
+                    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'),  # Parent of this file
+                ]
 
-            for env_path in env_locations:
-                if os.path.exists(env_path):
-                    load_dotenv(env_path)
-                    self.api_key = os.getenv('RIOT_API_KEY')
-                    if self.api_key:
-                        self.logger.info(f"Using API key from {env_path}")
-                        break
+                for env_path in env_locations:
+                    if os.path.exists(env_path):
+                        load_dotenv(env_path)
+                        self.api_key = os.getenv('RIOT_API_KEY')
+                        if self.api_key:
+                            self.logger.info(f"Using API key from {env_path}")
+                            break
 
             if not self.api_key:
                 raise APIKeyError(
@@ -129,6 +136,8 @@ class RequestHandler:
             'account-v1': RateLimit(500, 10),  # 500 requests per 10 seconds
             'match-v5': RateLimit(500, 10),    # 500 requests per 10 seconds
             'summoner-v4': RateLimit(500, 10), # 500 requests per 10 seconds
+            'spectator-v5': RateLimit(500, 10),        # 500 requests per 10 seconds
+            'champion-mastery-v4': RateLimit(500, 10), # 500 requests per 10 seconds
             'league-v4': {
                 'default': RateLimit(500, 10),
                 'by-queue': RateLimit(500, 10),
@@ -137,18 +146,35 @@ class RequestHandler:
             }
         }
 
-    def _handle_rate_limit(self, endpoint: str, limit_type: str = 'default') -> None:
-        """Handle rate limiting for an endpoint"""
+        # Optional AdaptiveConcurrencyLimiter fed with latency and 429 signals
+        self.concurrency_limiter = None
+
+    def _get_rate_limit(self, endpoint: str, limit_type: str = 'default') -> Optional[RateLimit]:
+        """Get the local rate limit tracker for an endpoint"""
         rate_limit = self.rate_limits.get(endpoint)
         if isinstance(rate_limit, dict):
             rate_limit = rate_limit.get(limit_type, rate_limit['default'])
+        return rate_limit
+
+    def get_headroom(self, endpoint: str, limit_type: str = 'default') -> float:
+        """Get the unused fraction of an endpoint's rate limit window"""
+        rate_limit = self._get_rate_limit(endpoint, limit_type)
+        return rate_limit.get_headroom() if rate_limit else 1.0
+
+    def _handle_rate_limit(self, endpoint: str, limit_type: str = 'default') -> None:
+        """Handle rate limiting for an endpoint"""
+        rate_limit = self._get_rate_limit(endpoint, limit_type)
         
         if rate_limit:
-            wait_time = rate_limit.get_wait_time()
-            if wait_time > 0:
+            # Check and reserve atomically so concurrent callers cannot overshoot the window
+            while True:
+                with rate_limit.lock:
+                    wait_time = rate_limit.get_wait_time()
+                    if wait_time <= 0:
+                        rate_limit.add_request()
+                        return
                 self.logger.debug(f"Rate limit wait: {wait_time:.2f}s for {endpoint}")
                 time.sleep(wait_time)
-            rate_limit.add_request()
 
     def _handle_response(self, response: requests.Response, endpoint_info: str) -> Dict[str, Any]:
         """Handle API response and potential errors.
@@ -236,6 +262,7 @@ class RequestHandler:
                 self._handle_rate_limit(endpoint, limit_type)
                 
                 # Make request
+                started = time.monotonic()
                 response = self.session.request(
                     method=method,
                     url=url,
@@ -243,6 +270,7 @@ class RequestHandler:
                     json=data,
                     timeout=self.timeout
                 )
+                latency = time.monotonic() - started
                 
                 # Log response in debug mode
                 if self.debug_mode:
@@ -253,10 +281,17 @@ class RequestHandler:
                         self.logger.debug(f"Response preview: {preview}")
                 
                 # Handle response
-                return self._handle_response(response, f"{method} {url}")
+                result = self._handle_response(response, f"{method} {url}")
+                if self.concurrency_limiter is not None:
+                    self.concurrency_limiter.record_success(
+                        latency, self.get_headroom(endpoint, limit_type), endpoint=endpoint
+                    )
+                return result
                 
             except RateLimitError as e:
                 self.logger.warning(f"Rate limit hit: {str(e)}")
+                if self.concurrency_limiter is not None:
+                    self.concurrency_limiter.record_rate_limited()
                 if retries < self.retry_count:
                     time.sleep(e.retry_after)
                 else:
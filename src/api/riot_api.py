@@ -1,6 +1,10 @@
-from typing import Optional, Dict, Any, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+from typing import Optional, Dict, Any, List, Tuple, Iterable, Iterator
+from concurrent.futures import Future, as_completed
 from .request_handler import RequestHandler
+from .concurrency import AdaptiveConcurrencyLimiter, AdaptiveExecutor
+from .pipeline import ProfilePipeline
+from .cache import TTLCache
 from .constants import Constants
 from .exceptions import RiotAPIError
 
@@ -10,8 +14,10 @@ class RiotAPI:
         api_key: Optional[str] = None,
         region: str = 'EUROPE',
         language: str = 'en_US',
-        max_workers: int = 4,  # Number of concurrent requests
-        debug_mode: bool = False
+        max_workers: int = 4,  # Initial number of concurrent requests
+        max_concurrency: int = 32,  # Upper bound for the adaptive concurrency limit
+        debug_mode: bool = False,
+        match_cache_bytes: int = 32 * 1024 * 1024
     ):
         """
         Initialize the Riot API wrapper
@@ -20,8 +26,10 @@ class RiotAPI:
             api_key: Riot API key (optional, will use environment variable if not provided)
             region: Default region to use (e.g., 'EUROPE', 'AMERICAS')
             language: Default language for responses
-            max_workers: Maximum number of concurrent requests
+            max_workers: Initial number of concurrent requests (adjusted automatically)
+            max_concurrency: Upper bound for the adaptive number of concurrent requests
             debug_mode: Whether to print API request logs to terminal
+            match_cache_bytes: Approximate serialized size of match details kept in memory
         """
         self.handler = RequestHandler(
             api_key=api_key, 
@@ -31,6 +39,39 @@ class RiotAPI:
         self.region = region.upper()
         self.max_workers = max_workers
         
+        # Shared executor for fan-outs; its parallelism follows latency and 429 feedback
+        self.concurrency_limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=max_workers,
+            max_limit=max_concurrency
+        )
+        self.handler.concurrency_limiter = self.concurrency_limiter
+        self.executor = AdaptiveExecutor(self.concurrency_limiter)
+        
+        # Finished matches never change, so their details can be kept without expiry.
+        # Bounded by serialized size (a match is often 50-100 KB of JSON, and the
+        # parsed objects take a few times more); match_store keeps the rest on disk.
+        self.match_cache = TTLCache(maxsize=2000, max_weight=match_cache_bytes, weigh=self._match_size)
+        
+        # Optional persistent store (e.g. ProfileCache) checked after match_cache
+        self.match_store = None
+        
+        # Optional RankHistory that records every league-v4 observation
+        self.rank_history = None
+        
+    @staticmethod
+    def _match_size(details: Dict[str, Any]) -> int:
+        """Approximate size of match details in bytes (compact JSON)"""
+        return len(json.dumps(details, separators=(',', ':')))
+        
+    def shutdown(self, wait: bool = True):
+        """
+        Release the shared executor
+        
+        Args:
+            wait: Whether to wait for running requests to finish
+        """
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+        
     def get_account_by_riot_id(self, game_name: str, tag_line: str) -> Optional[Dict[str, Any]]:
         """
         Fetch account details using Riot ID (game name and tagline)
@@ -113,7 +154,8 @@ class RiotAPI:
         count: int = 20,
         queue_type: Optional[int] = None,
         start_time: Optional[int] = None,
-        end_time: Optional[int] = None
+        end_time: Optional[int] = None,
+        region: Optional[str] = None
     ) -> Optional[List[str]]:
         """
         Fetch match history for a player
@@ -125,13 +167,14 @@ class RiotAPI:
             queue_type: Queue type ID to filter matches
             start_time: Epoch timestamp in seconds - filter games after this time
             end_time: Epoch timestamp in seconds - filter games before this time
+            region: Regional routing value to use instead of the default region
             
         Returns:
             List of match IDs or None if error occurs
         """
         try:
             url = Constants.format_api_url(
-                platform_or_region=self.region,
+                platform_or_region=region or self.region,
                 endpoint_group='MATCH_V5_APIS',
                 endpoint_name='by-puuid',
                 puuid=puuid
@@ -155,25 +198,45 @@ class RiotAPI:
             self.handler.logger.error(f"Error fetching match history: {e.message}")
             return None
 
-    def get_match_details(self, match_id: str) -> Optional[Dict[str, Any]]:
+    def get_match_details(self, match_id: str, region: Optional[str] = None,
+                          use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         Fetch detailed information about a specific match
         
         Args:
             match_id: Match ID to fetch details for
+            region: Regional routing value to use instead of the default region
+            use_cache: Whether to read and fill match_cache and match_store
+                (bulk downloads such as crawls should not)
             
         Returns:
             Dictionary containing match details or None if not found
         """
+        if use_cache:
+            cached = self.match_cache.get(match_id)
+            if cached is not None:
+                return cached
+        
+        if use_cache and self.match_store is not None:
+            stored = self.match_store.get_match(match_id)
+            if stored is not None:
+                self.match_cache.set(match_id, stored)
+                return stored
+            
         try:
             url = Constants.format_api_url(
-                platform_or_region=self.region,
+                platform_or_region=region or self.region,
                 endpoint_group='MATCH_V5_APIS',
                 endpoint_name='by-match',
                 matchId=match_id
             )
             
-            return self.handler.get(url, endpoint='match-v5')
+            details = self.handler.get(url, endpoint='match-v5')
+            if details and use_cache:
+                self.match_cache.set(match_id, details)
+                if self.match_store is not None:
+                    self.match_store.put_match(details)
+            return details
             
         except RiotAPIError as e:
             self.handler.logger.error(f"Error fetching match details: {e.message}")
@@ -231,6 +294,32 @@ class RiotAPI:
             self.handler.logger.error(f"Error fetching champion mastery: {e.message}")
             return None
 
+    def get_top_champion_masteries(self, puuid: str, platform: str, count: int = 3) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the highest champion mastery entries for a player
+        
+        Args:
+            puuid: Player Universally Unique IDentifier
+            platform: Platform to query (e.g., 'euw1', 'na1')
+            count: Number of entries to retrieve
+            
+        Returns:
+            List of champion mastery entries or None if error occurs
+        """
+        try:
+            url = Constants.format_api_url(
+                platform_or_region=platform,
+                endpoint_group='CHAMPION_MASTERY_V4_APIS',
+                endpoint_name='top',
+                encryptedPUUID=puuid
+            )
+            
+            return self.handler.get(url, endpoint='champion-mastery-v4', params={'count': count})
+            
+        except RiotAPIError as e:
+            self.handler.logger.error(f"Error fetching top champion masteries: {e.message}")
+            return None
+
     def get_total_mastery_score(self, puuid: str, platform: str) -> Optional[int]:
         """
         Get total champion mastery score
@@ -275,12 +364,43 @@ class RiotAPI:
                 encryptedPUUID=puuid
             )
             
-            return self.handler.get(url, endpoint='league-v4', limit_type='by-puuid')
+            entries = self.handler.get(url, endpoint='league-v4', limit_type='by-puuid')
+            if entries and self.rank_history is not None:
+                self.rank_history.record_entries(entries, puuid=puuid)
+            return entries
             
         except RiotAPIError as e:
             self.handler.logger.error(f"Error fetching league entries: {e.message}")
             return None
 
+    def get_active_game(self, puuid: str, platform: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the game a player is currently in
+        
+        Args:
+            puuid: Player Universally Unique IDentifier
+            platform: Platform to query (e.g., 'euw1', 'na1')
+            
+        Returns:
+            Active game information or None if the player is not in a game
+        """
+        try:
+            url = Constants.format_api_url(
+                platform_or_region=platform,
+                endpoint_group='SPECTATOR_V5_APIS',
+                endpoint_name='active',
+                encryptedPUUID=puuid
+            )
+            
+            # Called directly rather than through get() so a 404 is not logged as an error
+            return self.handler.request('GET', url, 'spectator-v5')
+            
+        except RiotAPIError as e:
+            if e.status_code == 404:
+                return None  # Not in a game
+            self.handler.logger.error(f"Error fetching active game: {e.message}")
+            return None
+
     def get_challenger_league(self, queue: str, platform: str) -> Optional[Dict[str, Any]]:
         """
         Get challenger league for a specific queue
@@ -300,7 +420,10 @@ class RiotAPI:
                 queue=queue
             )
             
-            return self.handler.get(url, endpoint='league-v4', limit_type='challenger')
+            league = self.handler.get(url, endpoint='league-v4', limit_type='challenger')
+            if league and self.rank_history is not None:
+                self.rank_history.record_league(league)
+            return league
             
         except RiotAPIError as e:
             self.handler.logger.error(f"Error fetching challenger league: {e.message}")
@@ -325,7 +448,10 @@ class RiotAPI:
                 queue=queue
             )
             
-            return self.handler.get(url, endpoint='league-v4', limit_type='challenger')
+            league = self.handler.get(url, endpoint='league-v4', limit_type='challenger')
+            if league and self.rank_history is not None:
+                self.rank_history.record_league(league)
+            return league
             
         except RiotAPIError as e:
             self.handler.logger.error(f"Error fetching grandmaster league: {e.message}")
@@ -350,7 +476,10 @@ class RiotAPI:
                 queue=queue
             )
             
-            return self.handler.get(url, endpoint='league-v4', limit_type='challenger')
+            league = self.handler.get(url, endpoint='league-v4', limit_type='challenger')
+            if league and self.rank_history is not None:
+                self.rank_history.record_league(league)
+            return league
             
         except RiotAPIError as e:
             self.handler.logger.error(f"Error fetching master league: {e.message}")
@@ -388,12 +517,71 @@ class RiotAPI:
             )
             
             params = {'page': page}
-            return self.handler.get(url, endpoint='league-v4', params=params, limit_type='by-queue')
+            entries = self.handler.get(url, endpoint='league-v4', params=params, limit_type='by-queue')
+            if entries and self.rank_history is not None:
+                self.rank_history.record_entries(entries)
+            return entries
             
         except RiotAPIError as e:
             self.handler.logger.error(f"Error fetching league entries: {e.message}")
             return None
 
+    def prefetch_match_details(self, match_ids: List[str]) -> Dict[Future, str]:
+        """
+        Start fetching match details on the shared executor without waiting
+        
+        Args:
+            match_ids: Match IDs to fetch
+            
+        Returns:
+            Mapping of future to match ID, for iter_match_history_batch
+        """
+        return {
+            self.executor.submit(self.get_match_details, match_id): match_id
+            for match_id in match_ids
+        }
+
+    def iter_match_history_batch(
+        self,
+        puuid: str,
+        count: int = 20,
+        start: int = 0,
+        match_ids: Optional[List[str]] = None,
+        futures: Optional[Dict[Future, str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch match history with details, yielding each match as soon as it arrives
+        
+        Args:
+            puuid: Player Universally Unique IDentifier
+            count: Number of matches to retrieve
+            start: Start index for pagination
+            match_ids: Already fetched match IDs to use instead of requesting them
+            futures: Detail fetches already started by prefetch_match_details
+            
+        Yields:
+            Match details in completion order
+        """
+        if futures is None:
+            if match_ids is None:
+                match_ids = self.get_match_history(puuid, count=count, start=start)
+            
+            if not match_ids:
+                return
+                
+            # Fetch match details in parallel on the shared executor
+            futures = self.prefetch_match_details(match_ids)
+        
+        # Yield results as they complete
+        for future in as_completed(futures):
+            match_id = futures[future]
+            try:
+                data = future.result()
+                if data:
+                    yield data
+            except Exception as e:
+                self.handler.logger.error(f"Error processing match {match_id}: {str(e)}")
+
     def get_match_history_batch(self, puuid: str, count: int = 20, start: int = 0) -> List[Dict[str, Any]]:
         """
         Fetch match history with details in one batch operation
@@ -406,29 +594,27 @@ class RiotAPI:
         Returns:
             List of match details
         """
-        # Get match history IDs
-        match_ids = self.get_match_history(puuid, count=count, start=start)
+        return list(self.iter_match_history_batch(puuid, count=count, start=start))
+
+    def resolve_profiles(
+        self,
+        players: Iterable[Tuple[str, str, str]],
+        stage_limits: Optional[Dict[str, int]] = None,
+        max_players_in_flight: int = 64
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Resolve account, summoner and league data for many players at once
         
-        if not match_ids:
-            return []
-            
-        # Create a thread pool to fetch match details in parallel
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit tasks for each match ID
-            future_to_match = {
-                executor.submit(self.get_match_details, match_id): match_id
-                for match_id in match_ids
-            }
-            
-            # Collect results as they complete
-            match_details = []
-            for future in as_completed(future_to_match):
-                match_id = future_to_match[future]
-                try:
-                    data = future.result()
-                    if data:
-                        match_details.append(data)
-                except Exception as e:
-                    self.handler.logger.error(f"Error processing match {match_id}: {str(e)}")
-            
-        return match_details 
\ No newline at end of file
+        Args:
+            players: Iterable of (game_name, tag_line, platform) tuples, read lazily
+            stage_limits: Maximum in-flight requests per stage ('account', 'summoner', 'league')
+            max_players_in_flight: Maximum players read ahead of the results yielded
+            
+        Yields:
+            One result dictionary per player in completion order, containing the
+            input fields, 'index', 'account_info', 'summoner_info',
+            'league_entries' and 'error' (None on success)
+        """
+        return iter(ProfilePipeline(
+            self, players, stage_limits=stage_limits, max_players_in_flight=max_players_in_flight
+        ))
@@ -0,0 +1,237 @@
+import time
+import logging
+from concurrent.futures import wait, FIRST_COMPLETED
+from typing import Optional, Dict, Any, List
+from .constants import Constants
+from .cache import TTLCache
+
+class LobbyScout:
+    """Build a live-game report for every participant of a player's active game.
+
+    Rank, top masteries and recent match summaries for all participants are
+    fetched concurrently on the RiotAPI shared executor and bounded by a time
+    budget. Whatever has not arrived when the budget runs out is left out and
+    the participant is marked incomplete, so a report is always returned on time.
+    Failed lookups also leave a participant incomplete and are listed in its
+    'errors'.
+    """
+
+    def __init__(
+        self,
+        riot_api,
+        league_ttl: float = 300,
+        mastery_ttl: float = 3600,
+        match_ids_ttl: float = 120
+    ):
+        """
+        Initialize the scout
+
+        Args:
+            riot_api: RiotAPI instance used for requests
+            league_ttl: Seconds to cache league entries per player
+            mastery_ttl: Seconds to cache top masteries per player
+            match_ids_ttl: Seconds to cache recent match IDs per player
+        """
+        self.riot_api = riot_api
+        self.logger = logging.getLogger(__name__)
+        self.league_cache = TTLCache(maxsize=1000, ttl=league_ttl)
+        self.mastery_cache = TTLCache(maxsize=1000, ttl=mastery_ttl)
+        self.match_ids_cache = TTLCache(maxsize=1000, ttl=match_ids_ttl)
+
+    def scout_riot_id(self, game_name: str, tag_line: str, platform: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Build a live-game report for a player identified by Riot ID
+
+        Args:
+            game_name: The game name
+            tag_line: The tag line
+            platform: Platform the player is on (e.g., 'euw1')
+            **kwargs: Passed on to scout()
+
+        Returns:
+            Report dictionary or None if the player is not found or not in game
+        """
+        account_info = self.riot_api.get_account_by_riot_id(game_name, tag_line)
+        if not account_info:
+            return None
+        return self.scout(account_info['puuid'], platform, **kwargs)
+
+    def scout(
+        self,
+        puuid: str,
+        platform: str,
+        time_budget: float = 5.0,
+        recent_matches: int = 5,
+        top_masteries: int = 3
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build a live-game report for a player's active game
+
+        Args:
+            puuid: Player Universally Unique IDentifier
+            platform: Platform the player is on (e.g., 'euw1')
+            time_budget: Seconds to spend on the whole report, including the spectator call
+            recent_matches: Number of recent matches to summarize per participant
+            top_masteries: Number of top champion masteries per participant
+
+        Returns:
+            Dictionary with 'game', 'participants', 'elapsed' and 'timed_out',
+            or None if the player is not in a game
+        """
+        started = time.monotonic()
+        deadline = started + time_budget
+
+        game = self.riot_api.get_active_game(puuid, platform)
+        if not game:
+            return None
+
+        region = Constants.get_region_for_platform(platform)
+        participants = [self._new_participant(p) for p in game.get('participants', [])]
+
+        # future -> (kind, participant, extra)
+        futures = {}
+
+        def submit(kind, participant, fn, *args, extra=None):
+            futures[self.riot_api.executor.submit(fn, *args)] = (kind, participant, extra)
+
+        for participant in participants:
+            p_puuid = participant['puuid']
+            if not p_puuid:
+                # Bots and hidden players cannot be looked up
+                participant['complete'] = True
+                continue
+
+            league_entries = self.league_cache.get(p_puuid)
+            if league_entries is not None:
+                participant['league_entries'] = league_entries
+            else:
+                submit('league', participant, self.riot_api.get_league_entries, p_puuid, platform)
+
+            masteries = self.mastery_cache.get((p_puuid, top_masteries))
+            if masteries is not None:
+                participant['top_masteries'] = masteries
+            else:
+                submit('mastery', participant, self.riot_api.get_top_champion_masteries, p_puuid, platform, top_masteries)
+
+            match_ids = self.match_ids_cache.get((p_puuid, recent_matches))
+            if match_ids is not None:
+                self._submit_match_details(participant, match_ids, region, submit)
+            else:
+                submit('match_ids', participant, self._get_recent_match_ids, p_puuid, recent_matches, region)
+
+        while futures:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(list(futures), timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, participant, extra = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error scouting {kind} for {participant['puuid']}: {str(e)}")
+                    result = None
+                self._handle_result(kind, participant, extra, result, recent_matches, top_masteries, region, submit)
+
+        timed_out = bool(futures)
+        incomplete = set()
+        for future, (kind, participant, extra) in futures.items():
+            future.cancel()
+            incomplete.add(id(participant))
+
+        for participant in participants:
+            if participant['puuid']:
+                participant['complete'] = id(participant) not in incomplete and not participant['errors']
+            participant['recent_matches'] = self._summarize_matches(participant)
+
+        return {
+            'game': {
+                'gameId': game.get('gameId'),
+                'platformId': game.get('platformId'),
+                'gameMode': game.get('gameMode'),
+                'gameQueueConfigId': game.get('gameQueueConfigId'),
+                'gameStartTime': game.get('gameStartTime'),
+                'gameLength': game.get('gameLength')
+            },
+            'participants': participants,
+            'elapsed': time.monotonic() - started,
+            'timed_out': timed_out
+        }
+
+    def _get_recent_match_ids(self, puuid: str, count: int, region: str) -> Optional[List[str]]:
+        return self.riot_api.get_match_history(puuid, count=count, region=region)
+
+    def _submit_match_details(self, participant: Dict[str, Any], match_ids: List[str], region: str, submit):
+        for match_id in match_ids:
+            cached = self.riot_api.match_cache.get(match_id)
+            if cached is not None:
+                participant['_matches'].append(cached)
+            else:
+                submit('match', participant, self.riot_api.get_match_details, match_id, region)
+
+    def _handle_result(self, kind, participant, extra, result, recent_matches, top_masteries, region, submit):
+        p_puuid = participant['puuid']
+        if result is None:
+            # Failed or not found; only successful lookups count toward 'complete'
+            if kind not in participant['errors']:
+                participant['errors'].append(kind)
+            return
+        if kind == 'league':
+            self.league_cache.set(p_puuid, result)
+            participant['league_entries'] = result
+        elif kind == 'mastery':
+            self.mastery_cache.set((p_puuid, top_masteries), result)
+            participant['top_masteries'] = result
+        elif kind == 'match_ids':
+            self.match_ids_cache.set((p_puuid, recent_matches), result)
+            self._submit_match_details(participant, result, region, submit)
+        elif kind == 'match':
+            participant['_matches'].append(result)
+
+    @staticmethod
+    def _new_participant(participant: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'puuid': participant.get('puuid'),
+            'riotId': participant.get('riotId'),
+            'teamId': participant.get('teamId'),
+            'championId': participant.get('championId'),
+            'spell1Id': participant.get('spell1Id'),
+            'spell2Id': participant.get('spell2Id'),
+            'league_entries': [],
+            'top_masteries': [],
+            'recent_matches': None,
+            'complete': False,
+            'errors': [],  # Kinds of lookups that failed ('league', 'mastery', 'match_ids', 'match')
+            '_matches': []
+        }
+
+    @staticmethod
+    def _summarize_matches(participant: Dict[str, Any]) -> Dict[str, Any]:
+        """Condense fetched match details into a per-participant summary"""
+        games = []
+        for match in participant.pop('_matches', []):
+            info = match.get('info', {})
+            for p in info.get('participants', []):
+                if p.get('puuid') == participant['puuid']:
+                    games.append({
+                        'matchId': match.get('metadata', {}).get('matchId'),
+                        'gameCreation': info.get('gameCreation', 0),
+                        'queueId': info.get('queueId'),
+                        'championId': p.get('championId'),
+                        'win': p.get('win', False),
+                        'kills': p.get('kills', 0),
+                        'deaths': p.get('deaths', 0),
+                        'assists': p.get('assists', 0)
+                    })
+                    break
+
+        games.sort(key=lambda g: g['gameCreation'], reverse=True)
+        count = len(games)
+        wins = sum(1 for g in games if g['win'])
+        deaths = sum(g['deaths'] for g in games)
+        return {
+            'games': count,
+            'wins': wins,
+            'kda': (sum(g['kills'] + g['assists'] for g in games) / deaths) if deaths else None,
+            'matches': games
+        }
@@ -0,0 +1,278 @@
+import os
+import math
+import mmap
+import json
+import bisect
+import struct
+import hashlib
+import logging
+import threading
+from array import array
+from typing import Optional, Dict, Tuple, Iterator
+
+class BloomFilter:
+    """Fixed-size Bloom filter over (prefix, integer) keys"""
+
+    HEADER = struct.Struct('<QI')  # bit count, hash count
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Initialize an empty filter
+
+        Args:
+            capacity: Expected number of keys
+            error_rate: Target false positive rate at capacity
+        """
+        # Standard sizing: m = -n ln(p) / ln(2)^2, k = m/n ln(2)
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / max(1, capacity) * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, prefix: str, value: int) -> Iterator[int]:
+        digest = hashlib.blake2b(f"{prefix}_{value}".encode('ascii'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, prefix: str, value: int):
+        for position in self._positions(prefix, value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, prefix: str, value: int) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(prefix, value))
+
+    def save(self, path: str):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self.HEADER.pack(self.size, self.hash_count))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'BloomFilter':
+        bloom = cls.__new__(cls)
+        with open(path, 'rb') as f:
+            bloom.size, bloom.hash_count = cls.HEADER.unpack(f.read(cls.HEADER.size))
+            bloom.bits = bytearray(f.read())
+        return bloom
+
+class _SortedIdFile:
+    """Read-only memory-mapped view of a sorted uint64 array file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._mmap = None
+        self.values = ()
+        self.open()
+
+    def open(self):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            self.values = ()
+            return
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.values = memoryview(self._mmap).cast('Q')
+
+    def close(self):
+        if isinstance(self.values, memoryview):
+            self.values.release()
+        self.values = ()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __contains__(self, value: int) -> bool:
+        values = self.values
+        i = bisect.bisect_left(values, value)
+        return i < len(values) and values[i] == value
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+class MatchIdIndex:
+    """Compact, persistent membership set for match IDs.
+
+    A match ID such as 'EUW1_1234567890' is split into its platform prefix and
+    a 64-bit integer. Each prefix keeps its integers in a sorted, memory-mapped
+    uint64 file (8 bytes per ID) plus an in-memory delta set of additions
+    since the last flush(). Nothing is written between flushes, so the files
+    on disk always reflect the last flush, e.g. a crawler checkpoint. An
+    optional Bloom filter answers most negative lookups without touching the
+    arrays; one older than the ID files (a flush interrupted by a crash) is
+    rebuilt on open.
+
+    Files in directory:
+        {PREFIX}.ids  - sorted native-endian uint64 values
+        bloom.bin     - Bloom filter (if enabled)
+        other.json    - IDs that do not fit the PREFIX_integer pattern
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        bloom_capacity: Optional[int] = None,
+        bloom_error_rate: float = 0.01
+    ):
+        """
+        Open or create an index
+
+        Args:
+            directory: Directory holding the index files
+            bloom_capacity: Expected number of IDs; enables the Bloom filter front when set
+            bloom_error_rate: Bloom filter false positive rate at capacity
+        """
+        self.directory = directory
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._files: Dict[str, _SortedIdFile] = {}
+        self._deltas: Dict[str, set] = {}
+        self._other = set()
+
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if name.endswith('.ids'):
+                prefix = name[:-4]
+                self._files[prefix] = _SortedIdFile(os.path.join(self.directory, name))
+
+        other_path = os.path.join(self.directory, 'other.json')
+        if os.path.exists(other_path):
+            with open(other_path, 'r', encoding='utf-8') as f:
+                self._other = set(json.load(f))
+
+        self.bloom = None
+        if bloom_capacity:
+            bloom_path = os.path.join(self.directory, 'bloom.bin')
+            if os.path.exists(bloom_path) and not self._bloom_is_stale(bloom_path):
+                self.bloom = BloomFilter.load(bloom_path)
+            else:
+                self.bloom = BloomFilter(bloom_capacity, bloom_error_rate)
+                for prefix, id_file in self._files.items():
+                    for value in id_file.values:
+                        self.bloom.add(prefix, value)
+
+    @staticmethod
+    def split(match_id: str) -> Optional[Tuple[str, int]]:
+        """Split 'EUW1_1234567890' into ('EUW1', 1234567890), or None if it doesn't fit"""
+        prefix, sep, number = match_id.rpartition('_')
+        if not sep or not prefix or not number.isdigit():
+            return None
+        value = int(number)
+        if value >= 1 << 64:
+            return None
+        return prefix.upper(), value
+
+    def __contains__(self, match_id: str) -> bool:
+        key = self.split(match_id)
+        with self._lock:
+            if key is None:
+                return match_id in self._other
+            prefix, value = key
+            if self.bloom is not None and not self.bloom.might_contain(prefix, value):
+                return False
+            if value in self._deltas.get(prefix, ()):
+                return True
+            id_file = self._files.get(prefix)
+            return id_file is not None and value in id_file
+
+    def add(self, match_id: str) -> bool:
+        """
+        Add a match ID
+
+        Returns:
+            True if the ID was not in the index before
+        """
+        with self._lock:
+            if match_id in self:
+                return False
+            key = self.split(match_id)
+            if key is None:
+                self._other.add(match_id)
+                return True
+            prefix, value = key
+            delta = self._deltas.setdefault(prefix, set())
+            delta.add(value)
+            if self.bloom is not None:
+                self.bloom.add(prefix, value)
+            return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return (
+                sum(len(f) for f in self._files.values())
+                + sum(len(d) for d in self._deltas.values())
+                + len(self._other)
+            )
+
+    def flush(self):
+        """Merge all deltas into the sorted files and persist the Bloom filter"""
+        with self._lock:
+            for prefix in list(self._deltas):
+                self._merge(prefix)
+            with open(os.path.join(self.directory, 'other.json'), 'w', encoding='utf-8') as f:
+                json.dump(sorted(self._other), f)
+            if self.bloom is not None:
+                self.bloom.save(os.path.join(self.directory, 'bloom.bin'))
+
+    def close(self):
+        """Release the memory maps; additions since the last flush() are dropped"""
+        with self._lock:
+            for id_file in self._files.values():
+                id_file.close()
+
+    def _bloom_is_stale(self, bloom_path: str) -> bool:
+        bloom_mtime = os.path.getmtime(bloom_path)
+        return any(os.path.getmtime(id_file.path) > bloom_mtime for id_file in self._files.values())
+
+    def _merge(self, prefix: str):
+        """Merge a prefix's delta into its sorted file (caller holds the lock)"""
+        delta = self._deltas.pop(prefix, None)
+        if not delta:
+            return
+
+        path = os.path.join(self.directory, f"{prefix}.ids")
+        tmp_path = path + '.tmp'
+        id_file = self._files.get(prefix)
+        old_values = id_file.values if id_file is not None else ()
+        old_bytes = old_values.cast('B') if isinstance(old_values, memoryview) else b''
+
+        # Copy runs of the old array in bulk between the (few) insertion points
+        with open(tmp_path, 'wb') as out:
+            previous = 0
+            for value in sorted(delta):
+                position = bisect.bisect_left(old_values, value, previous)
+                out.write(old_bytes[previous * 8:position * 8])
+                out.write(array('Q', (value,)).tobytes())
+                previous = position
+            out.write(old_bytes[previous * 8:])
+
+        if isinstance(old_bytes, memoryview):
+            old_bytes.release()
+        if id_file is not None:
+            id_file.close()
+        os.replace(tmp_path, path)
+
+        if id_file is None:
+            id_file = _SortedIdFile(path)
+            self._files[prefix] = id_file
+        else:
+            id_file.open()
+
+class HashedIdIndex(MatchIdIndex):
+    """MatchIdIndex for arbitrary string IDs such as PUUIDs.
+
+    IDs are stored as 64-bit BLAKE2b hashes under a single prefix, so each
+    costs 8 bytes on disk like a match ID. Distinct IDs can collide: with ten
+    million IDs the chance of any collision is about 3 in a million, which
+    at worst skips one ID.
+    """
+
+    PREFIX = 'H'
+
+    @staticmethod
+    def split(key: str) -> Tuple[str, int]:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+        return HashedIdIndex.PREFIX, int.from_bytes(digest, 'little')
@@ -0,0 +1,234 @@
+import os
+import pickle
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple, Iterable
+from .ddragon_cache import DataDragonCache
+from .static_index import StaticDataIndex
+
+class StaticDataStore:
+    """Static data of one Data Dragon version, shared by all languages.
+
+    Each dataset is loaded lazily per language on first use. Its records are
+    split into a language-independent base (IDs, keys, image coordinates,
+    stats...) kept once per version, and a per-language overlay holding only
+    the localized text fields. Records handed out are plain dicts merging
+    overlay over base; they reference the base's value objects instead of
+    copying them, so each extra language costs its text plus one small dict
+    per record.
+
+    The split form of every (language, dataset) is pickled next to the cached
+    JSON so warm starts skip JSON parsing. Safe to use from multiple threads.
+    """
+
+    FORMAT_VERSION = 1
+
+    # kind -> Data Dragon file
+    DATASETS = {
+        'champion': 'champion.json',
+        'item': 'item.json',
+        'rune': 'runesReforged.json',
+        'spell': 'summoner.json'
+    }
+
+    # kind -> fields whose values differ between languages
+    LOCALIZED_FIELDS = {
+        'champion': ('name', 'title', 'blurb', 'partype'),
+        'item': ('name', 'description', 'plaintext', 'colloq'),
+        'rune': ('name', 'shortDesc', 'longDesc'),
+        'spell': ('name', 'description', 'tooltip', 'resource')
+    }
+
+    def __init__(self, cache: DataDragonCache, version: str):
+        """
+        Initialize an empty store
+
+        Args:
+            cache: Cache used to read dataset files and snapshots
+            version: Data Dragon version (e.g., '15.9.1')
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache = cache
+        self.version = version
+        self.cache.mark_used(version)
+        self._base: Dict[str, Any] = {}                       # kind -> base records
+        self._overlays: Dict[Tuple[str, str], Any] = {}       # (kind, language) -> localized fields
+        self._datasets: Dict[Tuple[str, str], Any] = {}       # (kind, language) -> localized views
+        self._by_id: Dict[Tuple[str, str], Dict[int, Any]] = {}
+        self._indexes: Dict[str, StaticDataIndex] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Any, threading.Lock] = {}
+
+    def preload(self, language: str, kinds: Optional[Iterable[str]] = None):
+        """Load datasets for a language in parallel (all datasets by default)"""
+        kinds = list(kinds or self.DATASETS)
+        with ThreadPoolExecutor(max_workers=len(kinds), thread_name_prefix="ddragon") as executor:
+            list(executor.map(lambda kind: self.get_dataset(kind, language), kinds))
+
+    def is_loaded(self, language: str, kinds: Optional[Iterable[str]] = None) -> bool:
+        """Whether datasets for a language are loaded, so lookups won't block (all datasets by default)"""
+        return all((kind, language) in self._datasets for kind in (kinds or self.DATASETS))
+
+    def loaded_languages(self) -> List[str]:
+        """Languages with at least one dataset loaded"""
+        with self._lock:
+            return sorted({language for _, language in self._datasets})
+
+    def get_dataset(self, kind: str, language: str) -> Any:
+        """
+        Get a dataset in its Data Dragon shape with localized records
+
+        Args:
+            kind: 'champion', 'item', 'rune' or 'spell'
+            language: Language code (e.g., 'ko_KR')
+
+        Returns:
+            Dict of records ('data' of the JSON file), or the list of rune trees
+        """
+        key = (kind, language)
+        dataset = self._datasets.get(key)
+        if dataset is not None:
+            return dataset
+
+        with self._key_lock(key):
+            dataset = self._datasets.get(key)
+            if dataset is None:
+                base, overlay = self._load(kind, language)
+                with self._lock:
+                    # The first language that loaded the dataset provides the shared base
+                    if self._has_records(kind, self._base.get(kind)):
+                        base = self._base[kind]
+                    elif self._has_records(kind, base):
+                        self._base[kind] = base
+                    self._overlays[key] = overlay
+                dataset = self._build_views(kind, base, overlay)
+                by_id = self._build_id_map(kind, dataset)
+                with self._lock:
+                    self._by_id[key] = by_id
+                    self._datasets[key] = dataset
+        return dataset
+
+    def get_record(self, kind: str, record_id: Any, language: str) -> Optional[Any]:
+        """Get one localized record by numeric ID in O(1)"""
+        key = (kind, language)
+        if key not in self._by_id:
+            self.get_dataset(kind, language)
+        try:
+            return self._by_id[key].get(int(record_id))
+        except (TypeError, ValueError):
+            return None
+
+    def get_index(self, language: str) -> StaticDataIndex:
+        """Name/alias search index for a language over the ID maps, built on first use"""
+        index = self._indexes.get(language)
+        if index is not None:
+            return index
+        with self._key_lock(('index', language)):
+            index = self._indexes.get(language)
+            if index is None:
+                for kind in self.DATASETS:
+                    self.get_dataset(kind, language)
+                index = StaticDataIndex({kind: self._by_id[(kind, language)] for kind in self.DATASETS})
+                with self._lock:
+                    self._indexes[language] = index
+        return index
+
+    def _key_lock(self, key) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _load(self, kind: str, language: str) -> Tuple[Any, Any]:
+        """Split form of a dataset from its snapshot, or from the JSON file"""
+        snapshot_path = str(self.cache.snapshot_path(self.version, language, kind))
+        try:
+            with open(snapshot_path, 'rb') as f:
+                format_version, base, overlay = pickle.load(f)
+            if format_version == self.FORMAT_VERSION:
+                return base, overlay
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable static data snapshot {snapshot_path}: {e}")
+
+        data = self.cache.get_dataset(self.version, language, self.DATASETS[kind])
+        if not data:
+            # Not snapshotted, so the next start retries the download
+            self.logger.error(f"Error loading {kind} data")
+            return self._split(kind, [] if kind == 'rune' else {})
+
+        base, overlay = self._split(kind, data if kind == 'rune' else data['data'])
+        try:
+            os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+            tmp_path = snapshot_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((self.FORMAT_VERSION, base, overlay), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, snapshot_path)
+        except OSError as e:
+            self.logger.warning(f"Could not save static data snapshot: {e}")
+        return base, overlay
+
+    def _split_record(self, kind: str, record: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        fields = self.LOCALIZED_FIELDS[kind]
+        base = {k: v for k, v in record.items() if k not in fields}
+        overlay = {k: record[k] for k in fields if k in record}
+        return base, overlay
+
+    def _split(self, kind: str, records: Any) -> Tuple[Any, Any]:
+        if kind != 'rune':
+            base, overlay = {}, {}
+            for key, record in records.items():
+                base[key], overlay[key] = self._split_record(kind, record)
+            return base, overlay
+
+        # Runes are nested trees -> slots -> runes; split every record by ID and
+        # keep the tree layout as (tree_id, [[rune_id, ...] per slot]) in the base
+        base = {'records': {}, 'layout': []}
+        overlay = {}
+        for tree in records:
+            tree_record = {k: v for k, v in tree.items() if k != 'slots'}
+            base['records'][tree['id']], overlay[tree['id']] = self._split_record(kind, tree_record)
+            slots = []
+            for slot in tree.get('slots', []):
+                rune_ids = []
+                for rune in slot.get('runes', []):
+                    base['records'][rune['id']], overlay[rune['id']] = self._split_record(kind, rune)
+                    rune_ids.append(rune['id'])
+                slots.append(rune_ids)
+            base['layout'].append((tree['id'], slots))
+        return base, overlay
+
+    @staticmethod
+    def _has_records(kind: str, base: Any) -> bool:
+        if not base:
+            return False
+        return bool(base['records']) if kind == 'rune' else True
+
+    @staticmethod
+    def _build_views(kind: str, base: Any, overlay: Any) -> Any:
+        if kind != 'rune':
+            return {key: {**record, **overlay.get(key, {})} for key, record in base.items()}
+
+        records = base['records']
+        trees = []
+        for tree_id, slots in base['layout']:
+            tree_slots = [
+                {'runes': [{**records[rune_id], **overlay.get(rune_id, {})} for rune_id in rune_ids]}
+                for rune_ids in slots
+            ]
+            trees.append({**records[tree_id], **overlay.get(tree_id, {}), 'slots': tree_slots})
+        return trees
+
+    @staticmethod
+    def _build_id_map(kind: str, dataset: Any) -> Dict[int, Any]:
+        if kind == 'champion' or kind == 'spell':
+            return {int(record['key']): record for record in dataset.values()}
+        if kind == 'item':
+            return {int(item_id): record for item_id, record in dataset.items()}
+        by_id = {}
+        for tree in dataset:
+            by_id[int(tree['id'])] = tree
+            for slot in tree['slots']:
+                for rune in slot['runes']:
+                    by_id[int(rune['id'])] = rune
+        return by_id
@@ -0,0 +1,111 @@
+import bisect
+import difflib
+import unicodedata
+from typing import Optional, Dict, Any, List, Tuple, Iterable
+
+class StaticDataIndex:
+    """Name/alias search over one version and language of Data Dragon data.
+
+    Records are looked up in the per-dataset ID maps that StaticDataStore
+    builds anyway, which the index shares instead of copying; only the
+    normalized name/alias index, with exact, prefix and fuzzy search, is
+    derived at runtime.
+    """
+    KINDS = ('champion', 'item', 'rune', 'spell')
+
+    def __init__(self, records_by_id: Dict[str, Dict[int, Any]]):
+        """
+        Build the name index over ID maps
+
+        Args:
+            records_by_id: kind -> {numeric ID: record}; rune maps include rune trees
+        """
+        self.records_by_id = records_by_id
+
+        # alias -> list of (kind, id); sorted (name, kind, id) entries for prefix search
+        self.aliases: Dict[str, List[Tuple[str, int]]] = {}
+        for kind, record_id, names in self._iter_names():
+            for name in names:
+                alias = self.normalize(name)
+                if alias:
+                    targets = self.aliases.setdefault(alias, [])
+                    if (kind, record_id) not in targets:
+                        targets.append((kind, record_id))
+        self.sorted_names = sorted(
+            (alias, kind, record_id)
+            for alias, targets in self.aliases.items()
+            for kind, record_id in targets
+        )
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Lowercase, strip accents and drop everything but letters and digits"""
+        decomposed = unicodedata.normalize('NFKD', name)
+        return ''.join(ch for ch in decomposed.casefold() if ch.isalnum())
+
+    @staticmethod
+    def _initials(name: str) -> Optional[str]:
+        """'Miss Fortune' -> 'mf' for multi-word names"""
+        words = [w for w in name.replace("'", ' ').replace('.', ' ').split() if w]
+        return ''.join(w[0] for w in words) if len(words) > 1 else None
+
+    def _iter_names(self) -> Iterable[Tuple[str, int, List[str]]]:
+        for champion_id, champion in self.records_by_id.get('champion', {}).items():
+            names = [champion.get('name', ''), champion.get('id', '')]
+            initials = self._initials(champion.get('name', ''))
+            if initials:
+                names.append(initials)
+            yield 'champion', champion_id, names
+        for item_id, item in self.records_by_id.get('item', {}).items():
+            yield 'item', item_id, [item.get('name', '')]
+        for rune_id, rune in self.records_by_id.get('rune', {}).items():
+            yield 'rune', rune_id, [rune.get('name', ''), rune.get('key', '')]
+        for spell_id, spell in self.records_by_id.get('spell', {}).items():
+            yield 'spell', spell_id, [spell.get('name', ''), spell.get('id', '')]
+
+    def get(self, kind: str, record_id: int) -> Optional[Dict[str, Any]]:
+        """Get a record by kind ('champion', 'item', 'rune', 'spell') and numeric ID"""
+        return self.records_by_id.get(kind, {}).get(record_id)
+
+    def search(self, query: str, kinds: Optional[Iterable[str]] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search records by name or alias
+
+        Exact alias matches come first, then prefix matches, then fuzzy matches.
+
+        Args:
+            query: Free-form name (e.g., 'mf', 'miss fort', 'Wukong', 'flash')
+            kinds: Restrict to these kinds (defaults to all)
+            limit: Maximum number of results
+
+        Returns:
+            List of {'kind', 'id', 'record'} dictionaries
+        """
+        needle = self.normalize(query)
+        if not needle:
+            return []
+        kinds = set(kinds or self.KINDS)
+        results: List[Tuple[str, int]] = []
+
+        def add(kind, record_id):
+            if kind in kinds and (kind, record_id) not in results:
+                results.append((kind, record_id))
+
+        for kind, record_id in self.aliases.get(needle, []):
+            add(kind, record_id)
+
+        start = bisect.bisect_left(self.sorted_names, (needle,))
+        for alias, kind, record_id in self.sorted_names[start:]:
+            if len(results) >= limit or not alias.startswith(needle):
+                break
+            add(kind, record_id)
+
+        if len(results) < limit:
+            for alias in difflib.get_close_matches(needle, self.aliases.keys(), n=limit, cutoff=0.7):
+                for kind, record_id in self.aliases[alias]:
+                    add(kind, record_id)
+
+        return [
+            {'kind': kind, 'id': record_id, 'record': self.get(kind, record_id)}
+            for kind, record_id in results[:limit]
+        ]
@@ -0,0 +1,87 @@
+import time
+import shutil
+import logging
+import threading
+from pathlib import Path
+from typing import List, Tuple, Iterable
+
+def version_key(version: str) -> Tuple[int, ...]:
+    """Sort key of a version or gameVersion: its leading numeric parts ('14.23.636.3125' -> (14, 23, 636, 3125))"""
+    parts = []
+    for part in version.split('.'):
+        if not part.isdigit():
+            break
+        parts.append(int(part))
+    return tuple(parts)
+
+class VersionDirs:
+    """Per-version directories under root, pruned by age of use.
+
+    Each {version}/.last_used marker is touched the first time a version is
+    marked used in a session. Pruning keeps the newest versions, versions
+    marked in this session and any version used recently, so patches of
+    older matches stay cached across sessions. Safe to use from multiple
+    threads.
+    """
+
+    MARKER = ".last_used"
+
+    def __init__(self, root: Path, description: str):
+        """
+        Args:
+            root: Directory holding one subdirectory per version
+            description: What a directory holds, for log messages (e.g., 'Data Dragon version')
+        """
+        self.logger = logging.getLogger(__name__)
+        self.root = root
+        self.description = description
+        self._marked_used = set()
+        self._lock = threading.Lock()
+
+    def mark_used(self, version: str):
+        """Record that a version is in use, protecting it from pruning"""
+        with self._lock:
+            if version in self._marked_used:
+                return
+            self._marked_used.add(version)
+        try:
+            marker = self.root / version / self.MARKER
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+        except OSError as e:
+            self.logger.warning(f"Could not mark {self.description} {version} as used: {e}")
+
+    def last_used(self, version: str) -> float:
+        """Epoch time a version was last used (directory time if never marked)"""
+        for path in (self.root / version / self.MARKER, self.root / version):
+            try:
+                return path.stat().st_mtime
+            except OSError:
+                continue
+        return 0.0
+
+    def versions(self) -> List[str]:
+        """Names of the version directories present"""
+        if not self.root.is_dir():
+            return []
+        return [p.name for p in self.root.iterdir() if p.is_dir()]
+
+    def prune(self, ordered: List[str], keep_versions: int, keep_unused_days: float, keep: Iterable[str] = ()):
+        """
+        Remove version directories that are neither among the keep_versions
+        most recent ones nor used within keep_unused_days
+
+        Args:
+            ordered: Versions to consider, newest first
+            keep_versions: Number of most recent versions kept
+            keep_unused_days: Older versions are kept until unused for this many days
+            keep: Versions that are always kept (e.g. the current one)
+        """
+        with self._lock:
+            protected = set(ordered[:keep_versions]) | set(keep) | self._marked_used
+        cutoff = time.time() - keep_unused_days * 86400
+        for version in ordered:
+            if version in protected or self.last_used(version) >= cutoff:
+                continue
+            self.logger.info(f"Pruning cached {self.description} {version}")
+            shutil.rmtree(self.root / version, ignore_errors=True)
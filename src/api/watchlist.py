@@ -0,0 +1,267 @@
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterator, Callable
+from .constants import Constants
+
+class Watchlist:
+    """Persisted set of tracked players, stored as ~/.veigar_bot/watchlist.json.
+
+    Each entry is keyed by PUUID and holds the Riot ID and platform of the
+    player along with the scheduler state: start time (epoch seconds) of the
+    newest known game, the IDs seen at that boundary, the current poll
+    interval and the time of the next poll.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Load the watchlist
+
+        Args:
+            path: Watchlist file (defaults to ~/.veigar_bot/watchlist.json)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path) if path else Path.home() / ".veigar_bot" / "watchlist.json"
+        self.players: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Load entries from disk (an unreadable file is treated as empty)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.players = {entry['puuid']: entry for entry in json.load(f).get('players', [])}
+        except FileNotFoundError:
+            self.players = {}
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.error(f"Error loading watchlist {self.path}: {e}")
+            self.players = {}
+
+    def save(self):
+        """Atomically write entries to disk"""
+        with self._lock:
+            data = {'players': list(self.players.values())}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def add(self, puuid: str, game_name: str, tag_line: str, platform: str) -> Dict[str, Any]:
+        """
+        Start watching a player; only games started from now on are reported
+
+        Returns:
+            The player's entry (the existing one if already watched)
+        """
+        with self._lock:
+            entry = self.players.get(puuid)
+            if entry is None:
+                now = time.time()
+                entry = {
+                    'puuid': puuid,
+                    'game_name': game_name,
+                    'tag_line': tag_line,
+                    'platform': platform,
+                    'last_game_start': int(now),
+                    'boundary_ids': [],
+                    'interval': None,
+                    'next_poll': now,
+                    'added_at': now
+                }
+                self.players[puuid] = entry
+        self.save()
+        return entry
+
+    def remove(self, puuid: str) -> bool:
+        """Stop watching a player; returns whether it was watched"""
+        with self._lock:
+            removed = self.players.pop(puuid, None) is not None
+        if removed:
+            self.save()
+        return removed
+
+    def __contains__(self, puuid: str) -> bool:
+        return puuid in self.players
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self.players.values()))
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+class WatchlistScheduler:
+    """Polls watched players for new games within a small request budget.
+
+    - Each poll asks match-v5 for IDs with startTime at the player's newest
+      known game, so an idle player costs one cheap request per poll.
+    - Details are fetched only for IDs not seen before, and every new game
+      is reported as a 'new_match' event, together with the player's
+      league entries fetched after the new games.
+    - The poll interval follows activity: it drops to min_interval when a
+      new game is found and grows by backoff_factor on each empty poll, up
+      to max_interval.
+    - Polls draw from a token bucket of requests_per_minute and wait while
+      the match-v5 rate limit window is busy, so interactive lookups keep
+      priority. With the defaults, a hundred idle players settle around two
+      requests per minute.
+    """
+
+    def __init__(
+        self,
+        riot_api,
+        watchlist: Watchlist,
+        min_interval: float = 300,
+        max_interval: float = 3600,
+        backoff_factor: float = 1.5,
+        requests_per_minute: float = 30,
+        min_headroom: float = 0.5,
+        matches_per_poll: int = 20
+    ):
+        """
+        Initialize the scheduler
+
+        Args:
+            riot_api: RiotAPI instance used for requests
+            watchlist: Players to poll; their scheduling state is saved back to it
+            min_interval: Seconds between polls of a player who just played
+            max_interval: Upper bound on seconds between polls of an idle player
+            backoff_factor: Interval multiplier after a poll without new games
+            requests_per_minute: Request budget for polling and new match details
+            min_headroom: Free fraction of the match-v5 window required to poll
+            matches_per_poll: Maximum match IDs requested per poll
+        """
+        self.logger = logging.getLogger(__name__)
+        self.riot_api = riot_api
+        self.watchlist = watchlist
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff_factor = backoff_factor
+        self.requests_per_minute = requests_per_minute
+        self.min_headroom = min_headroom
+        self.matches_per_poll = matches_per_poll
+        self.stats = {'polls': 0, 'requests': 0, 'new_matches': 0, 'deferred': 0}
+        self._tokens = float(requests_per_minute)
+        self._refilled_at = time.monotonic()
+
+    def poll_due(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Poll every player whose next poll is due, as far as the budget allows
+
+        Args:
+            now: Current epoch time (defaults to time.time())
+
+        Returns:
+            'new_match' events, oldest game first per player
+        """
+        now = time.time() if now is None else now
+        events = []
+        due = sorted((entry for entry in self.watchlist if entry['next_poll'] <= now), key=lambda e: e['next_poll'])
+        for entry in due:
+            if not self._take_token() or self.riot_api.handler.get_headroom('match-v5') < self.min_headroom:
+                self.stats['deferred'] += 1
+                break  # The rest stay due and go first next time
+            events.extend(self._poll(entry, now))
+        if due:
+            self.watchlist.save()
+        return events
+
+    def seconds_until_due(self, now: Optional[float] = None) -> float:
+        """Seconds until the next player is due (0 if one is due already)"""
+        now = time.time() if now is None else now
+        next_poll = min((entry['next_poll'] for entry in self.watchlist), default=now + self.min_interval)
+        return max(0.0, next_poll - now)
+
+    def run(self, on_event: Callable[[Dict[str, Any]], None], stop_event: threading.Event,
+            idle_wait: float = 5.0):
+        """
+        Poll until stop_event is set, calling on_event for each new game
+
+        Args:
+            on_event: Receives each 'new_match' event
+            stop_event: Stops the loop when set
+            idle_wait: Maximum seconds between checks, so added players are picked up
+        """
+        while not stop_event.is_set():
+            for event in self.poll_due():
+                on_event(event)
+            stop_event.wait(min(idle_wait, max(1.0, self.seconds_until_due())))
+
+    def _poll(self, entry: Dict[str, Any], now: float) -> List[Dict[str, Any]]:
+        region = Constants.get_region_for_platform(entry['platform'])
+        self.stats['polls'] += 1
+        self.stats['requests'] += 1
+        match_ids = self.riot_api.get_match_history(
+            entry['puuid'],
+            count=self.matches_per_poll,
+            start_time=entry['last_game_start'],
+            region=region
+        )
+        if match_ids is None:
+            # Request failed: retry after the current interval without growing it
+            entry['next_poll'] = now + (entry.get('interval') or self.min_interval)
+            return []
+
+        boundary_ids = set(entry.get('boundary_ids', []))
+        new_ids = [match_id for match_id in match_ids if match_id not in boundary_ids]
+
+        events = []
+        if new_ids:
+            # New details count against the budget but are never dropped once found
+            self._spend_tokens(len(new_ids))
+            self.stats['requests'] += len(new_ids)
+            for details in self.riot_api.iter_match_history_batch(entry['puuid'], match_ids=new_ids):
+                info = details.get('info', {})
+                events.append({
+                    'type': 'new_match',
+                    'puuid': entry['puuid'],
+                    'riot_id': f"{entry['game_name']}#{entry['tag_line']}",
+                    'platform': entry['platform'],
+                    'match_id': details.get('metadata', {}).get('matchId'),
+                    'game_start': info.get('gameStartTimestamp', info.get('gameCreation', 0)) // 1000,
+                    'match': details
+                })
+            events.sort(key=lambda event: event['game_start'])
+
+        if events:
+            # Rank after the new games; recorded in the rank history if one is attached
+            self._spend_tokens(1)
+            self.stats['requests'] += 1
+            league_entries = self.riot_api.get_league_entries(entry['puuid'], entry['platform'])
+            if league_entries is not None:
+                for event in events:
+                    event['league_entries'] = league_entries
+
+            # Games starting in the same second as the newest one are also returned next time
+            newest = max(event['game_start'] for event in events)
+            entry['boundary_ids'] = [event['match_id'] for event in events if event['game_start'] == newest]
+            entry['last_game_start'] = newest
+            entry['interval'] = self.min_interval
+            self.stats['new_matches'] += len(events)
+        else:
+            interval = entry.get('interval') or self.min_interval
+            entry['interval'] = min(self.max_interval, interval * self.backoff_factor)
+        entry['next_poll'] = now + entry['interval']
+        return events
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.requests_per_minute),
+            self._tokens + (now - self._refilled_at) * self.requests_per_minute / 60
+        )
+        self._refilled_at = now
+
+    def _take_token(self) -> bool:
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _spend_tokens(self, count: int):
+        self._refill()
+        self._tokens -= count
@@ -0,0 +1,317 @@
+"""Headless command line interface that streams NDJSON to stdout.
+
+Usage examples:
+    python src/cli.py profile "pathrix#tr1" --region TR
+    python src/cli.py profile --file riot_ids.txt --region EUW
+    python src/cli.py history "pathrix#tr1" --count 50
+    python src/cli.py ladder --tier challenger --region KR
+    python src/cli.py scout "pathrix#tr1"
+    python src/cli.py crawl --output crawl_euw --seed-ladder --region EUW --budget 100000
+    python src/cli.py history "pathrix#tr1" | python src/cli.py export --output dataset
+    python src/cli.py import-pack dragontail-15.9.1.tgz --language en_US --use
+    python src/cli.py watch add "pathrix#tr1" --region TR
+    python src/cli.py watch run
+    python src/cli.py ranks "pathrix#tr1" --days 90
+
+Every result is written as one JSON object per line as soon as it is
+available. Logs go to stderr. The Qt UI is never imported.
+"""
+import sys
+import json
+import argparse
+import time
+import threading
+from typing import Any, Iterable, Iterator, Tuple
+from api.riot_api import RiotAPI
+from api.constants import Constants
+from api.rank_history import RankHistory
+
+def emit(record: Any):
+    """Write one NDJSON record and flush so consumers see it immediately"""
+    sys.stdout.write(json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n')
+    sys.stdout.flush()
+
+def parse_riot_id(riot_id: str) -> Tuple[str, str]:
+    """Split 'name#tag' into (name, tag)"""
+    game_name, sep, tag_line = riot_id.strip().rpartition('#')
+    if not sep or not game_name or not tag_line:
+        raise argparse.ArgumentTypeError(f"Invalid Riot ID '{riot_id}', expected name#tag")
+    return game_name, tag_line
+
+def read_riot_ids(args) -> Iterator[str]:
+    """Riot IDs from the command line, then from --file ('-' for stdin)"""
+    yield from args.riot_ids
+    if args.file:
+        stream = sys.stdin if args.file == '-' else open(args.file, 'r', encoding='utf-8')
+        try:
+            for line in stream:
+                if line.strip():
+                    yield line.strip()
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+def resolve_puuid(riot_api: RiotAPI, args) -> str:
+    if args.puuid:
+        return args.puuid
+    game_name, tag_line = parse_riot_id(args.riot_id)
+    account_info = riot_api.get_account_by_riot_id(game_name, tag_line)
+    if not account_info:
+        raise SystemExit(f"Player not found: {args.riot_id}")
+    return account_info['puuid']
+
+def cmd_profile(riot_api: RiotAPI, platform: str, args):
+    # Read lazily so results stream while --file - is still being written
+    players = ((*parse_riot_id(riot_id), platform) for riot_id in read_riot_ids(args))
+    for result in riot_api.resolve_profiles(players):
+        emit(result)
+
+def cmd_history(riot_api: RiotAPI, platform: str, args):
+    puuid = resolve_puuid(riot_api, args)
+    start = args.start
+    remaining = args.count
+    # match-v5 returns at most 100 IDs per page
+    while remaining > 0:
+        page = min(remaining, 100)
+        match_ids = riot_api.get_match_history(puuid, start=start, count=page, queue_type=args.queue)
+        if not match_ids:
+            break
+        for details in riot_api.iter_match_history_batch(puuid, match_ids=match_ids):
+            emit(details)
+        start += len(match_ids)
+        remaining -= len(match_ids)
+        if len(match_ids) < page:
+            break
+
+def cmd_ladder(riot_api: RiotAPI, platform: str, args):
+    if args.tier in ('challenger', 'grandmaster', 'master'):
+        fetch = {
+            'challenger': riot_api.get_challenger_league,
+            'grandmaster': riot_api.get_grandmaster_league,
+            'master': riot_api.get_master_league
+        }[args.tier]
+        league = fetch(args.queue, platform) or {}
+        for entry in league.get('entries', []):
+            emit({'tier': league.get('tier'), 'queueType': league.get('queue'), **entry})
+        return
+
+    page = 1
+    while args.pages is None or page <= args.pages:
+        entries = riot_api.get_league_entries_by_rank(args.queue, args.tier.upper(), args.division, platform, page=page)
+        if not entries:
+            break
+        for entry in entries:
+            emit(entry)
+        page += 1
+
+def cmd_scout(riot_api: RiotAPI, platform: str, args):
+    from api.scouting import LobbyScout
+    game_name, tag_line = parse_riot_id(args.riot_id)
+    report = LobbyScout(riot_api).scout_riot_id(game_name, tag_line, platform, time_budget=args.time_budget)
+    emit(report if report is not None else {'error': 'Player not found or not in game'})
+
+def cmd_crawl(riot_api: RiotAPI, platform: str, args):
+    from api.crawler import MatchCrawler
+    budgets = {Constants.get_region_for_platform(platform): args.budget} if args.budget else None
+    crawler = MatchCrawler(riot_api, args.output, region_budgets=budgets, queue_type=args.queue)
+    try:
+        if args.seed_ladder:
+            crawler.seed_from_ladder(platform)
+        if args.seed_puuids:
+            crawler.seed_puuids(args.seed_puuids, platform)
+        try:
+            stats = crawler.run(max_matches=args.max_matches)
+        except KeyboardInterrupt:
+            stats = crawler.stats
+        emit(stats)
+    finally:
+        crawler.close()
+
+def cmd_watch(riot_api: RiotAPI, platform: str, args):
+    from api.watchlist import Watchlist, WatchlistScheduler
+    watchlist = Watchlist()
+    if args.action in ('add', 'remove'):
+        if not args.riot_ids:
+            raise SystemExit(f"watch {args.action} needs Riot IDs")
+        for riot_id in args.riot_ids:
+            game_name, tag_line = parse_riot_id(riot_id)
+            account_info = riot_api.get_account_by_riot_id(game_name, tag_line)
+            if not account_info:
+                emit({'riot_id': riot_id, 'error': 'Player not found'})
+            elif args.action == 'add':
+                emit(watchlist.add(account_info['puuid'], game_name, tag_line, platform))
+            else:
+                emit({'riot_id': riot_id, 'removed': watchlist.remove(account_info['puuid'])})
+        return
+    if args.action == 'list':
+        for entry in watchlist:
+            emit(entry)
+        return
+
+    scheduler = WatchlistScheduler(riot_api, watchlist, requests_per_minute=args.requests_per_minute)
+    if args.once:
+        # Poll everyone once, ignoring their schedules
+        for entry in watchlist:
+            entry['next_poll'] = 0
+        for event in scheduler.poll_due():
+            emit(event)
+        return
+    stop_event = threading.Event()
+    try:
+        scheduler.run(emit, stop_event)
+    except KeyboardInterrupt:
+        stop_event.set()
+        watchlist.save()
+        emit(scheduler.stats)
+
+def cmd_ranks(riot_api: RiotAPI, platform: str, args):
+    puuid = resolve_puuid(riot_api, args)
+    since = time.time() - args.days * 86400 if args.days else None
+    for run in riot_api.rank_history.get_series(puuid, args.queue, since=since):
+        emit(run)
+
+def iter_ndjson(stream) -> Iterable[Any]:
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+def cmd_export(args):
+    # Imported here so numpy is only needed for exports
+    from utils.columnar_export import ParticipantColumnExporter
+    exporter = ParticipantColumnExporter(args.output)
+    stream = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    try:
+        batch = []
+        for match in iter_ndjson(stream):
+            batch.append(match)
+            if len(batch) >= args.batch_size:
+                emit({'rows_appended': exporter.append(batch), 'rows': exporter.rows})
+                batch = []
+        if batch:
+            emit({'rows_appended': exporter.append(batch), 'rows': exporter.rows})
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def cmd_import_pack(args):
+    from pathlib import Path
+    from api.asset_pack import AssetPack
+    from utils.settings import Settings
+    output = args.output or str(Path.home() / ".veigar_bot" / "assets")
+    pack = AssetPack.import_archive(
+        args.archive, output,
+        versions=args.version or None,
+        languages=args.language or None
+    )
+    try:
+        emit({'path': output, 'files': len(pack), 'versions': pack.get_versions()})
+    finally:
+        pack.close()
+    if args.use:
+        Settings().set("asset_pack_path", output)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='veigar-bot', description="Veigar Bot headless CLI (NDJSON output)")
+    parser.add_argument('--region', default=None, choices=list(Constants.REGION_MAPPINGS.keys()),
+                        help="Region code (defaults to the application's default region)")
+    parser.add_argument('--debug', action='store_true', help="Log API requests to stderr")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    profile = subparsers.add_parser('profile', help="Look up account, summoner and league data")
+    profile.add_argument('riot_ids', nargs='*', help="Riot IDs as name#tag")
+    profile.add_argument('--file', help="File with one Riot ID per line ('-' for stdin)")
+
+    history = subparsers.add_parser('history', help="Stream match details for a player")
+    history.add_argument('riot_id', nargs='?', help="Riot ID as name#tag")
+    history.add_argument('--puuid', help="Player PUUID instead of a Riot ID")
+    history.add_argument('--count', type=int, default=20)
+    history.add_argument('--start', type=int, default=0)
+    history.add_argument('--queue', type=int, default=None, help="Queue ID filter (e.g., 420)")
+
+    ladder = subparsers.add_parser('ladder', help="Stream league entries")
+    ladder.add_argument('--queue', default='RANKED_SOLO_5x5')
+    ladder.add_argument('--tier', default='challenger',
+                        help="challenger, grandmaster, master or a tier such as diamond")
+    ladder.add_argument('--division', default='I')
+    ladder.add_argument('--pages', type=int, default=None, help="Maximum pages for non-apex tiers")
+
+    scout = subparsers.add_parser('scout', help="Report on a player's live game")
+    scout.add_argument('riot_id', help="Riot ID as name#tag")
+    scout.add_argument('--time-budget', type=float, default=5.0)
+
+    crawl = subparsers.add_parser('crawl', help="Crawl the match graph into a dataset directory")
+    crawl.add_argument('--output', required=True, help="Crawl directory (resumed if it exists)")
+    crawl.add_argument('--seed-ladder', action='store_true', help="Seed from apex ladder players")
+    crawl.add_argument('--seed-puuids', nargs='*', default=[], help="Seed PUUIDs")
+    crawl.add_argument('--budget', type=int, default=None, help="Maximum matches for the region")
+    crawl.add_argument('--max-matches', type=int, default=None, help="Stop after this many matches in this run")
+    crawl.add_argument('--queue', type=int, default=None, help="Queue ID filter (e.g., 420)")
+
+    watch = subparsers.add_parser('watch', help="Manage watched players or stream their new games")
+    watch.add_argument('action', choices=['add', 'remove', 'list', 'run'])
+    watch.add_argument('riot_ids', nargs='*', help="Riot IDs as name#tag (add/remove)")
+    watch.add_argument('--requests-per-minute', type=float, default=30, help="Polling request budget (run)")
+    watch.add_argument('--once', action='store_true', help="Poll every player once and exit (run)")
+
+    ranks = subparsers.add_parser('ranks', help="Stream the recorded rank history of a player")
+    ranks.add_argument('riot_id', nargs='?', help="Riot ID as name#tag")
+    ranks.add_argument('--puuid', help="Player PUUID instead of a Riot ID")
+    ranks.add_argument('--queue', default='RANKED_SOLO_5x5')
+    ranks.add_argument('--days', type=float, default=None, help="Only the last N days")
+
+    export = subparsers.add_parser('export', help="Append NDJSON matches to a columnar dataset")
+    export.add_argument('--input', default='-', help="NDJSON match file ('-' for stdin)")
+    export.add_argument('--output', required=True, help="Dataset directory")
+    export.add_argument('--batch-size', type=int, default=1000)
+
+    import_pack = subparsers.add_parser('import-pack', help="Import a Data Dragon archive for offline use")
+    import_pack.add_argument('archive', help="dragontail .tgz or a tar archive in the same layout")
+    import_pack.add_argument('--output', default=None, help="Pack directory (defaults to ~/.veigar_bot/assets)")
+    import_pack.add_argument('--version', action='append', help="Only import this version (repeatable)")
+    import_pack.add_argument('--language', action='append', help="Only import this language (repeatable)")
+    import_pack.add_argument('--use', action='store_true', help="Make the desktop app read from this pack")
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'export':
+        cmd_export(args)
+        return
+    if args.command == 'import-pack':
+        cmd_import_pack(args)
+        return
+
+    region_code = args.region
+    if region_code is None:
+        from utils.settings import Settings
+        region_code = Settings().get("default_region", "NA")
+    region, platform = Constants.REGION_MAPPINGS[region_code]
+
+    if args.command in ('history', 'ranks') and not (args.riot_id or args.puuid):
+        raise SystemExit(f"{args.command} needs a Riot ID or --puuid")
+
+    riot_api = RiotAPI(region=region, debug_mode=args.debug)
+    # Every league-v4 response (profiles, ladders, crawls, watched players) is recorded
+    riot_api.rank_history = RankHistory()
+    try:
+        commands = {
+            'profile': cmd_profile,
+            'history': cmd_history,
+            'ladder': cmd_ladder,
+            'scout': cmd_scout,
+            'crawl': cmd_crawl,
+            'watch': cmd_watch,
+            'ranks': cmd_ranks
+        }
+        commands[args.command](riot_api, platform, args)
+    except BrokenPipeError:
+        # Downstream consumer (e.g. `head`) closed the pipe
+        sys.stderr.close()
+    finally:
+        riot_api.shutdown(wait=False)
+        riot_api.rank_history.close()
+
+if __name__ == "__main__":
+    main()
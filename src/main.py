@@ -1,15 +1,19 @@
+from utils.startup_profiler import startup_profiler  # First import: starts the startup clock
 import sys
 from PyQt6.QtWidgets import QApplication
 from ui.main_window import MainWindow
 from PyQt6.QtGui import QIcon
 
 def main():
+    startup_profiler.mark('imports_done')
     app = QApplication(sys.argv)
     app_icon = QIcon("src/assets/application_icon.ico")
     app.setWindowIcon(app_icon)
     
     window = MainWindow()
+    startup_profiler.mark('window_created')
     window.show()
+    startup_profiler.mark('window_shown')
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -0,0 +1,287 @@
+import time
+import logging
+from functools import partial
+from typing import Optional, Dict, Any, Tuple
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, Qt
+from PyQt6.QtGui import QPixmap, QImage, QPainter, QPainterPath
+from requests.adapters import HTTPAdapter
+from api.icon_cache import IconDiskCache
+from .pixmap_cache import PixmapCache, AtlasImageCache
+
+# Priorities for IconLoaderService.load(); higher runs first
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 0
+
+# Rendered variants of an icon; each (url, size, variant) is cached separately
+VARIANT_FIT = 'fit'        # Scaled to fit the size, aspect ratio kept
+VARIANT_CIRCLE = 'circle'  # Scaled to fill the size, center-cropped and masked to a circle
+
+def render_icon(image: QImage, size: Tuple[int, int], variant: str = VARIANT_FIT) -> QImage:
+    """
+    Render a decoded icon at a size and variant
+
+    Works on QImage only, so it is safe to call from worker threads.
+    """
+    width, height = size
+    if variant != VARIANT_CIRCLE:
+        return image.scaled(
+            width, height,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+
+    # Fill the circle completely, centering the overflow
+    scaled = image.scaled(
+        width, height,
+        Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+        Qt.TransformationMode.SmoothTransformation
+    )
+    scaled = scaled.copy(
+        max(0, (scaled.width() - width) // 2), max(0, (scaled.height() - height) // 2),
+        width, height
+    )
+
+    result = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    result.fill(Qt.GlobalColor.transparent)
+    clip = QPainterPath()
+    clip.addEllipse(0, 0, width, height)
+    painter = QPainter(result)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+    painter.setClipPath(clip)
+    painter.drawImage(0, 0, scaled)
+    painter.end()
+    return result
+
+class _JobSignals(QObject):
+    # Emitted from pool threads, delivered on the GUI thread
+    finished = pyqtSignal(object, QImage)  # (job key, scaled image)
+    error = pyqtSignal(object, str)        # (job key, error message)
+
+class _IconJob(QRunnable):
+    """Fetch (or crop), decode and render one icon variant on a pool thread"""
+
+    def __init__(self, key: Tuple, url: str, size: Tuple[int, int], variant: str, sprite: Optional[Dict[str, Any]],
+                 disk_cache: IconDiskCache, atlas_cache: AtlasImageCache, signals: _JobSignals):
+        super().__init__()
+        self.setAutoDelete(False)  # Kept by the service so it can be re-queued or taken back
+        self.key = key
+        self.url = url
+        self.size = size
+        self.variant = variant
+        self.sprite = sprite
+        self.disk_cache = disk_cache
+        self.atlas_cache = atlas_cache
+        self.signals = signals
+        self.priority = PRIORITY_NORMAL
+        self.targets: Dict[int, QObject] = {}  # id(target) -> target waiting for this icon
+        self.requested = False  # Also wanted by a painted view through request()
+
+    def run(self):
+        try:
+            if self.sprite:
+                atlas_url = self.sprite['url']
+                atlas = self.atlas_cache.get(atlas_url, lambda: self.disk_cache.get_bytes(atlas_url))
+                if atlas.isNull():
+                    raise ValueError(f"Could not decode sprite atlas {atlas_url}")
+                image = atlas.copy(self.sprite['x'], self.sprite['y'], self.sprite['w'], self.sprite['h'])
+            else:
+                image = QImage.fromData(self.disk_cache.get_bytes(self.url))
+                if image.isNull():
+                    raise ValueError(f"Could not decode icon {self.url}")
+            self.signals.finished.emit(self.key, render_icon(image, self.size, self.variant))
+        except Exception as e:
+            self.signals.error.emit(self.key, str(e))
+
+class IconLoaderService(QObject):
+    """Loads icons on a bounded thread pool for any number of targets.
+
+    - One job per (url, size, variant): concurrent requests for the same
+      icon share one download and every waiting target receives the result.
+    - Decoding, scaling and masking run on the pool on QImage; the GUI
+      thread only converts finished images to pixmaps.
+    - Jobs run by priority; re-requesting a queued icon at a higher priority
+      moves it up.
+    - A target waits for at most one icon. Requesting another icon for it,
+      or destroying it, drops it from its job; queued jobs nobody waits for
+      any more are taken off the pool.
+    - Finished icons go to the pixmap cache, so repeats are served without
+      touching the pool.
+    - request() retries a failed icon only after a delay that doubles with
+      every failure, from RETRY_DELAY up to MAX_RETRY_DELAY seconds.
+
+    Must be used from the GUI thread. Results are delivered as
+    finished(pixmap, target) / error(message, target); painted views use
+    request() and repaint on icon_ready instead of passing targets.
+    """
+
+    finished = pyqtSignal(QPixmap, object)  # (pixmap, target)
+    error = pyqtSignal(str, object)         # (error message, target)
+    icon_ready = pyqtSignal(object)         # (url, width, height, variant) of every finished icon
+
+    RETRY_DELAY = 30.0
+    MAX_RETRY_DELAY = 900.0
+
+    def __init__(self, disk_cache: IconDiskCache, pixmap_cache: PixmapCache,
+                 atlas_cache: Optional[AtlasImageCache] = None, max_threads: int = 6, parent=None):
+        """
+        Initialize the service
+
+        Args:
+            disk_cache: Raw icon file cache; its HTTP session is shared by all jobs
+            pixmap_cache: In-memory cache of finished icons
+            atlas_cache: Decoded sprite atlases
+            max_threads: Maximum concurrent downloads/decodes
+        """
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self.disk_cache = disk_cache
+        self.pixmap_cache = pixmap_cache
+        self.atlas_cache = atlas_cache or AtlasImageCache()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+
+        # Keep-alive connections for every pool thread
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_threads)
+        self.disk_cache.session.mount('https://', adapter)
+        self.disk_cache.session.mount('http://', adapter)
+
+        self._signals = _JobSignals(self)
+        self._signals.finished.connect(self._on_job_finished)
+        self._signals.error.connect(self._on_job_error)
+        self._jobs: Dict[Tuple, _IconJob] = {}
+        self._target_jobs: Dict[int, Tuple] = {}  # id(target) -> key it waits for
+        self._watched: set = set()                # ids of targets with a destroyed() connection
+        self._failed: Dict[Tuple, Tuple[float, float]] = {}  # failed key -> (retry time, delay)
+        self.downloads_merged = 0
+
+    def load(self, url: str, size: Tuple[int, int], target: QObject,
+             sprite: Optional[Dict[str, Any]] = None, priority: int = PRIORITY_NORMAL,
+             variant: str = VARIANT_FIT):
+        """
+        Request an icon for a target
+
+        Args:
+            url: Icon URL (also the cache key when cropping from a sprite)
+            size: Target (width, height)
+            target: Object the icon is for (e.g., a QLabel)
+            sprite: Atlas location from DataDragonAPI to crop instead of fetching url
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW or any int
+            variant: VARIANT_FIT or VARIANT_CIRCLE
+        """
+        self._detach(target)
+
+        pixmap = self.pixmap_cache.get(url, size, variant)
+        if pixmap is not None:
+            self.finished.emit(pixmap, target)
+            return
+
+        key = (url, size[0], size[1], variant)
+        target_id = id(target)
+        if target_id not in self._watched:
+            self._watched.add(target_id)
+            target.destroyed.connect(partial(self._on_target_destroyed, target_id))
+
+        job = self._enqueue(key, url, size, variant, sprite, priority)
+        job.targets[target_id] = target
+        self._target_jobs[target_id] = key
+
+    def request(self, url: str, size: Tuple[int, int], sprite: Optional[Dict[str, Any]] = None,
+                priority: int = PRIORITY_NORMAL, variant: str = VARIANT_FIT) -> Optional[QPixmap]:
+        """
+        Get an icon if cached, otherwise start loading it without a target
+
+        For painted views (e.g. item delegates): paint what is returned, and
+        repaint on icon_ready. Icons that failed to load are retried with backoff.
+
+        Returns:
+            The cached pixmap, or None while loading
+        """
+        pixmap = self.pixmap_cache.get(url, size, variant)
+        if pixmap is not None:
+            return pixmap
+        key = (url, size[0], size[1], variant)
+        failed = self._failed.get(key)
+        if failed is None or time.monotonic() >= failed[0]:
+            self._enqueue(key, url, size, variant, sprite, priority).requested = True
+        return None
+
+    def _enqueue(self, key: Tuple, url: str, size: Tuple[int, int], variant: str,
+                 sprite: Optional[Dict[str, Any]], priority: int) -> _IconJob:
+        job = self._jobs.get(key)
+        if job is None:
+            job = _IconJob(key, url, size, variant, sprite, self.disk_cache, self.atlas_cache, self._signals)
+            job.priority = priority
+            self._jobs[key] = job
+            self.pool.start(job, priority)
+        else:
+            self.downloads_merged += 1
+            # tryTake() only succeeds for jobs that have not started yet
+            if priority > job.priority and self.pool.tryTake(job):
+                job.priority = priority
+                self.pool.start(job, priority)
+        return job
+
+    def cancel(self, target: QObject):
+        """Stop waiting for the icon requested for a target"""
+        self._detach(target)
+
+    def pending(self) -> int:
+        """Number of icons being loaded"""
+        return len(self._jobs)
+
+    def shutdown(self, timeout_ms: int = 2000):
+        """Drop queued jobs and wait briefly for running ones"""
+        self.pool.clear()
+        self.pool.waitForDone(timeout_ms)
+        self._jobs.clear()
+        self._target_jobs.clear()
+
+    def _detach(self, target: QObject):
+        self._drop_target(id(target))
+
+    def _drop_target(self, target_id: int):
+        key = self._target_jobs.pop(target_id, None)
+        if key is None:
+            return
+        job = self._jobs.get(key)
+        if job is None:
+            return
+        job.targets.pop(target_id, None)
+        if not job.targets and not job.requested and self.pool.tryTake(job):
+            # Nobody waits for it and it has not started: don't download it
+            del self._jobs[key]
+
+    def _on_target_destroyed(self, target_id: int, *args):
+        self._watched.discard(target_id)
+        self._drop_target(target_id)
+
+    def _take_job(self, key: Tuple) -> Optional[_IconJob]:
+        job = self._jobs.pop(key, None)
+        if job is not None:
+            for target_id in job.targets:
+                self._target_jobs.pop(target_id, None)
+        return job
+
+    def _on_job_finished(self, key: Tuple, image: QImage):
+        job = self._take_job(key)
+        if job is None:
+            return
+        self._failed.pop(key, None)
+        # The only step on the GUI thread: the image is already rendered
+        pixmap = QPixmap.fromImage(image)
+        self.pixmap_cache.put(job.url, job.size, pixmap, job.variant)
+        for target in job.targets.values():
+            self.finished.emit(pixmap, target)
+        self.icon_ready.emit(key)
+
+    def _on_job_error(self, key: Tuple, message: str):
+        job = self._take_job(key)
+        if job is None:
+            return
+        failed = self._failed.get(key)
+        delay = min(failed[1] * 2, self.MAX_RETRY_DELAY) if failed else self.RETRY_DELAY
+        self._failed[key] = (time.monotonic() + delay, delay)
+        for target in job.targets.values():
+            self.error.emit(message, target)
@@ -1,23 +1,34 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLineEdit, QPushButton, QLabel, QStatusBar, QComboBox,
-    QFrame, QScrollArea, QSpinBox, QSizePolicy, QProgressBar,
-    QMessageBox, QToolBar
+    QFrame, QSpinBox, QSizePolicy, QProgressBar,
+    QMessageBox, QToolBar, QListView, QAbstractItemView
 )
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QPixmap, QImage, QIcon, QPainter, QRegion, QAction
+from PyQt6.QtCore import Qt, QSize, QTimer, pyqtSignal
+from PyQt6.QtGui import QPixmap, QImage, QIcon, QAction
 import requests
 from io import BytesIO
 from api.riot_api import RiotAPI
-from api.ddragon_api import DataDragonAPI
 from api.exceptions import APIKeyError
 from api.constants import Constants
+from api.icon_cache import IconDiskCache
+from api.concurrency import AdaptivePageSize
+from api.profile_cache import ProfileCache
+from api.rank_history import RankHistory
+from api.watchlist import Watchlist, WatchlistScheduler
 from .styles import MAIN_STYLE
-from .workers import SearchWorker, MatchHistoryWorker, IconLoaderWorker
+from .workers import SearchWorker, MatchHistoryWorker, StaticDataWorker, PatchDataWorker, WatchlistWorker
+from .pixmap_cache import PixmapCache, AtlasImageCache
+from .icon_loader import IconLoaderService, PRIORITY_HIGH, PRIORITY_NORMAL, VARIANT_FIT, VARIANT_CIRCLE
+from .match_list import MatchListModel, MatchRowDelegate
 from .settings_dialog import SettingsDialog
+from .ui_profiler import UIProfiler, timed_slot
+from .rank_trend import RankTrendWidget
 from utils.settings import Settings
+from utils.startup_profiler import startup_profiler
 import os
 import logging
+from typing import Optional
 
 class ProfileWidget(QFrame):
     def __init__(self, parent=None):
@@ -89,6 +100,9 @@ class ProfileWidget(QFrame):
         self.solo_rank_stats.setObjectName("rankStats")
         solo_rank_layout.addWidget(self.solo_rank_stats)
         
+        self.solo_rank_trend = RankTrendWidget()
+        solo_rank_layout.addWidget(self.solo_rank_trend)
+        
         ranks_layout.addWidget(solo_rank_widget)
         
         # Vertical separator
@@ -112,6 +126,9 @@ class ProfileWidget(QFrame):
         self.flex_rank_stats.setObjectName("rankStats")
         flex_rank_layout.addWidget(self.flex_rank_stats)
         
+        self.flex_rank_trend = RankTrendWidget()
+        flex_rank_layout.addWidget(self.flex_rank_trend)
+        
         ranks_layout.addWidget(flex_rank_widget)
         
         info_layout.addWidget(ranks_widget)
@@ -151,51 +168,21 @@ class ProfileWidget(QFrame):
                 self.flex_rank_label.setText(f"Flex 5v5: {rank_text}")
                 self.flex_rank_stats.setText(stats_text)
 
-class MatchWidget(QFrame):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setObjectName("matchWidget")
-        
-        layout = QHBoxLayout(self)
-        layout.setSpacing(10)
-        
-        # Champion icon
-        self.champion_icon = QLabel()
-        self.champion_icon.setFixedSize(50, 50)
-        self.champion_icon.setObjectName("championIcon")
-        layout.addWidget(self.champion_icon)
-        
-        # Match details
-        details_layout = QVBoxLayout()
-        self.match_result = QLabel()
-        self.match_result.setObjectName("matchResult")
-        details_layout.addWidget(self.match_result)
-        
-        self.match_stats = QLabel()
-        details_layout.addWidget(self.match_stats)
-        layout.addLayout(details_layout)
-        
-        # Items
-        items_widget = QWidget()
-        items_layout = QHBoxLayout(items_widget)
-        items_layout.setSpacing(2)
-        self.item_icons = []
-        for _ in range(7):  # 6 items + trinket
-            item_label = QLabel()
-            item_label.setFixedSize(30, 30)
-            item_label.setObjectName("itemIcon")
-            self.item_icons.append(item_label)
-            items_layout.addWidget(item_label)
-        layout.addWidget(items_widget)
-        
-        layout.setStretch(1, 1)
+    def update_rank_trend(self, queue_type: str, runs):
+        """Update the LP trend of a queue from RankHistory runs"""
+        if queue_type == 'RANKED_SOLO_5x5':
+            self.solo_rank_trend.set_series(runs)
+        elif queue_type == 'RANKED_FLEX_SR':
+            self.flex_rank_trend.set_series(runs)
 
 class MatchHistoryWidget(QFrame):
+    near_end = pyqtSignal()  # The viewport is within prefetch_rows of the last row
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("matchHistoryWidget")
-        self.match_batch_size = 10
         self.current_offset = 0
+        self.prefetch_rows = 8
         
         layout = QVBoxLayout(self)
         layout.setSpacing(10)
@@ -229,35 +216,40 @@ class MatchHistoryWidget(QFrame):
         
         layout.addWidget(header_widget)
         
-        # Scroll area for matches
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setObjectName("matchScroll")
-        
-        # Container for matches
-        self.matches_container = QWidget()
-        self.matches_layout = QVBoxLayout(self.matches_container)
-        self.matches_layout.setSpacing(8)
-        
-        # Load more button at the bottom
-        self.load_more_container = QWidget()
-        load_more_layout = QHBoxLayout(self.load_more_container)
-        load_more_layout.setContentsMargins(0, 8, 0, 8)
-        
-        self.load_more_button = QPushButton("Load More Matches")
-        self.load_more_button.setObjectName("loadMoreButton")
-        self.load_more_button.hide()  # Initially hidden
-        load_more_layout.addWidget(self.load_more_button, 0, Qt.AlignmentFlag.AlignCenter)
-        
-        # Add the matches and load more button to layout
-        self.matches_layout.addStretch()
-        self.matches_layout.addWidget(self.load_more_container)
-        
-        self.scroll.setWidget(self.matches_container)
-        layout.addWidget(self.scroll)
+        # Virtualized list of matches; rows are painted by MatchRowDelegate
+        self.model = MatchListModel(self)
+        self.list_view = QListView()
+        self.list_view.setObjectName("matchList")
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.list_view.setMouseTracking(True)
+        layout.addWidget(self.list_view, 1)
+        
+        # Ask for more rows while the user is still a few rows away from the end
+        scroll_bar = self.list_view.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self._check_near_end)
+        scroll_bar.rangeChanged.connect(self._check_near_end)
         
         # Set size policy to expand
         self.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Expanding)
+        
+    def set_icon_provider(self, icon_loader: IconLoaderService, resolve_icon):
+        """Paint rows with icons from the icon loader, repainting as icons arrive"""
+        self.list_view.setItemDelegate(MatchRowDelegate(icon_loader, resolve_icon, self.list_view))
+        icon_loader.icon_ready.connect(lambda key: self.list_view.viewport().update())
+
+    def is_near_end(self) -> bool:
+        """Whether the rows below the viewport are about to run out"""
+        scroll_bar = self.list_view.verticalScrollBar()
+        remaining = scroll_bar.maximum() - scroll_bar.value()
+        return remaining <= self.prefetch_rows * MatchRowDelegate.ROW_HEIGHT
+
+    def _check_near_end(self, *args):
+        if self.isVisible() and self.is_near_end():
+            self.near_end.emit()
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -274,11 +266,50 @@ class MainWindow(QMainWindow):
         try:
             # Initialize Settings
             self.settings = Settings()
+            startup_profiler.mark('settings_loaded')
+            
+            # Opt-in stall, slot and per-search timings (Settings > UI instrumentation)
+            self.ui_profiler = UIProfiler(parent=self)
+            if self.settings.get("ui_instrumentation", False):
+                self.ui_profiler.start()
             
             # Initialize APIs with debug mode
             debug_mode = self.settings.get("debug_mode", False)
             self.riot_api = RiotAPI(debug_mode=debug_mode)
-            self.ddragon = DataDragonAPI()
+            startup_profiler.mark('riot_api_ready')
+            
+            # Match history pages follow fetch latency and match-v5 headroom
+            self.history_page_size = AdaptivePageSize()
+            
+            # Recently viewed players and match details, shown before they are revalidated
+            self.profile_cache = ProfileCache(max_profiles=self.settings.get("recent_profiles", 200))
+            self.riot_api.match_store = self.profile_cache
+            
+            # Every league-v4 observation is kept for the LP trends
+            self.rank_history = RankHistory()
+            self.riot_api.rank_history = self.rank_history
+            
+            # Watched players are polled for new games in the background
+            self.watchlist = Watchlist()
+            self.watchlist_worker = None
+            
+            # Static data is loaded in the background; icon requests wait for it
+            self.ddragon = None
+            self.static_data_worker = None
+            self._pending_icon_loads = []
+            self._patch_workers = {}  # Data Dragon version -> PatchDataWorker loading it for match rows
+            
+            # Two-level icon cache: scaled pixmaps in memory, raw files on disk
+            self.icon_disk_cache = IconDiskCache()
+            self.pixmap_cache = PixmapCache(self.settings.get("icon_memory_cache_mb", 32) * 1024 * 1024)
+            self.atlas_cache = AtlasImageCache()
+            self.icon_loader = IconLoaderService(
+                self.icon_disk_cache, self.pixmap_cache, self.atlas_cache,
+                max_threads=self.settings.get("icon_loader_threads", 6), parent=self
+            )
+            self.icon_loader.finished.connect(self.on_icon_loaded)
+            self.icon_loader.error.connect(self.on_icon_error)
+            self.icon_loader.icon_ready.connect(self._check_all_icons_loaded)
             
             # Log debug mode status
             if debug_mode:
@@ -298,10 +329,17 @@ class MainWindow(QMainWindow):
             
             # Create central widget and layout
             self._setup_ui()
+            startup_profiler.mark('ui_built')
+            
+            # Start loading static data without blocking the first paint
+            self._start_static_data_load()
             
             # Load default settings
             self._load_default_settings()
             
+            if len(self.watchlist):
+                self._start_watchlist()
+            
         except APIKeyError as e:
             QMessageBox.critical(
                 self,
@@ -327,11 +365,56 @@ class MainWindow(QMainWindow):
         self.game_name_input.setText(self.settings.get("default_player_name", ""))
         self.tag_line_input.setText(self.settings.get("default_tag_line", ""))
         
-        # Auto search if enabled
+        # Auto search if enabled (deferred so the window paints first)
         if (self.settings.get("auto_search_on_startup", False) and 
             self.settings.get("default_player_name") and 
             self.settings.get("default_tag_line")):
-            self.search_player()
+            QTimer.singleShot(0, self.search_player)
+            
+    def _start_static_data_load(self):
+        """Load Data Dragon static data on a worker thread"""
+        self.static_data_worker = StaticDataWorker(
+            version_check_interval=self.settings.get("ddragon_version_check_hours", 24) * 3600,
+            icon_cache=self.icon_disk_cache,
+            asset_pack_path=self.settings.get("asset_pack_path", "")
+        )
+        self.static_data_worker.finished.connect(self.on_static_data_loaded)
+        self.static_data_worker.error.connect(self.on_static_data_error)
+        self.static_data_worker.start()
+        
+    def on_static_data_loaded(self, ddragon):
+        """Handle static data becoming available"""
+        self.ddragon = ddragon
+        startup_profiler.mark('static_data_ready')
+        self.logger.info(f"Startup phases (ms): {startup_profiler.summary()}")
+        
+        # Run icon loads that were requested before the data arrived
+        pending, self._pending_icon_loads = self._pending_icon_loads, []
+        for load in pending:
+            load()
+        self.match_history.list_view.viewport().update()
+            
+        if self.static_data_worker:
+            self.static_data_worker.deleteLater()
+            self.static_data_worker = None
+            
+    def on_static_data_error(self, error_message):
+        """Handle static data loading failure"""
+        self.status_bar.showMessage(f"Error loading game data: {error_message}")
+        
+        # Queued icon loads can never run without static data
+        if self._pending_icon_loads:
+            self.logger.warning(f"Dropping {len(self._pending_icon_loads)} icon loads queued behind static data")
+            self._pending_icon_loads = []
+        if self.static_data_worker:
+            self.static_data_worker.deleteLater()
+            self.static_data_worker = None
+            
+    def paintEvent(self, event):
+        """Record the first paint for startup instrumentation"""
+        super().paintEvent(event)
+        if startup_profiler.elapsed('first_paint') is None:
+            startup_profiler.mark('first_paint')
             
     def _setup_ui(self):
         """Set up the main UI components"""
@@ -384,7 +467,8 @@ class MainWindow(QMainWindow):
         # Match history section
         self.match_history = MatchHistoryWidget()
         self.match_history.hide()
-        self.match_history.load_more_button.clicked.connect(self.load_more_match_history)
+        self.match_history.near_end.connect(self._fill_match_history)
+        self.match_history.set_icon_provider(self.icon_loader, self.resolve_match_icon)
         main_layout.addWidget(self.match_history, 1)
         
         # Add status bar
@@ -398,7 +482,16 @@ class MainWindow(QMainWindow):
         # Initialize workers
         self.search_worker = None
         self.match_worker = None
-        self.icon_workers = []
+        
+        # Profile and rows last shown, for patching them when a refresh completes
+        self._shown_profile = {}
+        self._showing_cached = False
+        
+        # Rows of the prefetched page not shown yet, placeholders by match ID
+        # waiting for details, and whether history ran out
+        self._match_buffer = []
+        self._loading_rows = {}
+        self._history_exhausted = False
 
     def _create_toolbar(self):
         """Create the application toolbar"""
@@ -420,16 +513,27 @@ class MainWindow(QMainWindow):
         settings_action.setText("Settings")
         settings_action.triggered.connect(self.show_settings)
         toolbar.addAction(settings_action)
+        
+        # Watch the displayed player for new games
+        self.watch_action = QAction("Watch Player", self)
+        self.watch_action.setCheckable(True)
+        self.watch_action.setEnabled(False)
+        self.watch_action.triggered.connect(self.toggle_watch_player)
+        toolbar.addAction(self.watch_action)
 
     def show_settings(self):
         """Show the settings dialog"""
-        dialog = SettingsDialog(self.settings, Constants.REGION_MAPPINGS, self)
+        dialog = SettingsDialog(self.settings, Constants.REGION_MAPPINGS, self, profiler=self.ui_profiler)
         if dialog.exec():
             # Settings were saved
             self._load_default_settings()
             
-            # Apply debug mode setting immediately
+            # Apply debug mode and instrumentation settings immediately
             self._update_debug_mode()
+            if self.settings.get("ui_instrumentation", False):
+                self.ui_profiler.start()
+            else:
+                self.ui_profiler.stop()
             
             self.status_bar.showMessage("Settings saved")
     
@@ -447,6 +551,58 @@ class MainWindow(QMainWindow):
             self.riot_api.handler.logger.setLevel(logging.INFO)
             self.logger.info("Debug mode disabled")
 
+    def toggle_watch_player(self, checked: bool):
+        """Add the displayed player to the watchlist, or remove them"""
+        shown = self._shown_profile
+        if not shown.get('puuid'):
+            return
+        game_name, tag_line = shown['player'][:2]
+        if checked:
+            self.watchlist.add(shown['puuid'], game_name, tag_line, shown['platform'])
+            self._start_watchlist()
+            self.status_bar.showMessage(f"Watching {game_name}#{tag_line} for new games")
+        else:
+            self.watchlist.remove(shown['puuid'])
+            self.status_bar.showMessage(f"Stopped watching {game_name}#{tag_line}")
+
+    def _start_watchlist(self):
+        """Start polling watched players, if not running yet"""
+        if self.watchlist_worker is not None:
+            return
+        scheduler = WatchlistScheduler(
+            self.riot_api, self.watchlist,
+            requests_per_minute=self.settings.get("watchlist_requests_per_minute", 30)
+        )
+        self.watchlist_worker = WatchlistWorker(scheduler)
+        self.watchlist_worker.new_match.connect(self.on_watched_match)
+        self.watchlist_worker.start()
+
+    def on_watched_match(self, event):
+        """Announce a new game of a watched player and add it to their history if shown"""
+        match_details = event['match']
+        participant = next(
+            (p for p in match_details.get('info', {}).get('participants', []) if p.get('puuid') == event['puuid']),
+            {}
+        )
+        result = "won" if participant.get('win') else "lost"
+        self.status_bar.showMessage(f"{event['riot_id']} {result} a game ({self.get_queue_name(match_details)})")
+        
+        if event['puuid'] != self.current_puuid:
+            return
+        league_entries = event.get('league_entries')
+        if league_entries and self._shown_profile.get('league_entries') != league_entries:
+            self.profile_widget.update_rank_info(league_entries)
+            self.update_rank_trends(event['puuid'])
+            self._shown_profile['league_entries'] = league_entries
+        
+        model = self.match_history.model
+        if event['match_id'] in model:
+            return
+        row = self.build_match_row(match_details)
+        if row is not None:
+            model.replace_rows([row] + model.rows)
+            self.match_history.current_offset += 1
+
     def go_home(self):
         """Reset the view to home state"""
         # Hide profile and match history widgets
@@ -460,6 +616,7 @@ class MainWindow(QMainWindow):
         
         # Reset current puuid
         self.current_puuid = None
+        self.watch_action.setEnabled(False)
         
         # Show status message
         self.status_bar.showMessage("Returned to home")
@@ -473,6 +630,11 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """Handle application closure"""
+        # Wait for the static data worker
+        if self.static_data_worker is not None:
+            self.static_data_worker.wait()
+            self.static_data_worker.deleteLater()
+
         # Stop and clean up search worker
         if self.search_worker is not None:
             self.search_worker.quit()
@@ -485,128 +647,103 @@ class MainWindow(QMainWindow):
             self.match_worker.wait()
             self.match_worker.deleteLater()
 
-        # Stop and clean up all icon workers
-        for worker in self.icon_workers[:]:  # Create a copy of the list to iterate
-            worker.quit()
+        # Wait for patch data loading for match rows
+        for worker in self._patch_workers.values():
             worker.wait()
             worker.deleteLater()
-            self.icon_workers.remove(worker)
+        self._patch_workers = {}
+
+        # Stop polling watched players
+        if self.watchlist_worker is not None:
+            self.watchlist_worker.stop()
+            self.watchlist_worker.wait()
+            self.watchlist_worker.deleteLater()
+
+        # Drop queued icon loads
+        self.icon_loader.shutdown()
+
+        # Release the shared API executor
+        self.riot_api.shutdown(wait=False)
+        self.profile_cache.close()
+        self.rank_history.close()
 
         super().closeEvent(event)
 
-    def cleanup_icon_worker(self, worker):
-        """Safely clean up an icon worker"""
-        if worker in self.icon_workers:
-            worker.quit()
-            worker.wait()
-            self.icon_workers.remove(worker)
-            worker.deleteLater()
+    def _load_icon(self, url: str, size: tuple, label: QLabel, sprite: Optional[dict] = None,
+                   priority: int = PRIORITY_NORMAL, variant: str = VARIANT_FIT):
+        """Request an icon for a label from the shared icon loader
+        
+        With a sprite location the icon is cropped from the shared atlas image
+        instead of downloading url; url is still the cache key.
+        """
+        self.icon_loader.load(url, size, label, sprite, priority, variant)
 
     def load_profile_icon(self, icon_id: int):
         """Load and display profile icon"""
+        if self.ddragon is None:
+            if self.static_data_worker is not None:
+                # Replayed once static data arrives; nothing to wait for if loading failed
+                self._pending_icon_loads.append(lambda: self.load_profile_icon(icon_id))
+            return
         try:
             icon_url = self.ddragon.get_profile_icon(icon_id)
-            worker = IconLoaderWorker(icon_url, (120, 120), self.profile_widget.profile_icon)
-            worker.finished.connect(lambda pixmap, label: (
-                self.on_icon_loaded(pixmap, label),
-                self.cleanup_icon_worker(worker)
-            ))
-            worker.error.connect(lambda error, label: (
-                self.on_icon_error(error, label),
-                self.cleanup_icon_worker(worker)
-            ))
-            self.icon_workers.append(worker)
-            worker.start()
+            # Fills the circle inside the 4px border and 4px margin (100px - 8px - 8px)
+            self._load_icon(
+                icon_url, (84, 84), self.profile_widget.profile_icon,
+                priority=PRIORITY_HIGH, variant=VARIANT_CIRCLE
+            )
         except Exception as e:
             self.status_bar.showMessage(f"Error loading profile icon: {str(e)}")
     
-    def load_champion_icon(self, champion_id: int, label: QLabel):
-        """Load and display champion icon"""
-        try:
-            self.status_bar.showMessage(f"Loading champion icon for ID: {champion_id}")
-            icon_url = self.ddragon.get_champion_icon(champion_id)
-            self.status_bar.showMessage(f"Champion icon URL: {icon_url}")
-            worker = IconLoaderWorker(icon_url, (50, 50), label)
-            worker.finished.connect(lambda pixmap, label: (
-                self.on_icon_loaded(pixmap, label),
-                self.cleanup_icon_worker(worker)
-            ))
-            worker.error.connect(lambda error, label: (
-                self.on_icon_error(error, label),
-                self.cleanup_icon_worker(worker)
-            ))
-            self.icon_workers.append(worker)
-            worker.start()
-        except Exception as e:
-            self.status_bar.showMessage(f"Error loading champion icon: {str(e)}")
-            label.clear()
+    def resolve_match_icon(self, kind: str, record_id: int, game_version: Optional[str] = None):
+        """
+        Icon source for a match row, as of the patch the match was played on
+        
+        Args:
+            kind: 'champion' or 'item'
+            record_id: Champion or item ID
+            game_version: gameVersion of the match
+            
+        Returns:
+            (icon url, sprite location), or None until the patch's static data
+            has loaded; rows are repainted once it has
+        """
+        if self.ddragon is None:
+            return None
+        ddragon = self.ddragon.loaded_for_game_version(game_version)
+        if ddragon is None:
+            self._load_patch_data(game_version)
+            return None
+        if kind == 'champion':
+            return ddragon.get_champion_icon(record_id), ddragon.get_champion_sprite(record_id)
+        return ddragon.get_item_icon(record_id), ddragon.get_item_sprite(record_id)
 
-    def load_item_icon(self, item_id: int, label: QLabel):
-        """Load and display item icon"""
-        try:
-            if item_id > 0:
-                icon_url = self.ddragon.get_item_icon(item_id)
-                worker = IconLoaderWorker(icon_url, (30, 30), label)
-                worker.finished.connect(lambda pixmap, label: (
-                    self.on_icon_loaded(pixmap, label),
-                    self.cleanup_icon_worker(worker)
-                ))
-                worker.error.connect(lambda error, label: (
-                    self.on_icon_error(error, label),
-                    self.cleanup_icon_worker(worker)
-                ))
-                self.icon_workers.append(worker)
-                worker.start()
-            else:
-                label.clear()
-        except Exception as e:
-            self.status_bar.showMessage(f"Error loading item icon: {str(e)}")
+    def _load_patch_data(self, game_version: Optional[str]):
+        """Load a patch's champion and item data in the background for match rows painted without it"""
+        version = self.ddragon.resolve_version(game_version)
+        if version in self._patch_workers:
+            return
+        worker = PatchDataWorker(self.ddragon, game_version)
+        worker.finished.connect(self.on_patch_data_loaded)
+        self._patch_workers[version] = worker
+        worker.start()
+
+    def on_patch_data_loaded(self, version: str):
+        """Repaint match rows with the icons of a newly loaded patch"""
+        worker = self._patch_workers.pop(version, None)
+        if worker is not None:
+            worker.deleteLater()
+        self.match_history.list_view.viewport().update()
 
+    @timed_slot
     def on_icon_loaded(self, pixmap: QPixmap, label: QLabel):
-        """Handle icon loading completion"""
-        if label.objectName() == "profileIcon":
-            # Create a perfectly circular mask for the profile icon
-            size = 84  # Account for the 4px border and 4px margin (100px - 8px - 8px)
-            
-            # Scale the pixmap to fill the circle completely
-            pixmap = pixmap.scaled(
-                size, 
-                size,
-                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            
-            # Center the image if needed
-            if pixmap.width() > size or pixmap.height() > size:
-                x = max(0, (pixmap.width() - size) // 2)
-                y = max(0, (pixmap.height() - size) // 2)
-                pixmap = pixmap.copy(x, y, size, size)
-            
-            # Create a circular mask
-            mask = QPixmap(size, size)
-            mask.fill(Qt.GlobalColor.transparent)
-            
-            painter = QPainter(mask)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            painter.setBrush(Qt.GlobalColor.white)
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawEllipse(0, 0, size, size)
-            painter.end()
-            
-            # Create result pixmap
-            result = QPixmap(size, size)
-            result.fill(Qt.GlobalColor.transparent)
-            
-            # Draw the masked image
-            painter = QPainter(result)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            painter.setClipRegion(QRegion(mask.mask()))
-            painter.drawPixmap(0, 0, pixmap)
-            painter.end()
-            
-            label.setPixmap(result)
-        else:
-            label.setPixmap(pixmap)
+        """Handle icon loading completion; icons arrive already scaled and masked"""
+        label.setPixmap(pixmap)
+
+    def _check_all_icons_loaded(self, *args):
+        """Record when the current search's page has every requested icon"""
+        if self.ui_profiler.search_has('all_rows') and self.icon_loader.pending() == 0:
+            self.ui_profiler.mark_search('all_icons')
 
     def on_icon_error(self, error_message: str, label: QLabel):
         """Handle icon loading error"""
@@ -622,64 +759,133 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("Please enter both Game Name and Tag")
             return
         
-        # Disable search button and show loading status
-        self.status_bar.showMessage(f"Searching for {game_name}#{tag_line}...")
+        self.ui_profiler.begin_search(f"{game_name}#{tag_line}")
+        
+        # Show the last known view of the player at once; the search below refreshes it
+        cached = self.profile_cache.get_profile(self.current_platform, game_name, tag_line)
+        self._showing_cached = cached is not None
+        if cached is not None:
+            self._show_cached_profile(cached)
+            self.status_bar.showMessage(f"Refreshing {game_name}#{tag_line}...")
+        else:
+            self.status_bar.showMessage(f"Searching for {game_name}#{tag_line}...")
+        
+        # Disable search inputs while searching
         self.game_name_input.setEnabled(False)
         self.tag_line_input.setEnabled(False)
         self.region_selector.setEnabled(False)
         
-        # Create and start worker thread
+        # Create and start worker thread; it also starts on the first match history page
         self.search_worker = SearchWorker(
             self.riot_api,
             game_name,
             tag_line,
-            self.current_platform
+            self.current_platform,
+            self._next_history_page_size(),
+            self.profile_cache
         )
         self.search_worker.finished.connect(self.on_search_complete)
         self.search_worker.error.connect(self.on_search_error)
         self.search_worker.start()
 
+    def _show_profile(self, results):
+        """Show a player's profile, updating only the parts that differ from what is shown"""
+        account_info = results['account_info']
+        summoner_info = results['summoner_info']
+        league_entries = results['league_entries']
+        
+        puuid = account_info.get('puuid')
+        shown = self._shown_profile if self._shown_profile.get('puuid') == puuid else {}
+        
+        # Update player information
+        player = (
+            self.game_name_input.text().strip(),
+            self.tag_line_input.text().strip(),
+            summoner_info.get('summonerLevel'),
+            self.region_selector.currentText()
+        )
+        if shown.get('player') != player:
+            self.profile_widget.update_player_info(*player)
+        
+        # Load profile icon
+        icon_id = summoner_info.get('profileIconId', 0)
+        if shown.get('icon_id') != icon_id:
+            self.load_profile_icon(icon_id)
+        
+        # Update rank information
+        if league_entries and shown.get('league_entries') != league_entries:
+            self.profile_widget.update_rank_info(league_entries)
+        if not shown or shown.get('league_entries') != league_entries:
+            self.update_rank_trends(puuid)
+        
+        self._shown_profile = {
+            'puuid': puuid,
+            'player': player,
+            'platform': self.current_platform,
+            'icon_id': icon_id,
+            'league_entries': league_entries
+        }
+        self.watch_action.setEnabled(True)
+        self.watch_action.setChecked(puuid in self.watchlist)
+        self.profile_widget.show()
+        self.match_history.show()
+
+    def update_rank_trends(self, puuid):
+        """Show the recorded LP trends of a player"""
+        for queue_type in ('RANKED_SOLO_5x5', 'RANKED_FLEX_SR'):
+            self.profile_widget.update_rank_trend(queue_type, self.rank_history.get_series(puuid, queue_type))
+
+    def _show_cached_profile(self, cached):
+        """Show a cached profile and its cached first match history page"""
+        puuid = cached['account_info'].get('puuid')
+        displayed = puuid == self.current_puuid and self.match_history.model.rowCount() > 0
+        self._show_profile(cached)
+        if displayed:
+            return  # Already on screen; the search patches it
+        
+        self._reset_match_history(puuid)
+        match_ids = self.profile_cache.get_match_ids(puuid) or []
+        match_details = self.profile_cache.get_matches(match_ids)
+        rows = [self.build_match_row(match_details[match_id]) for match_id in match_ids if match_id in match_details]
+        rows = [row for row in rows if row is not None]
+        self.match_history.model.append_rows(rows)
+        self.match_history.list_view.scrollToTop()
+        if rows:
+            self.ui_profiler.mark_search('first_row')
+
+    def _reset_match_history(self, puuid):
+        """Clear the match history for another player"""
+        self.current_puuid = puuid
+        self.match_history.current_offset = 0
+        self.match_history.model.clear()
+        self._match_buffer = []
+        self._loading_rows = {}
+        self._history_exhausted = False
+
+    @timed_slot
     def on_search_complete(self, results):
-        """Handle search completion"""
+        """Handle search completion, patching a cached view if one is shown"""
+        worker = self.search_worker
+        self.search_worker = None
         try:
-            account_info = results['account_info']
-            summoner_info = results['summoner_info']
-            league_entries = results['league_entries']
-            
-            self.current_puuid = account_info.get('puuid')
-            
-            # Update player information
-            self.profile_widget.update_player_info(
-                game_name=self.game_name_input.text().strip(),
-                tag_line=self.tag_line_input.text().strip(),
-                level=summoner_info.get('summonerLevel'),
-                region=self.region_selector.currentText()
-            )
-            
-            # Load profile icon
-            self.load_profile_icon(summoner_info.get('profileIconId', 0))
-            
-            # Update rank information
-            if league_entries:
-                self.profile_widget.update_rank_info(league_entries)
-            
-            # Hide homepage image - REMOVED
-            # self.homepage_image_label.hide()
-            self.profile_widget.show()
-            self.match_history.show()
+            puuid = results['account_info'].get('puuid')
+            if puuid == self.current_puuid and self.match_history.model.rowCount() > 0:
+                # Keep the rows on screen; the first page is merged into them
+                self.match_history.current_offset = 0
+                self._match_buffer = []
+                self._history_exhausted = False
+            else:
+                self._reset_match_history(puuid)
             
-            # Reset match history state
-            self.match_history.current_offset = 0
+            self._show_profile(results)
             
-            # Initialize match history
-            self.load_more_match_history()
+            # Initialize match history from the page the search already started
+            self.load_more_match_history(results.get('match_history'))
             
             self.status_bar.showMessage("Player found!")
             
         except Exception as e:
             self.status_bar.showMessage(f"Error processing results: {str(e)}")
-            # Ensure image is hidden - REMOVED
-            # self.homepage_image_label.hide() 
             self.profile_widget.hide() 
             self.match_history.hide()
         
@@ -690,18 +896,18 @@ class MainWindow(QMainWindow):
             self.region_selector.setEnabled(True)
             
             # Clean up worker
-            if self.search_worker:
-                self.search_worker.deleteLater()
-                self.search_worker = None
+            if worker:
+                worker.deleteLater()
 
     def on_search_error(self, error_message):
         """Handle search error"""
-        self.status_bar.showMessage(error_message)
-        
-        # Hide image - REMOVED
-        # self.homepage_image_label.hide() 
-        self.profile_widget.hide()
-        self.match_history.hide()
+        if self._showing_cached:
+            # Keep showing the last known view
+            self.status_bar.showMessage(f"Showing saved profile; refresh failed: {error_message}")
+        else:
+            self.status_bar.showMessage(error_message)
+            self.profile_widget.hide()
+            self.match_history.hide()
 
         # Re-enable inputs
         self.game_name_input.setEnabled(True)
@@ -713,107 +919,196 @@ class MainWindow(QMainWindow):
             self.search_worker.deleteLater()
             self.search_worker = None
 
-    def load_more_match_history(self):
-        """Load more match history for current player"""
+    def _next_history_page_size(self) -> int:
+        # Smaller pages while the match-v5 window is busy
+        return self.history_page_size.next_size(self.riot_api.handler.get_headroom('match-v5'))
+
+    def load_more_match_history(self, prefetched=None):
+        """
+        Fetch the next page of match history for current player in the background
+        
+        Args:
+            prefetched: Future of a first page already started by SearchWorker
+        """
         if not self.current_puuid:
             self.status_bar.showMessage("No player selected")
             return
+        if self.match_worker is not None or self._history_exhausted:
+            return
+        if self.search_worker is not None:
+            return  # The search starts the history of the player it finds
         
-        # Show progress bar and disable load more button
-        self.match_history.progress_bar.setValue(0)
-        self.match_history.progress_bar.show()
-        self.match_history.load_more_button.setEnabled(False)
-        self.match_history.load_more_button.setText("Loading...")
-        self.status_bar.showMessage("Loading more matches...")
+        page_size = self._next_history_page_size()
         
-        # Only clear existing matches if this is the first load
-        if self.match_history.current_offset == 0:
-            while self.match_history.matches_layout.count() > 2:
-                item = self.match_history.matches_layout.takeAt(0)
-                if item.widget():
-                    item.widget().deleteLater()
+        # Progress is only shown while the user waits for the first page
+        if self.match_history.model.rowCount() == 0:
+            self.match_history.progress_bar.setRange(0, page_size)
+            self.match_history.progress_bar.setValue(0)
+            self.match_history.progress_bar.show()
+            self.status_bar.showMessage("Loading matches...")
         
         # Create and start worker thread
         self.match_worker = MatchHistoryWorker(
             self.riot_api, 
             self.current_puuid, 
-            self.match_history.match_batch_size, 
-            self.match_history.current_offset
+            page_size, 
+            self.match_history.current_offset,
+            self.ddragon,
+            prefetched=prefetched,
+            profile_cache=self.profile_cache
         )
+        self.match_worker.match_ids.connect(self.on_match_ids_loaded)
+        self.match_worker.batch.connect(self.on_match_batch_loaded)
         self.match_worker.finished.connect(self.on_matches_loaded)
         self.match_worker.error.connect(self.on_match_load_error)
         self.match_worker.progress.connect(self.update_match_progress)
         self.match_worker.start()
 
-    def update_match_progress(self, value):
+    def update_match_progress(self, completed, total):
         """Update match loading progress"""
-        self.match_history.progress_bar.setValue(value)
+        self.match_history.progress_bar.setRange(0, max(total, 1))
+        self.match_history.progress_bar.setValue(completed)
+        if self.match_history.progress_bar.isVisible() and total:
+            self.status_bar.showMessage(f"Loading matches... {completed}/{total}")
 
-    def on_matches_loaded(self, match_details):
-        """Handle match loading completion"""
-        try:
-            if match_details:
-                # Remove the stretch to add matches before it
-                self.match_history.matches_layout.removeItem(
-                    self.match_history.matches_layout.itemAt(
-                        self.match_history.matches_layout.count() - 2
-                    )
-                )
-                
-                # Store current scroll position if this is not the first load
-                scroll_to_bottom = self.match_history.current_offset == 0
-                
-                # Add new matches
-                for details in match_details:
-                    self.add_match_widget(details)
-                
-                # Add stretch back before the load more button
-                self.match_history.matches_layout.insertStretch(
-                    self.match_history.matches_layout.count() - 1
-                )
-                
-                # Update offset for next batch
-                self.match_history.current_offset += self.match_history.match_batch_size
-                
-                # Show load more button if matches were returned
-                self.match_history.load_more_button.show()
-                
-                # Scroll to show new content if it's the first load
-                if scroll_to_bottom:
-                    self.match_history.scroll.verticalScrollBar().setValue(0)
-                
-                self.status_bar.showMessage("Matches loaded")
-            else:
-                # Hide load more button if no more matches
-                if self.match_history.current_offset > 0:
-                    self.match_history.load_more_button.hide()
-                self.status_bar.showMessage("No more matches found")
+    def _is_current_match_worker(self) -> bool:
+        return self.match_worker is not None and self.match_worker.puuid == self.current_puuid
+
+    @timed_slot
+    def on_match_ids_loaded(self, match_ids):
+        """Queue placeholder rows, in history order, for a page whose details are loading"""
+        if not self._is_current_match_worker():
+            return
+        if not match_ids:
+            self._history_exhausted = True
+            if self.match_history.model.rowCount() == 0:
+                self.status_bar.showMessage("No matches found")
+            return
         
-        except Exception as e:
-            self.status_bar.showMessage(f"Error processing matches: {str(e)}")
+        model = self.match_history.model
+        if self.match_worker.offset == 0 and model.rowCount() > 0:
+            self._merge_first_page(match_ids)
+            return
         
-        finally:
-            # Hide progress bar and re-enable load more button
-            self.match_history.progress_bar.hide()
-            self.match_history.load_more_button.setEnabled(True)
-            self.match_history.load_more_button.setText("Load More Matches")
-            
-            # Clean up worker
-            self.match_worker.deleteLater()
-            self.match_worker = None
+        # Matches shifted in from the previous page by new games are already listed
+        buffered = {row['match_id'] for row in self._match_buffer}
+        new_ids = [match_id for match_id in match_ids if match_id not in model and match_id not in buffered]
+        rows = [MatchListModel.placeholder(match_id) for match_id in new_ids]
+        self._loading_rows = {row['match_id']: row for row in rows}
+        self._match_buffer.extend(rows)
+        
+        # Update offset for next page
+        self.match_history.current_offset += len(match_ids)
+        self._fill_match_history()
 
-    def on_match_load_error(self, error_message):
-        """Handle match loading error"""
-        self.status_bar.showMessage(error_message)
+    def _merge_first_page(self, match_ids):
+        """Patch rows shown from cache (or an earlier search) with the fresh first page"""
+        model = self.match_history.model
+        shown = {row['match_id']: row for row in model.rows if not row.get('placeholder')}
+        rows = [shown.get(match_id) or MatchListModel.placeholder(match_id) for match_id in match_ids]
+        self._loading_rows = {row['match_id']: row for row in rows if row.get('placeholder')}
+        
+        # Older rows after the last match of the page are still contiguous history
+        positions = [model.position(match_id) for match_id in match_ids if match_id in model]
+        if positions:
+            rows += model.rows[max(positions) + 1:]
+        model.replace_rows(rows)
+        self.match_history.current_offset = len(rows)
+        self._fill_match_history()
+
+    @timed_slot
+    def on_match_batch_loaded(self, match_details):
+        """Fill in the placeholders of matches whose details arrived"""
+        if not self._is_current_match_worker():
+            return
         
-        # Hide progress bar and re-enable load more button
+        updated, dropped = [], []
+        for details in match_details:
+            row = self._loading_rows.pop(details.get('metadata', {}).get('matchId'), None)
+            if row is None:
+                continue
+            match_row = self.build_match_row(details)
+            if match_row is None:
+                dropped.append(row['match_id'])
+                continue
+            row.pop('placeholder', None)
+            row.update(match_row)
+            updated.append(row['match_id'])
+        
+        self.match_history.model.refresh_rows(updated)
+        self._drop_match_rows(dropped)
+        if updated:
+            self.ui_profiler.mark_search('first_row')
+
+    @timed_slot
+    def on_matches_loaded(self, match_details):
+        """Finish a page and show or prefetch what the list needs next"""
+        worker = self.match_worker
+        self.match_worker = None
+        worker.deleteLater()
         self.match_history.progress_bar.hide()
-        self.match_history.load_more_button.setEnabled(True)
-        self.match_history.load_more_button.setText("Load More Matches")
         
-        # Clean up worker
-        self.match_worker.deleteLater()
+        if worker.puuid != self.current_puuid:
+            # Page of a previous search: drop it and start on the current player
+            self._fill_match_history()
+            return
+        
+        if worker.prefetched is None:
+            # Prefetched pages were partly fetched before the worker started
+            self.history_page_size.record(len(match_details), worker.elapsed)
+        
+        # Matches whose details could not be fetched
+        self._drop_match_rows(list(self._loading_rows))
+        self._loading_rows = {}
+        if match_details:
+            self.status_bar.showMessage("Matches loaded")
+        
+        if self.ui_profiler.enabled and worker.offset == 0:
+            # Rows are complete; icons are timed once the view has painted and requested them
+            self.ui_profiler.mark_search('all_rows')
+            QTimer.singleShot(200, self._check_all_icons_loaded)
+        
+        self._fill_match_history()
+
+    def _drop_match_rows(self, match_ids):
+        if not match_ids:
+            return
+        self.match_history.model.remove_rows(match_ids)
+        dropped = set(match_ids)
+        self._match_buffer = [row for row in self._match_buffer if row['match_id'] not in dropped]
+
+    def _fill_match_history(self):
+        """Show buffered rows when the list nears its end and keep the next page prefetched"""
+        model = self.match_history.model
+        if self._match_buffer and (model.rowCount() == 0 or self.match_history.is_near_end()):
+            first_page = model.rowCount() == 0
+            rows, self._match_buffer = self._match_buffer, []
+            model.append_rows(rows)
+            if first_page:
+                self.match_history.list_view.scrollToTop()
+        
+        # Speculatively fetch the page after the one on screen
+        if not self._match_buffer:
+            self.load_more_match_history()
+
+    def on_match_load_error(self, error_message):
+        """Handle match loading error; scrolling near the end retries"""
+        worker = self.match_worker
         self.match_worker = None
+        worker.deleteLater()
+        self.match_history.progress_bar.hide()
+        
+        if worker.puuid != self.current_puuid:
+            # Page of a previous search: its error is stale, start on the current player
+            self._fill_match_history()
+            return
+        
+        self.status_bar.showMessage(error_message)
+        
+        # Placeholders of the failed page
+        self._drop_match_rows(list(self._loading_rows))
+        self._loading_rows = {}
+        self.match_history.current_offset = worker.offset
 
     def get_queue_name(self, match_details):
         """
@@ -841,50 +1136,41 @@ class MainWindow(QMainWindow):
                 
         return queue_name
 
-    def add_match_widget(self, match_details):
-        """Add a match widget to the match history"""
-        match_widget = MatchWidget()
+    def build_match_row(self, match_details) -> Optional[dict]:
+        """
+        Precompute the display values of a match row for the current player
         
-        # Find player in match
-        for participant in match_details.get('info', {}).get('participants', []):
+        Args:
+            match_details: Match details dictionary from Riot API
+            
+        Returns:
+            Row dictionary for MatchListModel, or None if the player is not in the match
+        """
+        info = match_details.get('info', {})
+        for participant in info.get('participants', []):
             if participant.get('puuid') == self.current_puuid:
-                # Load champion icon
-                self.load_champion_icon(participant.get('championId'), match_widget.champion_icon)
-                
-                # Set match result and stats
                 victory = participant.get('win', False)
                 kills = participant.get('kills', 0)
                 deaths = participant.get('deaths', 0)
                 assists = participant.get('assists', 0)
                 cs = participant.get('totalMinionsKilled', 0) + participant.get('neutralMinionsKilled', 0)
-                duration = match_details.get('info', {}).get('gameDuration', 0)
+                duration = info.get('gameDuration', 0)
                 cs_per_min = (cs * 60 / duration) if duration > 0 else 0
                 
-                # Set victory property for color-coding
-                match_widget.match_result.setProperty("victory", "true" if victory else "false")
-                match_widget.match_result.setStyle(match_widget.match_result.style())
-                
                 # Get queue name instead of using game mode directly
                 queue_name = self.get_queue_name(match_details)
                 
-                match_widget.match_result.setText(
-                    f"{'Victory' if victory else 'Defeat'} - {queue_name}"
-                )
-                match_widget.match_stats.setText(
-                    f"KDA: {kills}/{deaths}/{assists} - CS: {cs} ({cs_per_min:.1f}/min)"
-                )
-                
-                # Load item icons
-                for i in range(7):
-                    item_id = participant.get(f'item{i}', 0)
-                    self.load_item_icon(item_id, match_widget.item_icons[i])
-                
-                break
-        
-        self.match_history.matches_layout.insertWidget(
-            self.match_history.matches_layout.count() - 1,
-            match_widget
-        )
+                return {
+                    'match_id': match_details.get('metadata', {}).get('matchId'),
+                    'game_creation': info.get('gameCreation', 0),
+                    'game_version': info.get('gameVersion'),
+                    'victory': victory,
+                    'title': f"{'Victory' if victory else 'Defeat'} - {queue_name}",
+                    'stats': f"KDA: {kills}/{deaths}/{assists} - CS: {cs} ({cs_per_min:.1f}/min)",
+                    'champion_id': participant.get('championId'),
+                    'items': [participant.get(f'item{i}', 0) for i in range(7)]
+                }
+        return None
 
     def set_application_icon(self):
         """Set the application icon"""
@@ -0,0 +1,235 @@
+from difflib import SequenceMatcher
+from typing import Optional, Dict, Any, List, Callable, Tuple
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PyQt6.QtGui import QPainter, QColor, QPen, QFont
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle, QStyleOptionViewItem
+from .icon_loader import IconLoaderService, PRIORITY_NORMAL, PRIORITY_LOW
+from .styles import MATCH_ROW_COLORS
+
+# (kind, record_id, game_version) -> (icon url, sprite location or None), or None if unknown
+IconResolver = Callable[[str, int, Optional[str]], Optional[Tuple[str, Optional[Dict[str, Any]]]]]
+
+class MatchListModel(QAbstractListModel):
+    """List model of match rows for the match history view.
+
+    Rows are small dictionaries with the display values precomputed from the
+    match details (see MainWindow.build_match_row), so painting never walks
+    the raw match JSON. A row may start as a placeholder holding only its
+    match_id and be filled in place once the details arrive.
+    """
+
+    MatchRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}  # match_id -> row
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.rows):
+            return None
+        row = self.rows[index.row()]
+        if role == self.MatchRole:
+            return row
+        if role == Qt.ItemDataRole.DisplayRole:
+            if row.get('placeholder'):
+                return "Loading match..."
+            return f"{row['title']} - {row['stats']}"
+        return None
+
+    def __contains__(self, match_id: str) -> bool:
+        return match_id in self._positions
+
+    def position(self, match_id: str) -> int:
+        """Row of a match, or -1 if not listed"""
+        return self._positions.get(match_id, -1)
+
+    @staticmethod
+    def placeholder(match_id: str) -> Dict[str, Any]:
+        """Row shown for a match whose details are still loading"""
+        return {'match_id': match_id, 'placeholder': True}
+
+    def append_rows(self, rows: List[Dict[str, Any]]):
+        """Append a batch of rows with a single insert notification"""
+        if not rows:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.rows.extend(rows)
+        for position, row in enumerate(rows, first):
+            self._positions[row['match_id']] = position
+        self.endInsertRows()
+
+    def refresh_rows(self, match_ids: List[str]):
+        """Repaint rows whose dictionaries were updated in place, with a single change notification"""
+        positions = [self._positions[match_id] for match_id in match_ids if match_id in self._positions]
+        if positions:
+            self.dataChanged.emit(self.index(min(positions)), self.index(max(positions)))
+
+    def remove_rows(self, match_ids: List[str]):
+        """Remove rows by match ID (e.g. matches whose details failed to load)"""
+        positions = sorted(
+            (self._positions[match_id] for match_id in match_ids if match_id in self._positions),
+            reverse=True
+        )
+        if not positions:
+            return
+        for position in positions:
+            self.beginRemoveRows(QModelIndex(), position, position)
+            del self.rows[position]
+            self.endRemoveRows()
+        self._positions = {row['match_id']: position for position, row in enumerate(self.rows)}
+
+    def replace_rows(self, rows: List[Dict[str, Any]]):
+        """
+        Replace all rows, notifying only the rows that changed
+
+        Rows are matched by match ID: kept matches keep their position in the
+        view, new ones are inserted and missing ones removed, so refreshing a
+        cached page does not reset the view or its scroll position.
+        """
+        old_ids = [row['match_id'] for row in self.rows]
+        new_ids = [row['match_id'] for row in rows]
+        opcodes = SequenceMatcher(None, old_ids, new_ids, autojunk=False).get_opcodes()
+        # Apply from the end so earlier positions stay valid
+        for tag, old_start, old_end, new_start, new_end in reversed(opcodes):
+            if tag == 'equal':
+                if any(old is not new for old, new in zip(self.rows[old_start:old_end], rows[new_start:new_end])):
+                    self.rows[old_start:old_end] = rows[new_start:new_end]
+                    self.dataChanged.emit(self.index(old_start), self.index(old_end - 1))
+                continue
+            if old_end > old_start:
+                self.beginRemoveRows(QModelIndex(), old_start, old_end - 1)
+                del self.rows[old_start:old_end]
+                self.endRemoveRows()
+            if new_end > new_start:
+                self.beginInsertRows(QModelIndex(), old_start, old_start + new_end - new_start - 1)
+                self.rows[old_start:old_start] = rows[new_start:new_end]
+                self.endInsertRows()
+        self._positions = {row['match_id']: position for position, row in enumerate(self.rows)}
+
+    def clear(self):
+        self.beginResetModel()
+        self.rows = []
+        self._positions = {}
+        self.endResetModel()
+
+class MatchRowDelegate(QStyledItemDelegate):
+    """Paints a match row: champion icon, result, stats and item icons.
+
+    Icons are taken from the icon loader's pixmap cache; missing ones are
+    requested and a placeholder is drawn until icon_ready triggers a repaint.
+    Only visible rows are painted, so only their icons are ever requested.
+    Placeholder rows get the same frame with empty icon slots.
+    """
+
+    ROW_HEIGHT = 78
+    CHAMPION_SIZE = 50
+    ITEM_SIZE = 30
+    ITEM_SLOTS = 7  # 6 items + trinket
+
+    def __init__(self, icon_loader: IconLoaderService, resolve_icon: IconResolver, parent=None):
+        super().__init__(parent)
+        self.icon_loader = icon_loader
+        self.resolve_icon = resolve_icon
+        self.title_font = QFont()
+        self.title_font.setPixelSize(13)
+        self.title_font.setBold(True)
+        self.stats_font = QFont()
+        self.stats_font.setPixelSize(12)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        row = index.data(MatchListModel.MatchRole)
+        if row is None:
+            return
+        colors = MATCH_ROW_COLORS
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        rect = option.rect.adjusted(0, 4, -2, -4)
+        painter.setPen(QPen(QColor(colors['hover_border' if hovered else 'border']), 1))
+        painter.setBrush(QColor(colors['hover_background' if hovered else 'background']))
+        painter.drawRoundedRect(rect, 6, 6)
+
+        # Champion icon
+        champion_rect = QRect(
+            rect.left() + 12, rect.center().y() - self.CHAMPION_SIZE // 2,
+            self.CHAMPION_SIZE, self.CHAMPION_SIZE
+        )
+        if row.get('placeholder'):
+            self._paint_placeholder(painter, rect, champion_rect)
+            painter.restore()
+            return
+        self._paint_icon(painter, champion_rect, row, 'champion', row.get('champion_id'), 6, PRIORITY_NORMAL)
+
+        # Items, right-aligned
+        items_width = self.ITEM_SLOTS * (self.ITEM_SIZE + 4)
+        items_left = rect.right() - 12 - items_width
+        for slot, item_id in enumerate(row.get('items', [])[:self.ITEM_SLOTS]):
+            item_rect = QRect(
+                items_left + slot * (self.ITEM_SIZE + 4), rect.center().y() - self.ITEM_SIZE // 2,
+                self.ITEM_SIZE, self.ITEM_SIZE
+            )
+            self._paint_icon(painter, item_rect, row, 'item', item_id, 4, PRIORITY_LOW)
+
+        # Result and stats
+        text_left = champion_rect.right() + 12
+        text_width = max(0, items_left - 8 - text_left)
+        painter.setFont(self.title_font)
+        painter.setPen(QColor(colors['victory' if row.get('victory') else 'defeat']))
+        painter.drawText(
+            QRect(text_left, rect.top() + 14, text_width, 20),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, row.get('title', '')
+        )
+        painter.setFont(self.stats_font)
+        painter.setPen(QColor(colors['text']))
+        painter.drawText(
+            QRect(text_left, rect.top() + 38, text_width, 20),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, row.get('stats', '')
+        )
+
+        painter.restore()
+
+    def _paint_placeholder(self, painter: QPainter, rect: QRect, champion_rect: QRect):
+        painter.setPen(QPen(QColor(MATCH_ROW_COLORS['border']), 1))
+        painter.setBrush(QColor(MATCH_ROW_COLORS['icon_background']))
+        painter.drawRoundedRect(champion_rect, 6, 6)
+        painter.setFont(self.stats_font)
+        painter.setPen(QColor(MATCH_ROW_COLORS['placeholder_text']))
+        text_left = champion_rect.right() + 12
+        painter.drawText(
+            QRect(text_left, rect.top(), max(0, rect.right() - text_left), rect.height()),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, "Loading match..."
+        )
+
+    def _paint_icon(self, painter: QPainter, rect: QRect, row: Dict[str, Any], kind: str,
+                    record_id: Optional[int], radius: int, priority: int):
+        painter.setPen(QPen(QColor(MATCH_ROW_COLORS['border']), 1))
+        painter.setBrush(QColor(MATCH_ROW_COLORS['icon_background']))
+        painter.drawRoundedRect(rect, radius, radius)
+        if not record_id:
+            return
+
+        # Resolved once per row and icon, as static data lookups are not free
+        icons = row.setdefault('_icons', {})
+        source = icons.get((kind, record_id))
+        if source is None:
+            source = self.resolve_icon(kind, record_id, row.get('game_version'))
+            if source is None:
+                return  # Static data not loaded yet
+            icons[(kind, record_id)] = source
+
+        url, sprite = source
+        pixmap = self.icon_loader.request(url, (rect.width(), rect.height()), sprite, priority)
+        if pixmap is not None:
+            target = QRect(0, 0, pixmap.width(), pixmap.height())
+            target.moveCenter(rect.center())
+            painter.drawPixmap(target, pixmap)
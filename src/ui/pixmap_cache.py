@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, Callable
+from PyQt6.QtGui import QPixmap, QImage
+
+class PixmapCache:
+    """LRU cache of scaled pixmaps bounded by their approximate size in bytes.
+
+    Keyed by (url, width, height, variant) so every size and rendered variant
+    (e.g. a circle-masked profile icon) of an icon is cached separately and
+    never re-rendered. QPixmap is a GUI-thread object, so this cache must only
+    be used from the GUI thread.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Upper bound on the total size of cached pixmaps
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, int, int, str], Tuple[QPixmap, int]]" = OrderedDict()
+
+    @staticmethod
+    def key(url: str, size: Tuple[int, int], variant: str = 'fit') -> Tuple[str, int, int, str]:
+        return (url, size[0], size[1], variant)
+
+    @staticmethod
+    def cost(pixmap: QPixmap) -> int:
+        """Approximate memory used by a pixmap"""
+        return max(1, pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8)
+
+    def get(self, url: str, size: Tuple[int, int], variant: str = 'fit') -> Optional[QPixmap]:
+        """Get a cached pixmap and mark it as recently used"""
+        key = self.key(url, size, variant)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, url: str, size: Tuple[int, int], pixmap: QPixmap, variant: str = 'fit'):
+        """Cache a pixmap, evicting the least recently used ones over the byte limit"""
+        key = self.key(url, size, variant)
+        cost = self.cost(pixmap)
+        if cost > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.current_bytes -= old[1]
+        self._entries[key] = (pixmap, cost)
+        self.current_bytes += cost
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_cost) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_cost
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class AtlasImageCache:
+    """Decoded sprite atlas images shared by icon workers.
+
+    QImage (unlike QPixmap) can be used from any thread, so workers crop
+    icons from these atlases directly. Each atlas is decoded once; at most
+    max_atlases are kept, least recently used first out.
+    """
+
+    def __init__(self, max_atlases: int = 32):
+        self.max_atlases = max_atlases
+        self._images: "OrderedDict[str, QImage]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._url_locks = {}
+
+    def get(self, url: str, load: Callable[[], bytes]) -> QImage:
+        """
+        Get a decoded atlas, loading and decoding it on a miss
+
+        Args:
+            url: Atlas URL
+            load: Returns the raw atlas file (e.g., from IconDiskCache)
+
+        Returns:
+            Decoded atlas image (null if it could not be decoded)
+        """
+        with self._lock:
+            image = self._images.get(url)
+            if image is not None:
+                self._images.move_to_end(url)
+                return image
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+
+        with url_lock:
+            with self._lock:
+                image = self._images.get(url)
+            if image is None:
+                image = QImage.fromData(load())
+                if not image.isNull():
+                    with self._lock:
+                        self._images[url] = image
+                        while len(self._images) > self.max_atlases:
+                            self._images.popitem(last=False)
+        with self._lock:
+            self._url_locks.pop(url, None)
+        return image
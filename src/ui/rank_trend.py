@@ -0,0 +1,101 @@
+from typing import Dict, Any, List
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QPainterPath
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+from api.rank_history import RankHistory
+from .styles import RANK_TREND_COLORS
+
+class RankTrendWidget(QWidget):
+    """Sparkline of a player's ladder position over time, with the net LP change.
+
+    Takes the runs returned by RankHistory.get_series. Each run is drawn as
+    a flat step from its first to its last observation, and positions are
+    ladder scores, so promotions and demotions stay continuous. Hidden
+    until at least two different observations are known.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFixedHeight(34)
+        self.setMinimumWidth(160)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.caption_font = QFont()
+        self.caption_font.setPixelSize(11)
+        self._points: List[QPointF] = []  # (epoch seconds, ladder score)
+        self._change = 0
+        self._days = 0.0
+        self.hide()
+
+    def set_series(self, runs: List[Dict[str, Any]]):
+        """Show a series of runs, oldest first (hidden if it has fewer than two)"""
+        self._points = []
+        for run in runs:
+            score = RankHistory.ladder_score(run['tier'], run['division'], run['lp'])
+            self._points.append(QPointF(run['ts_first'], score))
+            if run['ts_last'] > run['ts_first']:
+                self._points.append(QPointF(run['ts_last'], score))
+        if len(runs) < 2:
+            self.hide()
+            return
+        self._change = int(self._points[-1].y() - self._points[0].y())
+        self._days = (self._points[-1].x() - self._points[0].x()) / 86400
+        self.setToolTip(
+            f"{len(runs)} rank changes recorded since "
+            f"{runs[0]['tier'].title()} {runs[0]['division']} {runs[0]['lp']} LP"
+        )
+        self.show()
+        self.update()
+
+    def paintEvent(self, event):
+        if len(self._points) < 2:
+            return
+        colors = RANK_TREND_COLORS
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # Caption on the right, sparkline in the remaining space
+        caption = f"{self._change:+d} LP in {max(1, round(self._days))}d"
+        painter.setFont(self.caption_font)
+        caption_width = painter.fontMetrics().horizontalAdvance(caption) + 8
+        plot = QRectF(1, 3, max(1, self.width() - caption_width - 2), self.height() - 6)
+
+        first_ts, last_ts = self._points[0].x(), self._points[-1].x()
+        low = min(point.y() for point in self._points)
+        high = max(point.y() for point in self._points)
+        x_span = max(1.0, last_ts - first_ts)
+        y_span = max(1.0, high - low)
+
+        def to_plot(point: QPointF) -> QPointF:
+            return QPointF(
+                plot.left() + (point.x() - first_ts) / x_span * plot.width(),
+                plot.bottom() - (point.y() - low) / y_span * plot.height()
+            )
+
+        line = QPainterPath(to_plot(self._points[0]))
+        for point in self._points[1:]:
+            line.lineTo(to_plot(point))
+        area = QPainterPath(line)
+        area.lineTo(plot.right(), plot.bottom())
+        area.lineTo(plot.left(), plot.bottom())
+        area.closeSubpath()
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        fill = QColor(colors['fill'])
+        fill.setAlpha(140)
+        painter.setBrush(fill)
+        painter.drawPath(area)
+        painter.setPen(QPen(QColor(colors['line']), 1.5))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawPath(line)
+
+        if self._change > 0:
+            painter.setPen(QColor(colors['rising']))
+        elif self._change < 0:
+            painter.setPen(QColor(colors['falling']))
+        else:
+            painter.setPen(QColor(colors['text']))
+        painter.drawText(
+            QRectF(plot.right() + 6, 0, caption_width, self.height()),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, caption
+        )
+        painter.end()
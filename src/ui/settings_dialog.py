@@ -1,7 +1,7 @@
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
     QPushButton, QCheckBox, QComboBox, QFormLayout, QDialogButtonBox,
-    QFrame
+    QFrame, QPlainTextEdit, QFileDialog, QMessageBox
 )
 from PyQt6.QtCore import Qt
 from api.constants import Constants
@@ -9,16 +9,18 @@ from api.constants import Constants
 class SettingsDialog(QDialog):
     """Dialog for changing application settings"""
     
-    def __init__(self, settings, regions=None, parent=None):
+    def __init__(self, settings, regions=None, parent=None, profiler=None):
         """Initialize the settings dialog
         
         Args:
             settings: The Settings instance
             regions: Dictionary of available regions (deprecated, using Constants.REGION_MAPPINGS)
             parent: Parent widget
+            profiler: UIProfiler whose results are shown and exported
         """
         super().__init__(parent)
         self.settings = settings
+        self.profiler = profiler
         self.regions = Constants.REGION_MAPPINGS # Use Constants instead of parameter
         
         self.setWindowTitle("Settings")
@@ -62,8 +64,17 @@ class SettingsDialog(QDialog):
         self.debug_mode_checkbox.setChecked(self.settings.get("debug_mode", False))
         default_player_layout.addRow("", self.debug_mode_checkbox)
         
+        # UI instrumentation
+        self.ui_instrumentation_checkbox = QCheckBox("Enable UI instrumentation (stalls and timings)")
+        self.ui_instrumentation_checkbox.setChecked(self.settings.get("ui_instrumentation", False))
+        default_player_layout.addRow("", self.ui_instrumentation_checkbox)
+        
         layout.addWidget(default_player_frame)
         
+        # Instrumentation results
+        if self.profiler is not None:
+            layout.addWidget(self._create_instrumentation_frame())
+        
         # Add separator
         separator = QFrame()
         separator.setFrameShape(QFrame.Shape.HLine)
@@ -88,6 +99,7 @@ class SettingsDialog(QDialog):
         self.settings.set("default_tag_line", self.tag_line_input.text().strip().lstrip('#'))
         self.settings.set("auto_search_on_startup", self.auto_search_checkbox.isChecked())
         self.settings.set("debug_mode", self.debug_mode_checkbox.isChecked())
+        self.settings.set("ui_instrumentation", self.ui_instrumentation_checkbox.isChecked())
         self.accept()
     
     def reset_settings(self):
@@ -99,4 +111,57 @@ class SettingsDialog(QDialog):
         self.player_name_input.setText(self.settings.get("default_player_name", ""))
         self.tag_line_input.setText(self.settings.get("default_tag_line", ""))
         self.auto_search_checkbox.setChecked(self.settings.get("auto_search_on_startup", False))
-        self.debug_mode_checkbox.setChecked(self.settings.get("debug_mode", False)) 
\ No newline at end of file
+        self.debug_mode_checkbox.setChecked(self.settings.get("debug_mode", False))
+        self.ui_instrumentation_checkbox.setChecked(self.settings.get("ui_instrumentation", False))
+
+    def _create_instrumentation_frame(self) -> QFrame:
+        """Report of the UI profiler with refresh, clear and export actions"""
+        frame = QFrame()
+        frame.setObjectName("settingsFrame")
+        frame_layout = QVBoxLayout(frame)
+        
+        frame_layout.addWidget(QLabel("UI Instrumentation"))
+        self.instrumentation_report = QPlainTextEdit()
+        self.instrumentation_report.setReadOnly(True)
+        self.instrumentation_report.setMinimumHeight(160)
+        frame_layout.addWidget(self.instrumentation_report)
+        
+        buttons_layout = QHBoxLayout()
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh_instrumentation_report)
+        clear_button = QPushButton("Clear")
+        clear_button.clicked.connect(self.clear_instrumentation)
+        export_button = QPushButton("Export...")
+        export_button.clicked.connect(self.export_instrumentation)
+        buttons_layout.addWidget(refresh_button)
+        buttons_layout.addWidget(clear_button)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(export_button)
+        frame_layout.addLayout(buttons_layout)
+        
+        self.refresh_instrumentation_report()
+        return frame
+
+    def refresh_instrumentation_report(self):
+        """Show the current instrumentation results"""
+        report = self.profiler.format_report()
+        if not self.profiler.enabled:
+            report = "Instrumentation is off; enable it above and save to start measuring.\n\n" + report
+        self.instrumentation_report.setPlainText(report)
+
+    def clear_instrumentation(self):
+        """Discard collected instrumentation results"""
+        self.profiler.reset()
+        self.refresh_instrumentation_report()
+
+    def export_instrumentation(self):
+        """Save instrumentation results as JSON"""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export UI Instrumentation", "ui_instrumentation.json", "JSON files (*.json)"
+        )
+        if not path:
+            return
+        try:
+            self.profiler.export(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Failed", f"Could not write {path}: {e}")
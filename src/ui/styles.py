@@ -204,52 +204,6 @@ QStatusBar {
     background-color: #9061c2;
 }
 
-#matchWidget {
-    background-color: #231a38;
-    border: 1px solid #3d2f63;
-    border-radius: 6px;
-    padding: 12px;
-    margin: 4px 0;
-}
-
-#matchWidget:hover {
-    background-color: #2c2046;
-    border-color: #9061c2;
-}
-
-#matchResult {
-    font-weight: bold;
-    font-size: 13px;
-    color: #9061c2;
-}
-
-#matchResult[victory="true"] {
-    color: #44b244;
-}
-
-#matchResult[victory="false"] {
-    color: #e65c52;
-}
-
-#championIcon {
-    background-color: #0e0a18;
-    border: 1px solid #3d2f63;
-    border-radius: 6px;
-    padding: 2px;
-    min-width: 50px;
-    min-height: 50px;
-}
-
-#itemIcon {
-    background-color: #0e0a18;
-    border: 1px solid #3d2f63;
-    border-radius: 4px;
-    padding: 1px;
-    margin: 0 1px;
-    min-width: 30px;
-    min-height: 30px;
-}
-
 QScrollArea {
     border: none;
     background-color: transparent;
@@ -259,13 +213,10 @@ QScrollArea > QWidget > QWidget {
     background-color: transparent;
 }
 
-QScrollArea#matchScroll {
+QListView#matchList {
     margin: 8px 0;
     min-height: 150px;
     border: none;
-}
-
-QScrollArea#matchScroll > QWidget {
     background-color: transparent;
 }
 
@@ -308,24 +259,6 @@ QProgressBar::chunk {
     border-radius: 2px;
 }
 
-#loadMoreButton {
-    background-color: #9061c2;
-    border-radius: 4px;
-    padding: 8px 16px;
-    color: #ffffff;
-    font-weight: bold;
-    min-width: 180px;
-    margin: 10px 0;
-}
-
-#loadMoreButton:hover {
-    background-color: #b07fde;
-}
-
-#loadMoreButton:pressed {
-    background-color: #7a4ca5;
-}
-
 #filtersContainer {
     margin-left: 20px;
 }
@@ -407,4 +340,26 @@ QDialogButtonBox QPushButton[text="Reset"] {
 QDialogButtonBox QPushButton[text="Reset"]:hover {
     background-color: #5a4694;
 }
-""" 
\ No newline at end of file
+"""
+
+# Colors of match rows painted by MatchRowDelegate (not styled by MAIN_STYLE)
+MATCH_ROW_COLORS = {
+    'background': '#231a38',
+    'border': '#3d2f63',
+    'hover_background': '#2c2046',
+    'hover_border': '#9061c2',
+    'icon_background': '#0e0a18',
+    'victory': '#44b244',
+    'defeat': '#e65c52',
+    'text': '#ffffff',
+    'placeholder_text': '#8a7fa8'
+}
+
+# Colors of the LP trend painted by RankTrendWidget
+RANK_TREND_COLORS = {
+    'line': '#b07fde',
+    'fill': '#3d2f63',
+    'rising': '#44b244',
+    'falling': '#e65c52',
+    'text': '#a0a0a0'
+}
@@ -0,0 +1,190 @@
+import json
+import time
+import logging
+import functools
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional, Dict, Any
+from PyQt6.QtCore import QObject, QTimer
+
+class _Samples:
+    """Bounded series of durations in milliseconds with summary statistics"""
+
+    def __init__(self, maxlen: int = 1000):
+        self.values = deque(maxlen=maxlen)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float):
+        self.values.append(ms)
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.values)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 2) if self.count else 0.0,
+            'p95_ms': round(p95, 2),
+            'max_ms': round(self.max, 2)
+        }
+
+class UIProfiler(QObject):
+    """Opt-in responsiveness instrumentation for the GUI thread.
+
+    - Event loop stalls: a watchdog timer fires every interval_ms; when it
+      fires more than stall_threshold_ms late, the GUI thread was blocked
+      and the lateness is recorded as a stall.
+    - Slot timings: handlers wrapped with timed_slot record their duration.
+    - Per search: time to first match row and time until every requested
+      icon has loaded, measured from begin_search().
+
+    Does nothing until start() is called, so it can stay wired in always.
+    """
+
+    def __init__(self, interval_ms: int = 50, stall_threshold_ms: float = 100, max_searches: int = 20, parent=None):
+        """
+        Initialize the profiler
+
+        Args:
+            interval_ms: Watchdog period
+            stall_threshold_ms: Watchdog lateness counted as a stall
+            max_searches: Number of recent searches kept
+        """
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self.interval_ms = interval_ms
+        self.stall_threshold_ms = stall_threshold_ms
+        self.enabled = False
+        self.stalls = _Samples()
+        self.slots: Dict[str, _Samples] = {}
+        self.searches = deque(maxlen=max_searches)
+        self._search: Optional[Dict[str, Any]] = None
+        self._search_start = 0.0
+        self._started_at = 0.0
+        self._expected = 0.0
+        self._watchdog = QTimer(self)
+        self._watchdog.setInterval(interval_ms)
+        self._watchdog.timeout.connect(self._on_watchdog)
+
+    def start(self):
+        """Start measuring (no-op if already running)"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._started_at = time.perf_counter()
+        self._expected = self._started_at + self.interval_ms / 1000
+        self._watchdog.start()
+        self.logger.info("UI instrumentation enabled")
+
+    def stop(self):
+        """Stop measuring; collected results are kept"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._watchdog.stop()
+        self.logger.info("UI instrumentation disabled")
+
+    def reset(self):
+        """Discard collected results"""
+        self.stalls = _Samples()
+        self.slots = {}
+        self.searches.clear()
+        self._search = None
+
+    def _on_watchdog(self):
+        now = time.perf_counter()
+        late_ms = (now - self._expected) * 1000
+        if late_ms > self.stall_threshold_ms:
+            self.stalls.add(late_ms)
+            self.logger.debug(f"Event loop stalled for {late_ms:.0f} ms")
+        self._expected = now + self.interval_ms / 1000
+
+    @contextmanager
+    def time_slot(self, name: str):
+        """Record how long the enclosed block takes under a slot name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.slots.setdefault(name, _Samples()).add((time.perf_counter() - start) * 1000)
+
+    def begin_search(self, label: str):
+        """Start timing a search; phases are then recorded with mark_search()"""
+        if not self.enabled:
+            return
+        self._search_start = time.perf_counter()
+        self._search = {'search': label, 'started_at': time.time()}
+        self.searches.append(self._search)
+
+    def mark_search(self, phase: str):
+        """Record the first time the current search reaches a phase (e.g. 'first_row')"""
+        if not self.enabled or self._search is None or f'{phase}_ms' in self._search:
+            return
+        self._search[f'{phase}_ms'] = round((time.perf_counter() - self._search_start) * 1000, 1)
+
+    def search_has(self, phase: str) -> bool:
+        """Whether the current search reached a phase"""
+        return self._search is not None and f'{phase}_ms' in self._search
+
+    def summary(self) -> Dict[str, Any]:
+        """Collected results as plain data"""
+        running_s = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return {
+            'enabled': self.enabled,
+            'watchdog_interval_ms': self.interval_ms,
+            'stall_threshold_ms': self.stall_threshold_ms,
+            'observed_s': round(running_s, 1),
+            'stalls': self.stalls.summary(),
+            'slots': {name: samples.summary() for name, samples in sorted(self.slots.items())},
+            'searches': list(self.searches)
+        }
+
+    def format_report(self) -> str:
+        """Human-readable summary for the settings dialog"""
+        summary = self.summary()
+        stalls = summary['stalls']
+        lines = [
+            f"Event loop stalls over {summary['stall_threshold_ms']:.0f} ms: {stalls['count']} "
+            f"(p95 {stalls['p95_ms']:.0f} ms, max {stalls['max_ms']:.0f} ms)",
+            "",
+            "Slot timings:"
+        ]
+        for name, slot in summary['slots'].items():
+            lines.append(
+                f"  {name}: {slot['count']} calls, mean {slot['mean_ms']:.1f} ms, "
+                f"p95 {slot['p95_ms']:.1f} ms, max {slot['max_ms']:.1f} ms"
+            )
+        if not summary['slots']:
+            lines.append("  (none recorded)")
+        lines += ["", "Recent searches:"]
+        for search in reversed(summary['searches']):
+            first_row = search.get('first_row_ms')
+            all_icons = search.get('all_icons_ms')
+            lines.append(
+                f"  {search['search']}: first row "
+                f"{f'{first_row:.0f} ms' if first_row is not None else '-'}, all icons "
+                f"{f'{all_icons:.0f} ms' if all_icons is not None else '-'}"
+            )
+        if not summary['searches']:
+            lines.append("  (none recorded)")
+        return "\n".join(lines)
+
+    def export(self, path: str):
+        """Write the collected results to a JSON file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+
+def timed_slot(method):
+    """Time a MainWindow handler with its ui_profiler while instrumentation is enabled"""
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        profiler = self.ui_profiler
+        if not profiler.enabled:
+            return method(self, *args)
+        with profiler.time_slot(method.__name__):
+            return method(self, *args)
+    return wrapper
@@ -1,19 +1,60 @@
-from PyQt6.QtCore import QThread, pyqtSignal, Qt
+from PyQt6.QtCore import QThread, pyqtSignal
+import time
+import threading
 from typing import Optional, Dict, Any, List
-from PyQt6.QtGui import QPixmap, QImage
-import requests
-from PyQt6.QtWidgets import QLabel
+from concurrent.futures import Future
+import logging
+from api.ddragon_api import DataDragonAPI
+from api.ddragon_cache import DataDragonCache
+from api.icon_cache import IconDiskCache
+from api.asset_pack import AssetPack
+from api.profile_cache import ProfileCache
+from api.watchlist import WatchlistScheduler
+
+class StaticDataWorker(QThread):
+    finished = pyqtSignal(object)  # Emits the loaded DataDragonAPI
+    error = pyqtSignal(str)
+    
+    def __init__(self, language: str = "en_US", version_check_interval: float = 24 * 3600,
+                 icon_cache: Optional[IconDiskCache] = None, asset_pack_path: str = ""):
+        super().__init__()
+        self.language = language
+        self.version_check_interval = version_check_interval
+        self.icon_cache = icon_cache
+        self.asset_pack_path = asset_pack_path
+        
+    def run(self):
+        try:
+            asset_pack = None
+            if self.asset_pack_path:
+                try:
+                    asset_pack = AssetPack(self.asset_pack_path)
+                except (OSError, ValueError) as e:
+                    logging.getLogger(__name__).error(f"Could not open asset pack {self.asset_pack_path}: {e}")
+            if asset_pack is not None and self.icon_cache is not None:
+                # Icons are only requested once static data is ready, so this is in time
+                self.icon_cache.asset_pack = asset_pack
+            cache = DataDragonCache(check_interval=self.version_check_interval, asset_pack=asset_pack)
+            ddragon = DataDragonAPI(language=self.language, cache=cache)
+            if self.icon_cache is not None:
+                self.icon_cache.prune(ddragon.version)
+            self.finished.emit(ddragon)
+        except Exception as e:
+            self.error.emit(str(e))
 
 class SearchWorker(QThread):
     finished = pyqtSignal(dict)
     error = pyqtSignal(str) 
     
-    def __init__(self, riot_api, game_name: str, tag_line: str, platform: str):
+    def __init__(self, riot_api, game_name: str, tag_line: str, platform: str, match_count: int = 0,
+                 profile_cache: Optional[ProfileCache] = None):
         super().__init__()
         self.riot_api = riot_api
         self.game_name = game_name
         self.tag_line = tag_line
         self.platform = platform
+        self.match_count = match_count  # Size of the first match history page to prefetch (0 to skip)
+        self.profile_cache = profile_cache  # Receives the fresh profile for the next lookup
         
     def run(self):
         try:
@@ -25,16 +66,25 @@ class SearchWorker(QThread):
                 return
                 
             puuid = account_info.get('puuid')
+            executor = self.riot_api.executor
+            
+            # Everything else only needs the PUUID: run summoner, league and the
+            # first match ID page together
+            summoner_future = executor.submit(self.riot_api.get_summoner_by_puuid, puuid, platform=self.platform)
+            league_future = executor.submit(self.riot_api.get_league_entries, puuid, platform=self.platform)
             
-            # Get summoner information
-            summoner_info = self.riot_api.get_summoner_by_puuid(puuid, platform=self.platform)
+            first_page_future = None
+            if self.match_count:
+                first_page_future = executor.submit(self._fetch_first_page, puuid)
+            
+            summoner_info = summoner_future.result()
             
             if not summoner_info:
                 self.error.emit("Could not fetch summoner information")
                 return
                 
             # Get league entries
-            league_entries = self.riot_api.get_league_entries(puuid, platform=self.platform)
+            league_entries = league_future.result()
             
             # Compile all results
             results = {
@@ -42,37 +92,80 @@ class SearchWorker(QThread):
                 'summoner_info': summoner_info,
                 'league_entries': league_entries or []
             }
+            if self.profile_cache is not None:
+                self.profile_cache.put_profile(self.platform, self.game_name, self.tag_line, results)
+            
+            # Resolves to the first page's prefetch, so the profile never waits for it
+            if first_page_future is not None:
+                results['match_history'] = first_page_future
             
             self.finished.emit(results)
             
         except Exception as e:
             self.error.emit(str(e))
 
+    def _fetch_first_page(self, puuid: str) -> Optional[Dict[str, Any]]:
+        # Runs on the executor: match details start as soon as their IDs arrive,
+        # only submitted, never waited for here
+        match_ids = self.riot_api.get_match_history(puuid, count=self.match_count)
+        if match_ids is None:
+            return None
+        return {'match_ids': match_ids, 'futures': self.riot_api.prefetch_match_details(match_ids)}
+
 class MatchHistoryWorker(QThread):
-    finished = pyqtSignal(list)
+    match_ids = pyqtSignal(list)        # Match IDs of the page, newest first, before any details
+    batch = pyqtSignal(list)            # Match details completed since the previous batch
+    finished = pyqtSignal(list)         # All match details of the page, newest first
     error = pyqtSignal(str)
-    progress = pyqtSignal(int)
+    progress = pyqtSignal(int, int)     # (completed matches, total matches)
     
-    def __init__(self, riot_api, puuid: str, count: int, offset: int = 0):
+    def __init__(self, riot_api, puuid: str, count: int, offset: int = 0, ddragon: Optional[DataDragonAPI] = None,
+                 batch_interval: float = 0.05, prefetched: Optional[Future] = None,
+                 profile_cache: Optional[ProfileCache] = None):
         super().__init__()
         self.riot_api = riot_api
         self.puuid = puuid
         self.count = count
         self.offset = offset
+        self.ddragon = ddragon  # Used to load static data of older patches off the GUI thread
+        self.batch_interval = batch_interval  # Minimum seconds between batches after the first one
+        self.elapsed = 0.0      # Seconds the match requests took, for page sizing
+        self.prefetched = prefetched  # Future of SearchWorker's first page ('match_ids' and detail 'futures')
+        self.profile_cache = profile_cache  # Receives the first page's match IDs
+        self._preloaded_versions = set()
         
     def run(self):
         try:
-            self.progress.emit(10)  # Show initial progress
+            started = time.perf_counter()
             
-            # Get match history and details in parallel
-            match_details = self.riot_api.get_match_history_batch(self.puuid, count=self.count, start=self.offset)
+            # IDs first so the UI can lay out placeholders in order
+            first_page = self.prefetched.result() if self.prefetched is not None else None
+            if first_page is not None:
+                match_ids = first_page['match_ids']
+                futures = first_page['futures']
+            else:
+                match_ids = self.riot_api.get_match_history(self.puuid, count=self.count, start=self.offset) or []
+                futures = None
+            if self.offset == 0 and match_ids and self.profile_cache is not None:
+                self.profile_cache.put_match_ids(self.puuid, match_ids)
+            self.match_ids.emit(match_ids)
+            self.progress.emit(0, len(match_ids))
             
-            if not match_details:
-                self.progress.emit(100)
-                self.finished.emit([])
-                return
-            
-            self.progress.emit(90)  # Most of the work is done
+            # Stream details in completion order, coalesced into batches
+            match_details = []
+            pending = []
+            last_batch = 0.0
+            for details in self.riot_api.iter_match_history_batch(self.puuid, match_ids=match_ids, futures=futures):
+                match_details.append(details)
+                pending.append(details)
+                now = time.perf_counter()
+                if now - last_batch >= self.batch_interval:
+                    self._emit_batch(pending, len(match_details), len(match_ids))
+                    pending = []
+                    last_batch = now
+            if pending:
+                self._emit_batch(pending, len(match_details), len(match_ids))
+            self.elapsed = time.perf_counter() - started
             
             # Sort matches by game creation time (newest first)
             match_details.sort(
@@ -80,32 +173,56 @@ class MatchHistoryWorker(QThread):
                 reverse=True
             )
             
-            self.progress.emit(100)
+            self.progress.emit(len(match_ids), len(match_ids))
             self.finished.emit(match_details)
             
         except Exception as e:
-            self.error.emit(str(e)) 
+            self.error.emit(str(e))
+
+    def _emit_batch(self, batch: List[Dict[str, Any]], completed: int, total: int):
+        # Load champion and item data for the patches these matches were played on
+        if self.ddragon is not None:
+            for details in batch:
+                game_version = details.get('info', {}).get('gameVersion')
+                if game_version in self._preloaded_versions:
+                    continue
+                self._preloaded_versions.add(game_version)
+                patch_data = self.ddragon.for_game_version(game_version)
+                if patch_data is not self.ddragon:
+                    patch_data.store.preload(patch_data.language, ('champion', 'item'))
+        self.batch.emit(batch)
+        self.progress.emit(completed, total)
 
-class IconLoaderWorker(QThread):
-    finished = pyqtSignal(QPixmap, object)  # Emits (pixmap, target_label)
-    error = pyqtSignal(str, object)         # Emits (error_message, target_label)
+class PatchDataWorker(QThread):
+    finished = pyqtSignal(str)  # Emits the Data Dragon version once loaded
     
-    def __init__(self, url: str, size: tuple, target_label: QLabel):
+    def __init__(self, ddragon: DataDragonAPI, game_version: str):
         super().__init__()
-        self.url = url
-        self.size = size
-        self.target_label = target_label
+        self.ddragon = ddragon
+        self.game_version = game_version
         
     def run(self):
+        patch_data = self.ddragon.for_game_version(self.game_version)
         try:
-            response = requests.get(self.url)
-            image = QImage.fromData(response.content)
-            pixmap = QPixmap.fromImage(image)
-            scaled_pixmap = pixmap.scaled(
-                self.size[0], self.size[1],
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.finished.emit(scaled_pixmap, self.target_label)
+            patch_data.store.preload(patch_data.language, ('champion', 'item'))
         except Exception as e:
-            self.error.emit(str(e), self.target_label) 
\ No newline at end of file
+            logging.getLogger(__name__).error(f"Error loading static data for {patch_data.version}: {str(e)}")
+        self.finished.emit(patch_data.version)
+
+class WatchlistWorker(QThread):
+    new_match = pyqtSignal(dict)  # 'new_match' event of a watched player
+    
+    def __init__(self, scheduler: WatchlistScheduler):
+        super().__init__()
+        self.scheduler = scheduler
+        self._stop_event = threading.Event()
+        
+    def run(self):
+        try:
+            self.scheduler.run(self.new_match.emit, self._stop_event)
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Watchlist polling stopped: {str(e)}")
+    
+    def stop(self):
+        """Ask the polling loop to finish; wait() for it afterwards"""
+        self._stop_event.set()
@@ -0,0 +1,253 @@
+import os
+import json
+import logging
+from typing import Dict, Any, Iterable, List, Optional
+import numpy as np
+
+class ParticipantColumnExporter:
+    """Append participant-level match statistics to per-column .npy files.
+
+    Each column is a 1-D .npy file with a fixed-size header, so batches can be
+    appended in place and the files opened with numpy.load(mmap_mode='r')
+    without copying. Match IDs and PUUIDs are stored once in text lookup
+    tables and referenced by row index. manifest.json records the schema and
+    the committed row count; columns are truncated back to it on open, so an
+    interrupted append never leaves columns of different lengths.
+
+    Files in directory:
+        manifest.json    - schema, row count and lookup table names
+        {column}.npy     - one file per column in SCHEMA
+        match_ids.txt    - match ID for each match_index, one per line
+        puuids.txt       - PUUID for each puuid_index, one per line
+    """
+
+    SCHEMA = [
+        ('match_index', 'int32'),
+        ('puuid_index', 'int32'),
+        ('champion_id', 'int16'),
+        ('queue_id', 'int16'),
+        ('patch', 'int16'),       # major * 100 + minor, e.g. 1405 for 14.5
+        ('win', 'bool'),
+        ('kills', 'int16'),
+        ('deaths', 'int16'),
+        ('assists', 'int16'),
+        ('cs', 'int16'),
+        ('gold', 'int32'),
+        ('damage', 'int32'),      # totalDamageDealtToChampions
+        ('duration', 'int32')     # gameDuration in seconds
+    ]
+
+    MANIFEST_FILE = "manifest.json"
+    MATCH_IDS_FILE = "match_ids.txt"
+    PUUIDS_FILE = "puuids.txt"
+    HEADER_SIZE = 128  # Leaves room for the shape to grow without moving the data
+
+    def __init__(self, directory: str):
+        """
+        Open or create an export directory
+
+        Args:
+            directory: Directory holding the column files
+        """
+        self.directory = directory
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.manifest_path = os.path.join(self.directory, self.MANIFEST_FILE)
+        manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        self.rows = manifest.get('rows', 0)
+
+        self.match_ids = self._read_lookup(self.MATCH_IDS_FILE, manifest.get('match_count', 0))
+        self.puuids = self._read_lookup(self.PUUIDS_FILE, manifest.get('puuid_count', 0))
+        self._match_lookup = {match_id: i for i, match_id in enumerate(self.match_ids)}
+        self._puuid_lookup = {puuid: i for i, puuid in enumerate(self.puuids)}
+
+        for name, dtype in self.SCHEMA:
+            self._prepare_column(name, np.dtype(dtype))
+        self._write_manifest()
+
+    def append(self, matches: Iterable[Dict[str, Any]]) -> int:
+        """
+        Append all participants of a batch of match-v5 matches
+
+        Args:
+            matches: Match dictionaries as returned by RiotAPI.get_match_details
+
+        Returns:
+            Number of rows appended
+        """
+        columns = {name: [] for name, _ in self.SCHEMA}
+        new_match_ids = []
+        new_puuids = []
+
+        for match in matches:
+            match_id = match.get('metadata', {}).get('matchId')
+            if not match_id or match_id in self._match_lookup:
+                continue
+            info = match.get('info', {})
+            participants = info.get('participants') or []
+            if not participants:
+                continue  # No rows, so no match_index either; match_ids.txt must match the rows
+            match_index = len(self.match_ids)
+            self.match_ids.append(match_id)
+            self._match_lookup[match_id] = match_index
+            new_match_ids.append(match_id)
+
+            patch = self._encode_patch(info.get('gameVersion', ''))
+            for participant in participants:
+                puuid = participant.get('puuid', '')
+                puuid_index = self._puuid_lookup.get(puuid)
+                if puuid_index is None:
+                    puuid_index = len(self.puuids)
+                    self.puuids.append(puuid)
+                    self._puuid_lookup[puuid] = puuid_index
+                    new_puuids.append(puuid)
+
+                columns['match_index'].append(match_index)
+                columns['puuid_index'].append(puuid_index)
+                columns['champion_id'].append(participant.get('championId', 0))
+                columns['queue_id'].append(info.get('queueId', 0))
+                columns['patch'].append(patch)
+                columns['win'].append(participant.get('win', False))
+                columns['kills'].append(participant.get('kills', 0))
+                columns['deaths'].append(participant.get('deaths', 0))
+                columns['assists'].append(participant.get('assists', 0))
+                columns['cs'].append(participant.get('totalMinionsKilled', 0) + participant.get('neutralMinionsKilled', 0))
+                columns['gold'].append(participant.get('goldEarned', 0))
+                columns['damage'].append(participant.get('totalDamageDealtToChampions', 0))
+                columns['duration'].append(info.get('gameDuration', 0))
+
+        count = len(columns['match_index'])
+        if count == 0:
+            return 0
+
+        self._append_lookup(self.MATCH_IDS_FILE, new_match_ids)
+        self._append_lookup(self.PUUIDS_FILE, new_puuids)
+        for name, dtype in self.SCHEMA:
+            self._append_column(name, np.asarray(columns[name], dtype=dtype))
+
+        # Committing the row count last makes the batch visible atomically
+        self.rows += count
+        self._write_manifest()
+        return count
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def _header(self, dtype: np.dtype, rows: int) -> bytes:
+        """Build a version 1.0 .npy header padded to HEADER_SIZE bytes"""
+        header = f"{{'descr': '{dtype.str}', 'fortran_order': False, 'shape': ({rows},), }}"
+        preamble = b'\x93NUMPY\x01\x00'
+        header_len = self.HEADER_SIZE - len(preamble) - 2
+        header = header.ljust(header_len - 1) + '\n'
+        return preamble + header_len.to_bytes(2, 'little') + header.encode('latin1')
+
+    def _prepare_column(self, name: str, dtype: np.dtype):
+        """Create a missing column or truncate it to the committed row count"""
+        path = self._column_path(name)
+        size = self.HEADER_SIZE + self.rows * dtype.itemsize
+        mode = 'r+b' if os.path.exists(path) else 'w+b'
+        with open(path, mode) as f:
+            f.truncate(size)
+            f.seek(0)
+            f.write(self._header(dtype, self.rows))
+
+    def _append_column(self, name: str, values: np.ndarray):
+        path = self._column_path(name)
+        with open(path, 'r+b') as f:
+            f.seek(self.HEADER_SIZE + self.rows * values.dtype.itemsize)
+            f.write(values.tobytes())
+            f.seek(0)
+            f.write(self._header(values.dtype, self.rows + len(values)))
+
+    def _read_lookup(self, filename: str, committed: int) -> List[str]:
+        """Read a lookup table, dropping entries beyond the committed count"""
+        path = os.path.join(self.directory, filename)
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            values = f.read().splitlines()
+        if len(values) > committed:
+            values = values[:committed]
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(''.join(value + '\n' for value in values))
+        return values
+
+    def _append_lookup(self, filename: str, values: List[str]):
+        if values:
+            with open(os.path.join(self.directory, filename), 'a', encoding='utf-8') as f:
+                f.write('\n'.join(values) + '\n')
+
+    def _write_manifest(self):
+        manifest = {
+            'version': 1,
+            'rows': self.rows,
+            'match_count': len(self.match_ids),
+            'puuid_count': len(self.puuids),
+            'columns': {name: {'dtype': np.dtype(dtype).str, 'file': f"{name}.npy"} for name, dtype in self.SCHEMA},
+            'match_ids': self.MATCH_IDS_FILE,
+            'puuids': self.PUUIDS_FILE
+        }
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=4)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def _encode_patch(game_version: str) -> int:
+        """Encode '14.5.567.1234' as 1405"""
+        parts = game_version.split('.')
+        try:
+            return int(parts[0]) * 100 + int(parts[1])
+        except (IndexError, ValueError):
+            return 0
+
+def load_participant_columns(directory: str, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Open exported columns as read-only memory maps
+
+    Args:
+        directory: Export directory written by ParticipantColumnExporter
+        columns: Column names to open (all columns if None)
+
+    Returns:
+        Dictionary of column name to memory-mapped array, trimmed to the committed row count
+    """
+    with open(os.path.join(directory, ParticipantColumnExporter.MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    rows = manifest['rows']
+    names = columns or list(manifest['columns'])
+    return {
+        name: np.load(os.path.join(directory, manifest['columns'][name]['file']), mmap_mode='r')[:rows]
+        for name in names
+    }
+
+def export_match_jsonl(jsonl_path: str, directory: str, batch_size: int = 1000) -> int:
+    """
+    Export a matches.jsonl file (e.g. from MatchCrawler) in batches
+
+    Args:
+        jsonl_path: File with one match-v5 match per line
+        directory: Export directory
+        batch_size: Matches per append
+
+    Returns:
+        Number of rows appended
+    """
+    exporter = ParticipantColumnExporter(directory)
+    total = 0
+    batch = []
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                total += exporter.append(batch)
+                batch = []
+    if batch:
+        total += exporter.append(batch)
+    return total
@@ -16,7 +16,14 @@ class Settings:
             "default_tag_line": "",
             "default_region": "TR",
             "auto_search_on_startup": False,
-            "debug_mode": False  # Whether to print API request logs
+            "debug_mode": False,  # Whether to print API request logs
+            "ddragon_version_check_hours": 24,  # Minimum hours between Data Dragon version checks
+            "icon_memory_cache_mb": 32,  # Size limit of the in-memory icon cache
+            "icon_loader_threads": 6,  # Concurrent icon downloads
+            "asset_pack_path": "",  # Imported offline Data Dragon pack (see `cli.py import-pack`)
+            "recent_profiles": 200,  # Players kept in the local cache for instant repeat lookups
+            "ui_instrumentation": False,  # Measure event loop stalls, slot times and search timings
+            "watchlist_requests_per_minute": 30  # Request budget for polling watched players
         }
         
         # Current settings (loaded from file or defaults)
@@ -0,0 +1,59 @@
+import os
+import time
+import logging
+from typing import Dict, Optional
+
+class StartupProfiler:
+    """Records named startup phases relative to process start"""
+
+    # Time-to-first-paint budget; override with VEIGAR_FIRST_PAINT_BUDGET_MS
+    DEFAULT_FIRST_PAINT_BUDGET_MS = 500
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.start = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+        self.first_paint_budget_ms = float(
+            os.getenv('VEIGAR_FIRST_PAINT_BUDGET_MS', self.DEFAULT_FIRST_PAINT_BUDGET_MS)
+        )
+
+    def reset(self, start: Optional[float] = None):
+        """Restart timing, e.g. from a perf_counter() taken before heavy imports"""
+        self.start = time.perf_counter() if start is None else start
+        self.marks.clear()
+
+    def mark(self, phase: str) -> float:
+        """
+        Record a phase the first time it is reached
+
+        Args:
+            phase: Phase name (e.g., 'first_paint')
+
+        Returns:
+            Milliseconds since start for this phase
+        """
+        if phase not in self.marks:
+            self.marks[phase] = (time.perf_counter() - self.start) * 1000
+            self.logger.info(f"Startup phase '{phase}' at {self.marks[phase]:.1f} ms")
+            if phase == 'first_paint' and self.marks[phase] > self.first_paint_budget_ms:
+                self.logger.warning(
+                    f"Time to first paint {self.marks[phase]:.1f} ms exceeds budget of "
+                    f"{self.first_paint_budget_ms:.0f} ms"
+                )
+        return self.marks[phase]
+
+    def elapsed(self, phase: str) -> Optional[float]:
+        """Milliseconds since start at which a phase was reached, if it was"""
+        return self.marks.get(phase)
+
+    def within_budget(self) -> bool:
+        """Whether first paint happened within the configured budget"""
+        first_paint = self.marks.get('first_paint')
+        return first_paint is not None and first_paint <= self.first_paint_budget_ms
+
+    def summary(self) -> Dict[str, float]:
+        """All recorded phases in the order they were reached"""
+        return {phase: round(ms, 1) for phase, ms in sorted(self.marks.items(), key=lambda item: item[1])}
+
+# Shared profiler for the application process
+startup_profiler = StartupProfiler()
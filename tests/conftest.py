@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Tests import the application modules the way src/main.py does
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
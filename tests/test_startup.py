@@ -0,0 +1,39 @@
+import time
+import pytest
+from PyQt6.QtWidgets import QApplication
+from utils.startup_profiler import startup_profiler
+
+@pytest.fixture
+def main_window_class(tmp_path, monkeypatch):
+    """MainWindow with a fresh home directory and no network access"""
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('RIOT_API_KEY', 'RGAPI-test')
+
+    import requests
+    def no_network(*args, **kwargs):
+        raise requests.ConnectionError("network disabled in tests")
+    monkeypatch.setattr(requests.Session, 'request', no_network)
+
+    from ui import main_window
+    # Static data arrives after first paint by design; keep the test independent of it
+    monkeypatch.setattr(main_window.StaticDataWorker, 'run', lambda self: None)
+    return main_window.MainWindow
+
+def test_first_paint_within_budget(main_window_class):
+    app = QApplication.instance() or QApplication([])
+    startup_profiler.reset()
+
+    window = main_window_class()
+    window.show()
+    deadline = time.perf_counter() + 5
+    while startup_profiler.elapsed('first_paint') is None and time.perf_counter() < deadline:
+        app.processEvents()
+
+    try:
+        assert startup_profiler.elapsed('first_paint') is not None, "window was never painted"
+        assert startup_profiler.within_budget(), (
+            f"first paint at {startup_profiler.elapsed('first_paint'):.0f} ms exceeds "
+            f"{startup_profiler.first_paint_budget_ms:.0f} ms: {startup_profiler.summary()}"
+        )
+    finally:
+        window.close()